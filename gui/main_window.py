@@ -2,21 +2,65 @@
 
 """Главное окно приложения для генерации DOCX файлов из JSON и шаблонов."""
 
+import logging
+import os
+import queue
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk, simpledialog, filedialog, messagebox
-from typing import Dict, Callable, Any
-
-from modules.json_reader import (
-    load_json,
-    papers_json_to_dataframe,
-    report_json_to_dataframe,
+from typing import Dict, Callable, Any, List, Optional, Set
+
+from modules.json_decoder import DECODER
+from modules.json_reader import load_dataset, load_json
+from modules.dataset_index import DatasetFilter, DatasetIndexCache, parse_date
+from modules.dataset_registry import DatasetRegistry
+from modules.deduplicator import (
+    DEFAULT_DEDUP_RULE,
+    duplicates_report,
+    format_duplicates_report,
+)
+from modules.docx_merger import merge_files
+from modules.document_pipeline import (
+    GENERATORS,
+    JSON_TO_DF_FUNCTIONS,
+    normalizer_for,
+    read_template,
+    render_variants_cached,
+)
+from modules.output_cache import OutputCache, digest_dataframe
+from modules.output_writer import OutputWriter, WriteResult
+from modules.preview import DocumentPreview
+from modules.session_state import load_session, save_session
+from modules.table_export import export_table
+from modules.template_compiler import compile_template
+from modules.template_manager import (
+    apply_template_placeholders,
+    choose_template,
+    read_template_placeholders,
 )
-from modules import (
-    publish_docx_generator,
-    program_docx_generator,
-    report_docx_generator,
+from modules.variant_generator import variant_paths
+from modules.watch_mode import DocumentWatcher, WatchTarget, default_output_path
+
+
+logger = logging.getLogger(__name__)
+
+# Правила удаления повторяющихся докладов и их подписи
+DEDUP_LABELS = {
+    "last": "оставлять последний",
+    "first": "оставлять первый",
+    "complete": "оставлять наиболее полный",
+    None: "не удалять",
+}
+
+# Поля фильтра отбора записей: (поле DatasetFilter, подпись, ширина)
+FILTER_FIELDS = (
+    ("room", "Ауд.:", 10),
+    ("date_from", "Даты с:", 11),
+    ("date_to", "по:", 11),
+    ("group_prefix", "Группа:", 8),
+    ("speaker", "Докладчик:", 16),
+    ("text", "Поиск:", 20),
 )
-from modules.template_manager import choose_template
 
 
 class MainWindow(tk.Tk):
@@ -26,7 +70,7 @@ class MainWindow(tk.Tk):
         """Инициализирует главное окно приложения."""
         super().__init__()
         self.title("Генератор DOCX по JSON и шаблону")
-        self.geometry("800x600")
+        self.geometry("1100x700")
         self.resizable(True, True)
 
         self.dataframes: Dict[str, Any] = {}
@@ -34,12 +78,47 @@ class MainWindow(tk.Tk):
         self.placeholder_values: Dict[str, Dict[str, str]] = {}
 
         self.json_to_df_functions: Dict[str, Callable] = {
-            "Список представляемых к публикации докладов": papers_json_to_dataframe,
-            "Программа": report_json_to_dataframe,
-            "Отчет о проведении": report_json_to_dataframe,
+            name: normalizer_for(name, DEFAULT_DEDUP_RULE, dataframe=True)
+            for name in JSON_TO_DF_FUNCTIONS
         }
 
+        # Очередь вызовов из фоновых потоков в главный поток Tkinter
+        self._ui_calls: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self.output_cache = OutputCache()
+        # Нормализованные наборы данных, общие для всех вкладок
+        self.datasets = DatasetRegistry()
+        # Индексы наборов данных и фильтры вкладок
+        self.dataset_indexes = DatasetIndexCache()
+        self.dataset_filters: Dict[str, DatasetFilter] = {}
+        self._filter_jobs: Dict[str, str] = {}
+        self.preview = DocumentPreview()
+        self.preview_lines: Dict[str, List[str]] = {}
+        self._preview_jobs: Dict[str, str] = {}
+        # Фоновая загрузка данных и шаблонов
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.load_futures: Dict[str, Future] = {}
+        # Загрузки, результат которых wait_for_dataset применил раньше
+        # обратного вызова; запись удаляется, когда вызов выполнится
+        self._applied_loads: Set[Future] = set()
+        self.watcher = DocumentWatcher(
+            on_generated=lambda n, p, t: self.call_in_ui(
+                lambda: self.status.set(f"Обновлен файл ({n}, {t:.2f} с): {p}")
+            ),
+            on_error=lambda n, e: self.call_in_ui(
+                lambda: self.status.set(f"Ошибка автообновления ({n}): {e}")
+            ),
+            on_data_loaded=lambda n, df: self.call_in_ui(
+                lambda: self.on_watched_data_loaded(n, df)
+            ),
+            cache=self.output_cache,
+            registry=self.datasets,
+        )
+
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(50, self._process_ui_calls)
+        # Восстановление сеанса начинается после появления окна
+        self.after_idle(self.restore_session)
 
     def create_widgets(self) -> None:
         """Создает все виджеты интерфейса."""
@@ -96,6 +175,19 @@ class MainWindow(tk.Tk):
             command=lambda n=name: choose_template(self, n),
         ).grid(row=1, column=2)
 
+        ttk.Label(frame_files, text="Папка вывода:").grid(row=2, column=0, padx=5, sticky="w")
+        setattr(self, f"{name}_output_path", tk.StringVar())
+        ttk.Entry(frame_files, textvariable=getattr(self, f"{name}_output_path"), width=50).grid(
+            row=2, column=1, padx=5
+        )
+        ttk.Button(
+            frame_files,
+            text="\U0001F4C1 Выбрать",
+            command=lambda n=name: self.select_output_folder(
+                getattr(self, f"{n}_output_path")
+            ),
+        ).grid(row=2, column=2)
+
         # --- Плейсхолдеры
         frame_placeholders = ttk.LabelFrame(tab, text="Плейсхолдеры")
         frame_placeholders.pack(fill="x", pady=10)
@@ -110,19 +202,86 @@ class MainWindow(tk.Tk):
         placeholder_tree.column("Value", width=200)
         setattr(self, f"{name}_placeholder_tree", placeholder_tree)
 
-        # --- Таблица предпросмотра
-        frame_table = ttk.Frame(tab)
-        frame_table.pack(fill="both", expand=True, pady=5)
+        # --- Отбор записей
+        frame_filter = ttk.LabelFrame(tab, text="Отбор записей")
+        frame_filter.pack(fill="x", padx=5)
+
+        for column, (field, label, width) in enumerate(FILTER_FIELDS):
+            var = tk.StringVar()
+            setattr(self, f"{name}_filter_{field}", var)
+            ttk.Label(frame_filter, text=label).grid(row=0, column=column * 2, padx=(5, 2))
+            ttk.Entry(frame_filter, textvariable=var, width=width).grid(
+                row=0, column=column * 2 + 1, pady=3
+            )
+            var.trace_add("write", lambda *_, n=name: self.schedule_filter(n))
+        ttk.Button(
+            frame_filter,
+            text="Сбросить",
+            command=lambda n=name: self.reset_filter(n),
+        ).grid(row=0, column=len(FILTER_FIELDS) * 2, padx=5)
+
+        # --- Таблица предпросмотра и предпросмотр документа
+        paned = ttk.PanedWindow(tab, orient="horizontal")
+        paned.pack(fill="both", expand=True, pady=5)
+
+        frame_table = ttk.Frame(paned)
+        paned.add(frame_table, weight=1)
 
         tree = ttk.Treeview(frame_table, height=5)
         tree.pack(fill="both", expand=True, padx=5, pady=5)
         setattr(self, f"{name}_tree", tree)
 
+        frame_preview = ttk.LabelFrame(paned, text="Предпросмотр документа")
+        paned.add(frame_preview, weight=1)
+
+        preview_text = tk.Text(frame_preview, height=5, wrap="word", state="disabled")
+        preview_scroll = ttk.Scrollbar(
+            frame_preview, orient="vertical", command=preview_text.yview
+        )
+        preview_text.configure(yscrollcommand=preview_scroll.set)
+        preview_scroll.pack(side="right", fill="y")
+        preview_text.pack(fill="both", expand=True, padx=5, pady=5)
+        setattr(self, f"{name}_preview_text", preview_text)
+        self.preview_lines[name] = []
+
         frame_options = ttk.LabelFrame(tab, text="Параметры")
         frame_options.pack(fill="x", padx=5, pady=5)
 
         setattr(self, f"{name}_event_name", tk.StringVar())
-        setattr(self, f"{name}_output_path", tk.StringVar())
+        setattr(self, f"{name}_watch", tk.BooleanVar(value=False))
+
+        ttk.Checkbutton(
+            frame_options,
+            text="Следить за изменениями и обновлять DOCX в папке вывода",
+            variable=getattr(self, f"{name}_watch"),
+        ).pack(anchor="w", padx=5, pady=2)
+
+        frame_dedup = ttk.Frame(frame_options)
+        frame_dedup.pack(anchor="w", padx=5, pady=2)
+        dedup_var = tk.StringVar(value=DEDUP_LABELS[DEFAULT_DEDUP_RULE])
+        setattr(self, f"{name}_dedup", dedup_var)
+        ttk.Label(frame_dedup, text="Повторяющиеся доклады:").pack(side="left")
+        ttk.Combobox(
+            frame_dedup,
+            textvariable=dedup_var,
+            values=list(DEDUP_LABELS.values()),
+            state="readonly",
+            width=24,
+        ).pack(side="left", padx=5)
+        ttk.Button(
+            frame_dedup,
+            text="Удаленные повторы",
+            command=lambda n=name: self.show_duplicates(n),
+        ).pack(side="left")
+        dedup_var.trace_add("write", lambda *_, n=name: self.on_dedup_rule_changed(n))
+
+        for var_name in ("json_path", "template_path", "output_path", "watch"):
+            getattr(self, f"{name}_{var_name}").trace_add(
+                "write", lambda *_, n=name: self.update_watch_target(n)
+            )
+        getattr(self, f"{name}_template_path").trace_add(
+            "write", lambda *_, n=name: self.schedule_preview(n)
+        )
 
     def show_dataframe_in_tree(self, name: str, df: Any) -> None:
         """
@@ -146,6 +305,8 @@ class MainWindow(tk.Tk):
         for _, row in df.iterrows():
             tree.insert("", "end", values=list(row))
 
+        self.schedule_preview(name)
+
     def show_placeholders_in_tree(self, name: str) -> None:
         """
         Отображает плейсхолдеры в Treeview.
@@ -177,6 +338,451 @@ class MainWindow(tk.Tk):
                 self.show_placeholders_in_tree(name)
 
         tree.bind("<Double-1>", on_double_click)
+        self.update_watch_target(name)
+        self.schedule_preview(name)
+
+    def schedule_preview(self, name: str, delay_ms: int = 300) -> None:
+        """
+        Планирует обновление предпросмотра с задержкой.
+
+        Повторные вызовы в пределах задержки откладывают обновление,
+        поэтому серия правок приводит к одному пересчету.
+
+        Args:
+            name: Название вкладки.
+            delay_ms: Задержка в миллисекундах.
+        """
+        job = self._preview_jobs.pop(name, None)
+        if job:
+            self.after_cancel(job)
+        self._preview_jobs[name] = self.after(
+            delay_ms, lambda: self.update_preview(name)
+        )
+
+    def update_preview(self, name: str) -> None:
+        """
+        Пересчитывает предпросмотр документа и обновляет изменившиеся строки.
+
+        Args:
+            name: Название вкладки.
+        """
+        self._preview_jobs.pop(name, None)
+        try:
+            lines = self.preview.lines(
+                GENERATORS[name],
+                getattr(self, f"{name}_template_path").get(),
+                self.current_dataframe(name),
+                self.placeholder_values.get(name, {}),
+            )
+        except Exception as e:
+            lines = [f"Не удалось построить предпросмотр: {e}"]
+
+        old_lines = self.preview_lines[name]
+        if lines == old_lines:
+            return
+
+        # Заменяем только отличающийся фрагмент между общими началом и концом
+        prefix = 0
+        max_prefix = min(len(lines), len(old_lines))
+        while prefix < max_prefix and lines[prefix] == old_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        max_suffix = max_prefix - prefix
+        while (
+            suffix < max_suffix
+            and lines[-1 - suffix] == old_lines[-1 - suffix]
+        ):
+            suffix += 1
+
+        text = getattr(self, f"{name}_preview_text")
+        text.configure(state="normal")
+        text.delete(f"{prefix + 1}.0", f"{len(old_lines) - suffix + 1}.0")
+        changed = lines[prefix:len(lines) - suffix]
+        if changed:
+            text.insert(f"{prefix + 1}.0", "\n".join(changed) + "\n")
+        text.configure(state="disabled")
+        self.preview_lines[name] = lines
+
+    def update_watch_target(self, name: str) -> None:
+        """
+        Передает наблюдателю актуальные параметры вкладки.
+
+        Args:
+            name: Название вкладки.
+        """
+        if not getattr(self, f"{name}_watch").get():
+            self.watcher.remove_target(name)
+            return
+
+        self.watcher.set_target(
+            WatchTarget(
+                name=name,
+                json_path=getattr(self, f"{name}_json_path").get(),
+                template_path=getattr(self, f"{name}_template_path").get(),
+                output_path=default_output_path(
+                    getattr(self, f"{name}_output_path").get(), name
+                ),
+                placeholders=self.placeholder_values.get(name, {}),
+                dedup_rule=self.dedup_rule(name),
+            )
+        )
+        self.watcher.start()
+
+    def dedup_rule(self, name: str) -> Optional[str]:
+        """
+        Возвращает выбранное на вкладке правило удаления повторов.
+
+        Args:
+            name: Название вкладки.
+
+        Returns:
+            Правило из DEDUP_RULES или None, если повторы не удаляются.
+        """
+        label = getattr(self, f"{name}_dedup").get()
+        return next(
+            (rule for rule, text in DEDUP_LABELS.items() if text == label),
+            DEFAULT_DEDUP_RULE,
+        )
+
+    def on_dedup_rule_changed(self, name: str) -> None:
+        """
+        Перезагружает данные вкладки с новым правилом удаления повторов.
+
+        Args:
+            name: Название вкладки.
+        """
+        self.json_to_df_functions[name] = normalizer_for(
+            name, self.dedup_rule(name), dataframe=True
+        )
+        json_path = getattr(self, f"{name}_json_path").get()
+        if json_path and os.path.exists(json_path):
+            self.load_dataset_async(name, json_path, self.json_to_df_functions[name])
+            self.status.set(f"Загрузка файла: {json_path}")
+        self.update_watch_target(name)
+
+    def on_watched_data_loaded(self, name: str, df: Any) -> None:
+        """
+        Обновляет предпросмотр после повторной загрузки JSON наблюдателем.
+
+        Args:
+            name: Название вкладки.
+            df: Новый DataFrame.
+        """
+        self.datasets.retain(df)
+        self.datasets.release(self.dataframes.get(name))
+        self.dataframes[name] = df
+        self.show_dataframe_in_tree(name, self.current_dataframe(name))
+
+    def current_dataframe(self, name: str) -> Any:
+        """
+        Возвращает данные вкладки с учетом фильтра отбора записей.
+
+        Args:
+            name: Название вкладки.
+
+        Returns:
+            DataFrame с отобранными записями или None, если данные не загружены.
+        """
+        return self.dataset_indexes.filter(
+            self.dataframes.get(name), self.dataset_filters.get(name, DatasetFilter())
+        )
+
+    def schedule_filter(self, name: str, delay_ms: int = 150) -> None:
+        """
+        Планирует применение фильтра после окончания ввода.
+
+        Args:
+            name: Название вкладки.
+            delay_ms: Задержка в миллисекундах.
+        """
+        job = self._filter_jobs.pop(name, None)
+        if job:
+            self.after_cancel(job)
+        self._filter_jobs[name] = self.after(delay_ms, lambda: self.apply_filter(name))
+
+    def apply_filter(self, name: str) -> None:
+        """
+        Отбирает записи вкладки по полям фильтра и обновляет таблицу и предпросмотр.
+
+        Args:
+            name: Название вкладки.
+        """
+        self._filter_jobs.pop(name, None)
+        values = {
+            field: getattr(self, f"{name}_filter_{field}").get().strip()
+            for field, _, _ in FILTER_FIELDS
+        }
+        try:
+            record_filter = DatasetFilter(
+                room=values["room"],
+                date_from=parse_date(values["date_from"]),
+                date_to=parse_date(values["date_to"]),
+                group_prefix=values["group_prefix"],
+                speaker=values["speaker"],
+                text=values["text"],
+            )
+        except ValueError as e:
+            self.status.set(str(e))
+            return
+
+        if record_filter == self.dataset_filters.get(name, DatasetFilter()):
+            return
+        self.dataset_filters[name] = record_filter
+        dataframe = self.dataframes.get(name)
+        if dataframe is None:
+            return
+
+        subset = self.current_dataframe(name)
+        self.show_dataframe_in_tree(name, subset)
+        if record_filter.is_empty():
+            self.status.set(f"Отбор снят: {len(dataframe)} записей")
+        else:
+            self.status.set(f"Отобрано записей: {len(subset)} из {len(dataframe)}")
+
+    def flush_filter(self, name: str) -> None:
+        """
+        Применяет отложенный фильтр немедленно (перед генерацией и выгрузкой).
+
+        Args:
+            name: Название вкладки.
+        """
+        job = self._filter_jobs.get(name)
+        if job:
+            self.after_cancel(job)
+            self.apply_filter(name)
+
+    def reset_filter(self, name: str) -> None:
+        """
+        Очищает поля фильтра вкладки.
+
+        Args:
+            name: Название вкладки.
+        """
+        for field, _, _ in FILTER_FIELDS:
+            getattr(self, f"{name}_filter_{field}").set("")
+        self.schedule_filter(name, delay_ms=0)
+
+    def call_in_ui(self, callback: Callable[[], None]) -> None:
+        """
+        Планирует выполнение функции в главном потоке Tkinter.
+
+        Args:
+            callback: Функция без аргументов.
+        """
+        self._ui_calls.put(callback)
+
+    def _process_ui_calls(self) -> None:
+        """Выполняет вызовы, поставленные в очередь фоновыми потоками."""
+        while True:
+            try:
+                callback = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            callback()
+        self.after(50, self._process_ui_calls)
+
+    def load_dataset_async(
+        self, name: str, path: str, json_to_df_func: Callable
+    ) -> Future:
+        """
+        Запускает загрузку JSON в фоновом потоке.
+
+        Args:
+            name: Название вкладки.
+            path: Путь к JSON файлу.
+            json_to_df_func: Функция преобразования JSON в DataFrame.
+
+        Returns:
+            Future с результатом load_dataset.
+        """
+        future = self.executor.submit(load_dataset, self.datasets, path, json_to_df_func)
+        self.load_futures[name] = future
+        future.add_done_callback(
+            lambda f: self.call_in_ui(lambda: self._finish_load(name, f))
+        )
+        return future
+
+    def _finish_load(self, name: str, future: Future) -> None:
+        """
+        Применяет результат загрузки по завершении (обратный вызов Future).
+
+        Args:
+            name: Название вкладки.
+            future: Future из load_dataset_async.
+        """
+        if future in self._applied_loads:
+            # Результат уже применен в wait_for_dataset
+            self._applied_loads.discard(future)
+        else:
+            self._apply_loaded_dataset(name, future)
+        if self.load_futures.get(name) is future:
+            del self.load_futures[name]
+
+    def _apply_loaded_dataset(self, name: str, future: Future) -> None:
+        """
+        Отображает результат фоновой загрузки, если он еще актуален.
+
+        Args:
+            name: Название вкладки.
+            future: Future из load_dataset_async.
+        """
+        current = self.load_futures.get(name) is future
+
+        try:
+            df, elapsed = future.result()
+        except Exception as e:
+            if current:
+                messagebox.showerror("Ошибка", f"Не удалось загрузить файл:\n{e}")
+            return
+
+        if not current:
+            # Пока файл загружался, был выбран другой
+            self.datasets.release(df)
+            return
+
+        self.datasets.release(self.dataframes.get(name))
+        self.dataframes[name] = df
+        self.show_dataframe_in_tree(name, self.current_dataframe(name))
+        status = (
+            f"Загружен файл: {getattr(self, f'{name}_json_path').get()} "
+            f"(декодер {DECODER.name}, {elapsed:.2f} с)"
+        )
+        duplicates = duplicates_report(df)
+        if duplicates:
+            status += f", удалено повторов: {len(duplicates)}"
+        self.status.set(status)
+
+    def show_duplicates(self, name: str, limit: int = 30) -> None:
+        """
+        Показывает повторяющиеся доклады, удаленные при загрузке данных вкладки.
+
+        Args:
+            name: Название вкладки.
+            limit: Максимальное число выводимых записей.
+        """
+        self.wait_for_dataset(name)
+        lines = format_duplicates_report(duplicates_report(self.dataframes.get(name)))
+        if not lines:
+            messagebox.showinfo("Повторы", "Повторяющихся докладов не найдено.")
+            return
+        text = "\n".join(lines[:limit])
+        if len(lines) > limit:
+            text += f"\n... и еще {len(lines) - limit}"
+        messagebox.showinfo("Повторы", f"Удалено записей: {len(lines)}\n\n{text}")
+
+    def wait_for_dataset(self, name: str) -> None:
+        """
+        Дожидается фоновой загрузки данных вкладки, если она еще идет.
+
+        Args:
+            name: Название вкладки.
+        """
+        future = self.load_futures.get(name)
+        if future is None or future in self._applied_loads:
+            return
+        try:
+            future.result()
+        except Exception:
+            # Ошибка будет показана при применении результата
+            pass
+        self._applied_loads.add(future)
+        self._apply_loaded_dataset(name, future)
+
+    def restore_session(self) -> None:
+        """Восстанавливает пути и плейсхолдеры прошлого сеанса в фоновом режиме."""
+        for name, state in load_session().items():
+            if name not in self.tabs or not isinstance(state, dict):
+                continue
+
+            json_path = state.get("json_path", "")
+            template_path = state.get("template_path", "")
+            getattr(self, f"{name}_output_path").set(state.get("output_path", ""))
+            if state.get("dedup", DEFAULT_DEDUP_RULE) in DEDUP_LABELS:
+                # Правило задается до загрузки данных
+                getattr(self, f"{name}_dedup").set(
+                    DEDUP_LABELS[state.get("dedup", DEFAULT_DEDUP_RULE)]
+                )
+
+            if json_path and os.path.exists(json_path):
+                getattr(self, f"{name}_json_path").set(json_path)
+                self.load_dataset_async(name, json_path, self.json_to_df_functions[name])
+
+            watch = bool(state.get("watch", False))
+            if template_path and os.path.exists(template_path):
+                getattr(self, f"{name}_template_path").set(template_path)
+                future = self.executor.submit(self._prepare_template, template_path)
+                # Наблюдение включается после восстановления плейсхолдеров,
+                # иначе документ был бы перезаписан с пустыми значениями
+                future.add_done_callback(
+                    lambda f, n=name, v=state.get("placeholder_values", {}), w=watch: (
+                        self.call_in_ui(lambda: self._apply_restored_template(n, f, v, w))
+                    )
+                )
+            else:
+                getattr(self, f"{name}_watch").set(watch)
+
+    @staticmethod
+    def _prepare_template(template_path: str) -> Dict[str, str]:
+        """
+        Читает плейсхолдеры шаблона и заранее компилирует его план.
+
+        Args:
+            template_path: Путь к шаблону.
+
+        Returns:
+            Плейсхолдеры шаблона со значениями по умолчанию.
+        """
+        compile_template(read_template(template_path))
+        return read_template_placeholders(template_path)
+
+    def _apply_restored_template(
+        self, name: str, future: Future, saved_values: Dict[str, str], watch: bool
+    ) -> None:
+        """
+        Применяет плейсхолдеры восстановленного шаблона и включает наблюдение.
+
+        Args:
+            name: Название вкладки.
+            future: Future из _prepare_template.
+            saved_values: Значения плейсхолдеров прошлого сеанса.
+            watch: Было ли включено наблюдение в прошлом сеансе.
+        """
+        try:
+            defaults = future.result()
+        except Exception as e:
+            self.status.set(f"Не удалось восстановить шаблон ({name}): {e}")
+            return
+        apply_template_placeholders(self, name, defaults, saved_values)
+        getattr(self, f"{name}_watch").set(watch)
+
+    def session_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Собирает состояние вкладок для сохранения.
+
+        Returns:
+            Словарь {название вкладки: состояние}.
+        """
+        return {
+            name: {
+                "json_path": getattr(self, f"{name}_json_path").get(),
+                "template_path": getattr(self, f"{name}_template_path").get(),
+                "output_path": getattr(self, f"{name}_output_path").get(),
+                "watch": getattr(self, f"{name}_watch").get(),
+                "dedup": self.dedup_rule(name),
+                "placeholder_values": self.placeholder_values.get(name, {}),
+            }
+            for name in self.tabs
+        }
+
+    def on_close(self) -> None:
+        """Сохраняет сеанс, останавливает фоновые задачи и закрывает окно."""
+        try:
+            save_session(self.session_state())
+        except OSError as e:
+            logger.warning("Не удалось сохранить сеанс: %s", e)
+        self.watcher.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
 
     def select_output_folder(self, output_var: tk.StringVar) -> None:
         """
@@ -199,21 +805,176 @@ class MainWindow(tk.Tk):
             text="\U0001F4BE Сформировать DOCX",
             command=self.generate_docx,
         ).grid(row=0, column=0, padx=10)
+        ttk.Button(
+            frame,
+            text="\U0001F4CA Экспорт таблицы",
+            command=self.export_table,
+        ).grid(row=0, column=1, padx=10)
+        ttk.Button(
+            frame,
+            text="\U0001F4D1 Варианты по шаблонам",
+            command=self.generate_variants,
+        ).grid(row=0, column=2, padx=10)
+        ttk.Button(
+            frame,
+            text="\U0001F4DA Собрать книгу",
+            command=self.merge_documents,
+        ).grid(row=0, column=3, padx=10)
 
     def create_status_bar(self) -> None:
         """Создает строку состояния."""
         self.status = tk.StringVar(value="Готово.")
         ttk.Label(self, textvariable=self.status, foreground="gray").pack(pady=5)
 
+    def export_table(self) -> None:
+        """Сохраняет нормализованные данные активной вкладки в CSV или XLSX."""
+        name = self.notebook.tab(self.notebook.select(), "text")
+        self.wait_for_dataset(name)
+        self.flush_filter(name)
+        dataframe = self.current_dataframe(name)
+        if dataframe is None or dataframe.empty:
+            messagebox.showerror("Ошибка", "Нет данных для выгрузки.")
+            return
+
+        path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel", "*.xlsx"), ("CSV", "*.csv")],
+            initialdir=getattr(self, f"{name}_output_path").get() or None,
+            initialfile=f"{name}.xlsx",
+        )
+        if not path:
+            return
+        try:
+            count = export_table(dataframe, path, sheet_name=name)
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить таблицу:\n{e}")
+            return
+        self.status.set(f"Таблица сохранена ({count} строк): {path}")
+
+    def generate_variants(self) -> None:
+        """
+        Формирует документ активной вкладки по нескольким шаблонам.
+
+        Данные готовятся один раз и вставляются во все выбранные шаблоны;
+        документы формируются в фоне и сохраняются потоком записи
+        (OutputWriter), о каждом сохраненном файле сообщает строка состояния.
+        """
+        name = self.notebook.tab(self.notebook.select(), "text")
+        self.wait_for_dataset(name)
+        self.flush_filter(name)
+        dataframe = self.current_dataframe(name)
+        if dataframe is None or dataframe.empty:
+            messagebox.showerror("Ошибка", "Нет данных для вставки.")
+            return
+
+        templates = list(filedialog.askopenfilenames(
+            title="Шаблоны вариантов",
+            filetypes=[("Word Documents", "*.docx")],
+        ))
+        if not templates:
+            return
+        output_dir = getattr(self, f"{name}_output_path").get() or filedialog.askdirectory()
+        if not output_dir:
+            return
+
+        json_path = getattr(self, f"{name}_json_path").get() or name
+        placeholders = dict(self.placeholder_values.get(name, {}))
+
+        def on_written(result: WriteResult) -> None:
+            """Сообщает о сохранении варианта (вызывается в потоке записи)."""
+            if result.ok:
+                self.call_in_ui(lambda: self.status.set(f"Сохранен вариант: {result.path}"))
+
+        def render_and_save() -> List[WriteResult]:
+            """Формирует варианты и передает их в поток записи."""
+            documents = render_variants_cached(
+                name,
+                [read_template(path) for path in templates],
+                digest_dataframe(dataframe),
+                placeholders,
+                lambda: dataframe,
+                self.output_cache,
+                workers=min(len(templates), os.cpu_count() or 1),
+            )
+            os.makedirs(output_dir, exist_ok=True)
+            paths = variant_paths(output_dir, json_path, templates)
+            with OutputWriter(on_written=on_written) as writer:
+                for path, (data, _) in zip(paths, documents):
+                    writer.submit(path, data)
+            return writer.results
+
+        def on_done(future: Future) -> None:
+            """Сообщает о результате в основном потоке."""
+            try:
+                results = future.result()
+            except Exception as e:
+                messagebox.showerror(
+                    "Ошибка генерации", f"Произошла ошибка при генерации:\n{e}"
+                )
+                return
+            failed = [result for result in results if not result.ok]
+            if failed:
+                messagebox.showerror(
+                    "Ошибка сохранения",
+                    "\n".join(f"{result.path}: {result.error}" for result in failed),
+                )
+            self.status.set(
+                f"Сохранено вариантов: {len(results) - len(failed)} из {len(results)} "
+                f"в {output_dir}"
+            )
+
+        self.status.set(f"Формирование вариантов ({len(templates)})...")
+        future = self.executor.submit(render_and_save)
+        future.add_done_callback(lambda f: self.call_in_ui(lambda: on_done(f)))
+
+    def merge_documents(self) -> None:
+        """
+        Собирает выбранные готовые документы в одну книгу.
+
+        Документы объединяются в порядке выбора, номера заседаний
+        становятся сквозными; сборка выполняется в фоновом потоке.
+        """
+        name = self.notebook.tab(self.notebook.select(), "text")
+        output_dir = getattr(self, f"{name}_output_path").get() or None
+        paths = list(filedialog.askopenfilenames(
+            title="Документы секций",
+            filetypes=[("Word Documents", "*.docx")],
+            initialdir=output_dir,
+        ))
+        if not paths:
+            return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".docx",
+            filetypes=[("Word Documents", "*.docx")],
+            initialdir=output_dir,
+            initialfile=f"{name} - книга.docx",
+        )
+        if not output_path:
+            return
+
+        def on_done(future: Future) -> None:
+            """Сообщает о результате в основном потоке."""
+            try:
+                sessions = future.result()
+            except Exception as e:
+                messagebox.showerror("Ошибка", f"Не удалось собрать книгу:\n{e}")
+                return
+            self.status.set(
+                f"Книга собрана ({len(paths)} док., заседаний: {sessions}): {output_path}"
+            )
+
+        self.status.set(f"Сборка книги ({len(paths)} док.)...")
+        future = self.executor.submit(merge_files, paths, output_path)
+        future.add_done_callback(lambda f: self.call_in_ui(lambda: on_done(f)))
+
     def generate_docx(self) -> None:
         """Генерирует DOCX файл в зависимости от активной вкладки."""
         current_tab = self.notebook.tab(self.notebook.select(), "text")
-        if current_tab == "Список представляемых к публикации докладов":
-            publish_docx_generator.generate_docx(self, current_tab)
-        elif current_tab == "Программа":
-            program_docx_generator.generate_docx(self, current_tab)
-        elif current_tab == "Отчет о проведении":
-            report_docx_generator.generate_docx(self, current_tab)
+        generator = GENERATORS.get(current_tab)
+        if generator:
+            self.wait_for_dataset(current_tab)
+            self.flush_filter(current_tab)
+            generator.generate_docx(self, current_tab)
         else:
             messagebox.showinfo(
                 "Информация",
@@ -0,0 +1,720 @@
+# modules/batch_generator.py
+
+"""Модуль пакетной генерации документов.
+
+Формирует документы для каждой пары (JSON-выгрузка × тип документа)
+в пуле процессов и записывает манифест с результатами. Повторный запуск
+с флагом ``--resume`` пропускает уже выполненные задания.
+
+Пример запуска:
+
+    python -m modules.batch_generator "exports/*.json" out \\
+        --template "Программа=templates/1_Программа_к43.docx" \\
+        --workers 4 --resume
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from modules.document_pipeline import (
+    GENERATORS,
+    JSON_TO_RECORDS_FUNCTIONS,
+    document_key,
+    read_template,
+    render_cached,
+    source_digest,
+)
+from modules.deduplicator import (
+    DEDUP_RULES,
+    DEFAULT_DEDUP_RULE,
+    duplicates_report,
+    with_deduplication,
+)
+from modules.file_utils import file_stamp
+from modules.json_decoder import DECODER
+from modules.json_reader import read_json
+from modules.output_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, OutputCache
+from modules.output_writer import OutputWriter, WriteResult
+from modules.records import RecordSet
+from modules.shared_data import (
+    attach_bytes,
+    attach_records,
+    hand_over,
+    release,
+    share_bytes,
+    share_records,
+)
+from modules.table_export import EXPORT_FORMATS, export_table, table_path
+
+MANIFEST_NAME = "manifest.json"
+
+
+def find_exports(source: str) -> List[str]:
+    """
+    Находит JSON-выгрузки по пути к папке или glob-шаблону.
+
+    Args:
+        source: Папка с JSON-файлами, glob-шаблон или путь к файлу.
+
+    Returns:
+        Отсортированный список путей.
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.json")
+    return sorted(path for path in glob.glob(source) if os.path.isfile(path))
+
+
+def path_labels(paths: Iterable[str]) -> Dict[str, str]:
+    """
+    Формирует для файлов уникальные метки, из которых строятся
+    идентификаторы заданий и имена документов.
+
+    Метка — имя файла без расширения. Если имена файлов из разных папок
+    совпадают, метка дополняется путем относительно общей папки, а если
+    и он совпадает — порядковым номером.
+
+    Args:
+        paths: Пути к файлам (JSON-выгрузкам или шаблонам).
+
+    Returns:
+        Словарь {путь: метка}.
+    """
+    paths = list(dict.fromkeys(paths))
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    counts: Dict[str, int] = {}
+    for stem in stems:
+        counts[stem] = counts.get(stem, 0) + 1
+    base = (
+        os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+        if paths else ""
+    )
+
+    labels: Dict[str, str] = {}
+    used = set()
+    for path, stem in zip(paths, stems):
+        label = stem
+        if counts[stem] > 1:
+            relative = os.path.relpath(os.path.abspath(path), base)
+            label = os.path.splitext(relative)[0].replace(os.sep, "_")
+        number = 1
+        unique = label
+        while unique in used:
+            number += 1
+            unique = f"{label} ({number})"
+        used.add(unique)
+        labels[path] = unique
+    return labels
+
+
+def build_jobs(
+    exports: Iterable[str],
+    templates: Dict[str, str],
+    output_dir: str,
+    placeholders: Dict[str, str],
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    cache_size: int = DEFAULT_MAX_BYTES,
+    dedup_rule: Optional[str] = DEFAULT_DEDUP_RULE,
+    table_formats: Iterable[str] = (),
+) -> List[Dict[str, Any]]:
+    """
+    Формирует список заданий для всех пар (выгрузка × тип документа).
+
+    Args:
+        exports: Пути к JSON-выгрузкам.
+        templates: Словарь {тип документа: путь к шаблону}.
+        output_dir: Папка для результатов.
+        placeholders: Значения плейсхолдеров, общие для всех заданий.
+        cache_dir: Папка кэша готовых документов; None — без кэша.
+        cache_size: Максимальный размер кэша в байтах.
+        dedup_rule: Правило удаления повторяющихся докладов; None — не удалять.
+        table_formats: Форматы таблиц с нормализованными данными, которые
+            сохраняются рядом с документом (csv, xlsx).
+
+    Returns:
+        Список заданий в виде словарей.
+    """
+    table_formats = sorted(set(table_formats))
+    jobs = []
+    for export, stem in path_labels(exports).items():
+        for name, template in templates.items():
+            jobs.append(
+                {
+                    "id": f"{stem}::{name}",
+                    "export": export,
+                    "document": name,
+                    "template": template,
+                    "output": os.path.join(output_dir, f"{stem} - {name}.docx"),
+                    "placeholders": placeholders,
+                    "cache_dir": cache_dir,
+                    "cache_size": cache_size,
+                    "dedup": dedup_rule,
+                    "tables": table_formats,
+                    # Отпечаток входных данных в JSON-совместимом виде
+                    "inputs": json.loads(json.dumps([
+                        GENERATORS[name].GENERATOR_VERSION,
+                        file_stamp(export),
+                        file_stamp(template),
+                        sorted(placeholders.items()),
+                        dedup_rule,
+                        table_formats,
+                    ])),
+                }
+            )
+    return jobs
+
+
+def run_job(job: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """
+    Формирует документ одного задания. Ошибки не выбрасываются,
+    а записываются в результат.
+
+    Запись файла выполняет основной процесс (см. OutputWriter), чтобы
+    сохранение на диск шло параллельно с формированием следующих документов.
+
+    Args:
+        job: Задание из build_jobs.
+
+    Returns:
+        Кортеж (запись манифеста, содержимое DOCX или None при ошибке).
+    """
+    result = {key: job[key] for key in ("id", "export", "document", "template", "output")}
+    result["inputs"] = job["inputs"]
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    normalizer = with_deduplication(
+        JSON_TO_RECORDS_FUNCTIONS[job["document"]], job["dedup"]
+    )
+    loaded: List[RecordSet] = []
+
+    def load_records() -> RecordSet:
+        """Загружает и нормализует выгрузку (при промахе кэша или для таблиц)."""
+        if loaded:
+            return loaded[0]
+        if job.get("dataset"):
+            # Выгрузку уже разобрал другой процесс; подключаемся к общей памяти
+            attach_started = time.perf_counter()
+            loaded.append(attach_records(job["dataset"]))
+            timings["attach"] = time.perf_counter() - attach_started
+            return loaded[0]
+        load_started = time.perf_counter()
+        data = read_json(job["export"])
+        timings["load"] = time.perf_counter() - load_started
+
+        normalize_started = time.perf_counter()
+        records = normalizer(data)
+        result["duplicates"] = duplicates_report(records)
+        if not records:
+            raise ValueError("Нет данных для вставки.")
+        timings["normalize"] = time.perf_counter() - normalize_started
+        loaded.append(records)
+        return records
+
+    try:
+        cache = (
+            OutputCache(job["cache_dir"], job["cache_size"]) if job["cache_dir"] else None
+        )
+        render_started = time.perf_counter()
+        if job.get("template_data"):
+            template = attach_bytes(job["template_data"])
+        else:
+            template = read_template(job["template"])
+        data, cached = render_cached(
+            job["document"],
+            template,
+            source_digest(job["export"], normalizer),
+            job["placeholders"],
+            load_records,
+            cache,
+        )
+        # Загрузка данных (разбор JSON или подключение к общей памяти)
+        # учитывается отдельно
+        timings["render"] = (
+            time.perf_counter() - render_started
+            - timings.get("load", 0.0)
+            - timings.get("normalize", 0.0)
+            - timings.get("attach", 0.0)
+        )
+
+        if job["tables"]:
+            records = load_records()
+            export_started = time.perf_counter()
+            result["tables"] = []
+            for fmt in job["tables"]:
+                path = table_path(job["output"], fmt)
+                export_table(records, path, fmt, sheet_name=job["document"])
+                result["tables"].append(path)
+            timings["export"] = time.perf_counter() - export_started
+
+        result.update(status="ok", error=None, size=len(data), cached=cached)
+    except Exception as e:
+        data = None
+        result.update(
+            status="error", error=f"{type(e).__name__}: {e}", size=None, cached=False
+        )
+
+    result["decoder"] = DECODER.name
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    result["timings"] = {key: round(value, 4) for key, value in timings.items()}
+    return result, data
+
+
+def failed_result(job: Dict[str, Any], error: BaseException) -> Dict[str, Any]:
+    """
+    Формирует запись манифеста для задания, которое не удалось выполнить.
+
+    Args:
+        job: Задание из build_jobs.
+        error: Исключение, помешавшее выполнить задание.
+
+    Returns:
+        Запись манифеста со статусом "error".
+    """
+    result = {key: job[key] for key in ("id", "export", "document", "template", "output")}
+    result.update(
+        inputs=job["inputs"],
+        status="error",
+        error=f"{type(error).__name__}: {error}",
+        size=None,
+        cached=False,
+        decoder=DECODER.name,
+        seconds=0.0,
+        timings={},
+    )
+    return result
+
+
+def publish_dataset(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Разбирает выгрузку и помещает нормализованные данные в общую память.
+
+    Выполняется в рабочем процессе один раз для всех заданий, которым нужна
+    одна и та же выгрузка. Блок общей памяти удаляет основной процесс.
+
+    Args:
+        job: Любое из заданий группы (используются export, document, dedup).
+
+    Returns:
+        Словарь с описанием блока (layout), отчетом об удаленных повторах
+        и временем загрузки и нормализации.
+
+    Raises:
+        ValueError: Если в выгрузке нет данных.
+    """
+    load_started = time.perf_counter()
+    data = read_json(job["export"])
+    loaded = time.perf_counter()
+    normalizer = with_deduplication(
+        JSON_TO_RECORDS_FUNCTIONS[job["document"]], job["dedup"]
+    )
+    records = normalizer(data)
+    if not records:
+        raise ValueError("Нет данных для вставки.")
+    normalized = time.perf_counter()
+
+    block, layout = share_records(records)
+    hand_over(block)
+    return {
+        "layout": layout,
+        "duplicates": duplicates_report(records),
+        "timings": {
+            "load": loaded - load_started,
+            "normalize": normalized - loaded,
+            "share": time.perf_counter() - normalized,
+        },
+    }
+
+
+def shared_groups(
+    jobs: List[Dict[str, Any]],
+    templates: Dict[str, bytes],
+    cache: Optional[OutputCache],
+) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+    """
+    Находит задания, которым нужна одна и та же нормализованная выгрузка.
+
+    Задания, документ которых уже есть в кэше (и для которых не нужны
+    таблицы), данные не загружают и в группы не входят.
+
+    Args:
+        jobs: Задания из build_jobs.
+        templates: Содержимое шаблонов по типам документов.
+        cache: Кэш готовых документов или None.
+
+    Returns:
+        Словарь {(выгрузка, функция нормализации): задания} только для
+        групп из двух и более заданий.
+    """
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for job in jobs:
+        normalizer = with_deduplication(
+            JSON_TO_RECORDS_FUNCTIONS[job["document"]], job["dedup"]
+        )
+        data_digest = source_digest(job["export"], normalizer)
+        if cache is not None and not job["tables"] and cache.contains(
+            document_key(
+                job["document"], templates[job["document"]], data_digest,
+                job["placeholders"],
+            )
+        ):
+            continue
+        groups.setdefault((job["export"], data_digest), []).append(job)
+    return {key: group for key, group in groups.items() if len(group) > 1}
+
+
+def load_manifest(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Читает манифест предыдущего запуска.
+
+    Args:
+        path: Путь к манифесту.
+
+    Returns:
+        Словарь {идентификатор задания: запись}; пустой, если манифеста нет.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return {entry["id"]: entry for entry in manifest.get("jobs", [])}
+
+
+def write_manifest(path: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Атомарно записывает манифест.
+
+    Args:
+        path: Путь к манифесту.
+        entries: Записи о заданиях.
+    """
+    jobs = sorted(entries.values(), key=lambda entry: entry["id"])
+    manifest = {
+        "jobs": jobs,
+        "ok": sum(1 for entry in jobs if entry["status"] in ("ok", "skipped")),
+        "errors": sum(1 for entry in jobs if entry["status"] == "error"),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def is_completed(job: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> bool:
+    """
+    Проверяет, можно ли пропустить задание при повторном запуске.
+
+    Args:
+        job: Задание.
+        previous: Запись о задании из прошлого манифеста.
+
+    Returns:
+        True, если задание выполнено успешно с теми же входными данными
+        и результат все еще существует.
+    """
+    return bool(
+        previous
+        and previous.get("status") in ("ok", "skipped")
+        and previous.get("inputs") == job["inputs"]
+        and os.path.exists(job["output"])
+    )
+
+
+def run_batch(
+    exports: List[str],
+    templates: Dict[str, str],
+    output_dir: str,
+    placeholders: Optional[Dict[str, str]] = None,
+    workers: Optional[int] = None,
+    resume: bool = False,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    cache_size: int = DEFAULT_MAX_BYTES,
+    dedup_rule: Optional[str] = DEFAULT_DEDUP_RULE,
+    table_formats: Iterable[str] = (),
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Выполняет пакетную генерацию.
+
+    Args:
+        exports: Пути к JSON-выгрузкам.
+        templates: Словарь {тип документа: путь к шаблону}.
+        output_dir: Папка для результатов и манифеста.
+        placeholders: Значения плейсхолдеров, общие для всех заданий.
+        workers: Число процессов (по умолчанию — число ядер).
+        resume: Пропускать задания, выполненные в прошлом запуске.
+        cache_dir: Папка кэша готовых документов; None — без кэша.
+        cache_size: Максимальный размер кэша в байтах.
+        dedup_rule: Правило удаления повторяющихся докладов; None — не удалять.
+        table_formats: Форматы таблиц с нормализованными данными (csv, xlsx).
+
+    Returns:
+        Записи манифеста по всем заданиям.
+
+    Raises:
+        KeyError: Если указан неизвестный тип документа.
+    """
+    for name in templates:
+        if name not in GENERATORS:
+            raise KeyError(f"Неизвестный тип документа: {name}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    previous = load_manifest(manifest_path) if resume else {}
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    pending = []
+    for job in build_jobs(
+        exports, templates, output_dir, placeholders or {}, cache_dir, cache_size,
+        dedup_rule, table_formats,
+    ):
+        if is_completed(job, previous.get(job["id"])):
+            entries[job["id"]] = dict(previous[job["id"]], status="skipped")
+        else:
+            pending.append(job)
+
+    lock = threading.Lock()
+
+    def on_written(written: WriteResult) -> None:
+        """Дополняет запись манифеста результатом сохранения файла."""
+        with lock:
+            entry = entries[written.tag]
+            entry["timings"]["save"] = round(written.seconds, 4)
+            entry["seconds"] = round(entry["seconds"] + written.seconds, 4)
+            if not written.ok:
+                entry.update(status="error", error=written.error, size=None)
+            # Манифест обновляется после каждого задания,
+            # чтобы прерванный запуск можно было продолжить
+            write_manifest(manifest_path, entries)
+
+    # Шаблоны читаются один раз; если шаблон недоступен, ошибкой
+    # отмечаются только задания, которым он нужен
+    template_data: Dict[str, bytes] = {}
+    for name in dict.fromkeys(job["document"] for job in pending):
+        try:
+            template_data[name] = read_template(templates[name])
+        except OSError as e:
+            for job in pending:
+                if job["document"] == name:
+                    entries[job["id"]] = failed_result(job, e)
+    pending = [job for job in pending if job["document"] in template_data]
+
+    if pending:
+        # Шаблоны и выгрузки, нужные нескольким заданиям, передаются
+        # рабочим процессам через общую память, а не копией с каждым заданием
+        cache = OutputCache(cache_dir, cache_size) if cache_dir else None
+        groups = shared_groups(pending, template_data, cache)
+        grouped = {job["id"] for group in groups.values() for job in group}
+        blocks: List[shared_memory.SharedMemory] = []
+        datasets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        remaining = {key: len(group) for key, group in groups.items()}
+        group_of = {job["id"]: key for key, group in groups.items() for job in group}
+
+        try:
+            for name, template in template_data.items():
+                block, handle = share_bytes(template)
+                blocks.append(block)
+                for job in pending:
+                    if job["document"] == name:
+                        job["template_data"] = handle
+
+            with OutputWriter(
+                max_pending=(workers or os.cpu_count() or 1) * 2, on_written=on_written
+            ) as writer, ProcessPoolExecutor(max_workers=workers) as executor:
+                futures: Dict[Future, Tuple[str, Any]] = {}
+
+                def finish(result: Dict[str, Any], data: Optional[bytes]) -> None:
+                    """Учитывает результат задания и передает документ на запись."""
+                    key = group_of.get(result["id"])
+                    if key in datasets:
+                        shared = datasets[key]
+                        result["duplicates"] = shared["duplicates"]
+                        result["timings"].update(
+                            (name, round(value, 4))
+                            for name, value in shared["timings"].items()
+                        )
+                    if key is not None:
+                        remaining[key] -= 1
+                        if remaining[key] == 0 and key in datasets:
+                            # Все задания группы выполнены: освобождаем память
+                            block_name = datasets[key]["layout"]["name"]
+                            for block in [b for b in blocks if b.name == block_name]:
+                                blocks.remove(block)
+                                release(block)
+                    with lock:
+                        entries[result["id"]] = result
+                        if data is None:
+                            write_manifest(manifest_path, entries)
+                    if data is not None:
+                        writer.submit(result["output"], data, tag=result["id"])
+
+                def submit(job: Dict[str, Any]) -> None:
+                    """Передает задание пулу; при сбое пула задание отмечается ошибкой."""
+                    try:
+                        futures[executor.submit(run_job, job)] = ("job", job)
+                    except Exception as e:
+                        finish(failed_result(job, e), None)
+
+                for key, group in groups.items():
+                    futures[executor.submit(publish_dataset, group[0])] = ("dataset", key)
+                for job in pending:
+                    if job["id"] not in grouped:
+                        submit(job)
+
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        kind, item = futures.pop(future)
+                        if kind == "dataset":
+                            try:
+                                datasets[item] = future.result()
+                                blocks.append(shared_memory.SharedMemory(
+                                    name=datasets[item]["layout"]["name"]
+                                ))
+                            except Exception:
+                                # Задания группы загрузят выгрузку сами
+                                # и сообщат об ошибке каждое по отдельности
+                                pass
+                            for job in groups[item]:
+                                if item in datasets:
+                                    job["dataset"] = datasets[item]["layout"]
+                                submit(job)
+                            continue
+
+                        try:
+                            result, data = future.result()
+                        except Exception as e:
+                            # Рабочий процесс завершился аварийно (BrokenProcessPool)
+                            # или ошибка возникла вне run_job: ошибка только этого задания
+                            result, data = failed_result(item, e), None
+                        finish(result, data)
+        finally:
+            for block in blocks:
+                release(block)
+
+    return entries
+
+
+def parse_pairs(pairs: Iterable[str]) -> Dict[str, str]:
+    """
+    Разбирает аргументы вида "ключ=значение".
+
+    Args:
+        pairs: Строки аргументов.
+
+    Returns:
+        Словарь значений.
+
+    Raises:
+        ValueError: Если в строке нет знака "=".
+    """
+    result = {}
+    for pair in pairs:
+        if "=" not in pair:
+            raise ValueError(f"Ожидается формат ключ=значение: {pair}")
+        key, value = pair.split("=", 1)
+        result[key.strip()] = value.strip()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Args:
+        argv: Аргументы командной строки.
+
+    Returns:
+        Код возврата: 0 — без ошибок, 1 — есть неудачные задания.
+    """
+    parser = argparse.ArgumentParser(description="Пакетная генерация DOCX из JSON")
+    parser.add_argument("exports", help="Папка или glob-шаблон JSON-выгрузок")
+    parser.add_argument("output_dir", help="Папка для результатов и манифеста")
+    parser.add_argument(
+        "--template", action="append", default=[], metavar="ТИП=ПУТЬ",
+        help="Шаблон для типа документа (можно указать несколько раз)",
+    )
+    parser.add_argument(
+        "--templates", metavar="JSON",
+        help="JSON-файл со словарем {тип документа: путь к шаблону}",
+    )
+    parser.add_argument(
+        "--placeholder", action="append", default=[], metavar="ИМЯ=ЗНАЧЕНИЕ",
+        help="Значение плейсхолдера (можно указать несколько раз)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов")
+    parser.add_argument(
+        "--resume", action="store_true", help="Пропустить выполненные задания"
+    )
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR, help="Папка кэша готовых документов"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Максимальный размер кэша в МБ",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Не использовать кэш готовых документов"
+    )
+    parser.add_argument(
+        "--dedup", choices=DEDUP_RULES + ("off",), default=DEFAULT_DEDUP_RULE,
+        help="Какой из повторяющихся докладов оставлять (off — не удалять повторы)",
+    )
+    parser.add_argument(
+        "--export", action="append", default=[], choices=EXPORT_FORMATS,
+        help="Сохранить рядом с документом таблицу с данными (можно указать несколько раз)",
+    )
+    args = parser.parse_args(argv)
+
+    templates: Dict[str, str] = {}
+    if args.templates:
+        templates.update(read_json(args.templates))
+    templates.update(parse_pairs(args.template))
+    if not templates:
+        parser.error("Не указан ни один шаблон (--template или --templates)")
+    unknown = [name for name in templates if name not in GENERATORS]
+    if unknown:
+        parser.error(
+            f"Неизвестный тип документа: {', '.join(unknown)}. "
+            f"Допустимые значения: {', '.join(GENERATORS)}"
+        )
+
+    exports = find_exports(args.exports)
+    if not exports:
+        parser.error(f"Не найдены JSON-выгрузки: {args.exports}")
+
+    entries = run_batch(
+        exports,
+        templates,
+        args.output_dir,
+        placeholders=parse_pairs(args.placeholder),
+        workers=args.workers,
+        resume=args.resume,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_size=args.cache_size * 1024 * 1024,
+        dedup_rule=None if args.dedup == "off" else args.dedup,
+        table_formats=args.export,
+    )
+    for entry in sorted(entries.values(), key=lambda entry: entry["id"]):
+        line = f"[{entry['status']}] {entry['id']} ({entry['seconds']} с)"
+        if "load" in entry["timings"]:
+            line += f", {entry['decoder']}: {entry['timings']['load']} с"
+        if entry.get("cached"):
+            line += " из кэша"
+        if entry.get("duplicates"):
+            line += f", удалено повторов: {len(entry['duplicates'])}"
+        if entry["error"]:
+            line += f": {entry['error']}"
+        print(line)
+
+    return 1 if any(entry["status"] == "error" for entry in entries.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+# modules/dataset_index.py
+
+"""Модуль индексированного отбора записей набора данных.
+
+Для каждого набора данных один раз строятся индексы: по значениям
+аудитории и номера группы, по датам (отсортированный массив для поиска
+диапазона) и обратный индекс слов названий и ФИО. Отбор по фильтру
+сводится к поиску в этих индексах и пересечению отсортированных массивов
+номеров строк, без просмотра всего DataFrame, поэтому предпросмотр
+обновляется сразу при вводе фильтра.
+"""
+
+import bisect
+import datetime
+import re
+import weakref
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.records import parse_datetime
+
+# Варианты названий столбцов для каждого вида отбора
+INDEX_COLUMNS = {
+    "room": ("Ауд.",),
+    "date": ("Дата и время начала",),
+    "group": ("Номер группы",),
+    "title": ("Название доклада", "Title"),
+    "speaker": ("ФИО докладчика", "Submitter", "Авторы"),
+}
+
+# Форматы дат, которые можно вводить в фильтре
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d.%m.%y")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def normalize_value(value: Any) -> str:
+    """Приводит значение к виду для сравнения: регистр, "ё" и пробелы по краям."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ""
+    return str(value).strip().casefold().replace("ё", "е")
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Разбивает текст на нормализованные слова.
+
+    Args:
+        text: Текст (название доклада, ФИО).
+
+    Returns:
+        Слова в нижнем регистре.
+    """
+    return _TOKEN_RE.findall(normalize_value(text))
+
+
+def parse_date(text: str) -> Optional[datetime.date]:
+    """
+    Разбирает дату из поля фильтра.
+
+    Args:
+        text: Дата в формате ДД.ММ.ГГГГ или ГГГГ-ММ-ДД; пустая строка — без
+            ограничения.
+
+    Returns:
+        Дата или None.
+
+    Raises:
+        ValueError: Если дату не удалось разобрать.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Неверная дата: {text}. Ожидается формат ДД.ММ.ГГГГ")
+
+
+@dataclass(frozen=True)
+class DatasetFilter:
+    """Условия отбора записей; пустые поля не ограничивают отбор."""
+
+    room: str = ""
+    date_from: Optional[datetime.date] = None
+    date_to: Optional[datetime.date] = None
+    group_prefix: str = ""
+    speaker: str = ""
+    text: str = ""
+
+    def is_empty(self) -> bool:
+        """True, если фильтр не задает ни одного условия."""
+        return not any(getattr(self, field.name) for field in fields(self))
+
+
+def _union(arrays: List[np.ndarray]) -> np.ndarray:
+    """Объединяет отсортированные массивы номеров строк."""
+    if not arrays:
+        return _EMPTY
+    if len(arrays) == 1:
+        return arrays[0]
+    return np.unique(np.concatenate(arrays))
+
+
+class _TokenIndex:
+    """Обратный индекс слов: слово -> номера строк, с поиском по началу слова."""
+
+    def __init__(self, values: pd.Series) -> None:
+        positions: Dict[str, List[np.ndarray]] = {}
+        # Слова выделяются только из уникальных значений столбца
+        for value, rows in _value_positions(values).items():
+            for token in set(tokenize(value)):
+                positions.setdefault(token, []).append(rows)
+        self._positions = {token: _union(rows) for token, rows in positions.items()}
+        self._tokens = sorted(self._positions)
+
+    def lookup(self, prefix: str) -> np.ndarray:
+        """Возвращает строки, содержащие слово, начинающееся с prefix."""
+        start = bisect.bisect_left(self._tokens, prefix)
+        end = bisect.bisect_left(self._tokens, prefix + "\U0010ffff", start)
+        return _union([self._positions[token] for token in self._tokens[start:end]])
+
+
+def _local_day(value: Any) -> np.datetime64:
+    """Возвращает день даты и времени начала доклада по местному времени."""
+    start = parse_datetime(value)
+    if start is None:
+        return np.datetime64("NaT")
+    return np.datetime64(start.date(), "D")
+
+
+def _value_positions(values: pd.Series) -> Dict[Any, np.ndarray]:
+    """Группирует номера строк по значениям столбца (через хэш-таблицу)."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {
+        uniques[i]: order[bounds[i]:bounds[i + 1]].astype(np.int64)
+        for i in range(len(uniques))
+    }
+
+
+class DatasetIndex:
+    """Индексы одного набора данных для быстрого отбора записей."""
+
+    def __init__(self, dataframe: pd.DataFrame) -> None:
+        """
+        Строит индексы по имеющимся в DataFrame столбцам.
+
+        Args:
+            dataframe: DataFrame с данными (не изменяется).
+        """
+        self.size = len(dataframe)
+        self.columns = {
+            role: [column for column in variants if column in dataframe.columns]
+            for role, variants in INDEX_COLUMNS.items()
+        }
+
+        # Аудитории и группы: нормализованное значение -> номера строк
+        self._rooms = self._values(dataframe, "room")
+        groups = self._values(dataframe, "group")
+        self._group_keys = sorted(groups)
+        self._groups = groups
+
+        # Даты: отсортированные значения и соответствующие номера строк.
+        # День берется по местному времени записи, как при группировке
+        # докладов по заседаниям (records.group_by_date)
+        self._dates = np.empty(0, dtype="datetime64[D]")
+        self._date_rows = _EMPTY
+        if self.columns["date"]:
+            codes, uniques = pd.factorize(
+                dataframe[self.columns["date"][0]], use_na_sentinel=True
+            )
+            unique_days = np.array(
+                [_local_day(value) for value in uniques] + [np.datetime64("NaT")],
+                dtype="datetime64[D]",
+            )
+            # Код -1 (пустое значение) указывает на последний элемент — NaT
+            days = unique_days[codes]
+            valid = np.flatnonzero(~np.isnat(days))
+            order = valid[np.argsort(days[valid], kind="stable")]
+            self._dates = days[order]
+            self._date_rows = order.astype(np.int64)
+
+        self._tokens = {
+            role: [_TokenIndex(dataframe[column]) for column in self.columns[role]]
+            for role in ("title", "speaker")
+        }
+        self._last: Optional[Tuple[DatasetFilter, np.ndarray]] = None
+        self._subset: Optional[Tuple[DatasetFilter, pd.DataFrame]] = None
+
+    def _values(self, dataframe: pd.DataFrame, role: str) -> Dict[str, np.ndarray]:
+        """Строит индекс нормализованных значений столбца."""
+        if not self.columns[role]:
+            return {}
+        result: Dict[str, List[np.ndarray]] = {}
+        for value, rows in _value_positions(dataframe[self.columns[role][0]]).items():
+            result.setdefault(normalize_value(value), []).append(rows)
+        return {key: _union(rows) for key, rows in result.items()}
+
+    def _match_tokens(self, roles: Tuple[str, ...], query: str) -> Optional[np.ndarray]:
+        """Отбирает строки, содержащие все слова запроса (по началу слова)."""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+        indexes = [index for role in roles for index in self._tokens[role]]
+        result = None
+        for token in tokens:
+            rows = _union([index.lookup(token) for index in indexes])
+            result = rows if result is None else np.intersect1d(result, rows, True)
+        return result
+
+    def select(self, record_filter: DatasetFilter) -> np.ndarray:
+        """
+        Возвращает номера строк, удовлетворяющих фильтру.
+
+        Args:
+            record_filter: Условия отбора.
+
+        Returns:
+            Отсортированный массив номеров строк (позиций в DataFrame).
+        """
+        if self._last and self._last[0] == record_filter:
+            return self._last[1]
+
+        # Условия по столбцам, которых нет в наборе (например, аудитория
+        # в списке публикаций), не ограничивают отбор
+        candidates: List[np.ndarray] = []
+        if record_filter.room and self.columns["room"]:
+            candidates.append(self._rooms.get(normalize_value(record_filter.room), _EMPTY))
+        if record_filter.group_prefix and self.columns["group"]:
+            prefix = normalize_value(record_filter.group_prefix)
+            start = bisect.bisect_left(self._group_keys, prefix)
+            end = bisect.bisect_left(self._group_keys, prefix + "\U0010ffff", start)
+            candidates.append(
+                _union([self._groups[key] for key in self._group_keys[start:end]])
+            )
+        if (record_filter.date_from or record_filter.date_to) and self.columns["date"]:
+            start = 0
+            end = len(self._dates)
+            if record_filter.date_from:
+                start = np.searchsorted(
+                    self._dates, np.datetime64(record_filter.date_from, "D"), "left"
+                )
+            if record_filter.date_to:
+                end = np.searchsorted(
+                    self._dates, np.datetime64(record_filter.date_to, "D"), "right"
+                )
+            candidates.append(np.sort(self._date_rows[start:end]))
+        for roles, query in (
+            (("speaker",), record_filter.speaker),
+            (("title", "speaker"), record_filter.text),
+        ):
+            rows = self._match_tokens(roles, query)
+            if rows is not None:
+                candidates.append(rows)
+
+        if not candidates:
+            result = np.arange(self.size, dtype=np.int64)
+        else:
+            result = candidates[0]
+            for rows in candidates[1:]:
+                result = np.intersect1d(result, rows, assume_unique=True)
+        self._last = (record_filter, result)
+        return result
+
+    def subset(self, dataframe: pd.DataFrame, record_filter: DatasetFilter) -> pd.DataFrame:
+        """
+        Возвращает DataFrame с отобранными строками в исходном порядке.
+
+        Результат для последнего фильтра запоминается, поэтому предпросмотр
+        и генерация документа получают один и тот же объект.
+
+        Args:
+            dataframe: DataFrame, по которому построен индекс.
+            record_filter: Условия отбора.
+
+        Returns:
+            Исходный DataFrame, если отобраны все строки, иначе новый DataFrame.
+        """
+        if self._subset and self._subset[0] == record_filter:
+            return self._subset[1]
+        rows = self.select(record_filter)
+        if len(rows) == self.size:
+            result = dataframe
+        else:
+            result = dataframe.take(rows).reset_index(drop=True)
+        self._subset = (record_filter, result)
+        return result
+
+
+class DatasetIndexCache:
+    """Индексы загруженных наборов данных; индекс удаляется вместе с набором."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустой кэш."""
+        self._indexes: Dict[int, Tuple[Any, DatasetIndex]] = {}
+
+    def get(self, dataframe: pd.DataFrame) -> DatasetIndex:
+        """
+        Возвращает индекс набора данных, строя его при первом обращении.
+
+        Args:
+            dataframe: DataFrame с данными.
+
+        Returns:
+            Индекс набора.
+        """
+        key = id(dataframe)
+        cached = self._indexes.get(key)
+        if cached and cached[0]() is dataframe:
+            return cached[1]
+        index = DatasetIndex(dataframe)
+        reference = weakref.ref(dataframe, lambda _: self._indexes.pop(key, None))
+        self._indexes[key] = (reference, index)
+        return index
+
+    def filter(
+        self, dataframe: Optional[pd.DataFrame], record_filter: DatasetFilter
+    ) -> Optional[pd.DataFrame]:
+        """
+        Отбирает записи набора данных по фильтру.
+
+        Args:
+            dataframe: DataFrame с данными или None.
+            record_filter: Условия отбора.
+
+        Returns:
+            Исходный DataFrame, если фильтр пуст, иначе новый DataFrame
+            с отобранными строками в исходном порядке.
+        """
+        if dataframe is None or record_filter.is_empty():
+            return dataframe
+        return self.get(dataframe).subset(dataframe, record_filter)
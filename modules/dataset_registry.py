@@ -0,0 +1,200 @@
+# modules/dataset_registry.py
+
+"""Модуль общего реестра загруженных наборов данных.
+
+Один и тот же JSON-файл, нормализованный одной и той же функцией,
+загружается один раз и выдается всем вкладкам по ссылке. Реестр ведет
+подсчет ссылок; наборы, которые никто не использует, остаются в памяти
+для повторного использования, пока их суммарный размер не превысит бюджет,
+после чего вытесняются в порядке давности использования (LRU).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from modules.records import records_size
+
+# Ключ набора: (абсолютный путь, mtime_ns, размер файла, функция нормализации)
+DatasetKey = Tuple[str, int, int, str]
+
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+
+
+def normalizer_name(normalizer: Callable[..., Any]) -> str:
+    """
+    Возвращает устойчивое имя функции нормализации для ключа реестра.
+
+    Args:
+        normalizer: Функция преобразования JSON в DataFrame.
+
+    Returns:
+        Полное имя функции.
+    """
+    return f"{normalizer.__module__}.{normalizer.__qualname__}"
+
+
+class _Entry:
+    """Запись реестра: набор данных, число ссылок и занимаемая память."""
+
+    __slots__ = ("dataframe", "refs", "size")
+
+    def __init__(self, dataframe: Any) -> None:
+        self.dataframe = dataframe
+        self.refs = 0
+        if hasattr(dataframe, "memory_usage"):
+            self.size = int(dataframe.memory_usage(index=True, deep=True).sum())
+        else:
+            self.size = records_size(dataframe)
+
+
+class DatasetRegistry:
+    """Реестр нормализованных наборов данных с подсчетом ссылок.
+
+    Потокобезопасен: наборы можно загружать из фоновых потоков.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> None:
+        """
+        Инициализирует реестр.
+
+        Args:
+            memory_budget: Бюджет памяти для неиспользуемых наборов в байтах.
+        """
+        self.memory_budget = memory_budget
+        self._entries: "OrderedDict[DatasetKey, _Entry]" = OrderedDict()
+        self._keys_by_id: Dict[int, DatasetKey] = {}
+        self._lock = threading.RLock()
+
+    def key_for(self, path: str, normalizer: Callable[..., Any]) -> DatasetKey:
+        """
+        Вычисляет ключ набора для файла и функции нормализации.
+
+        Args:
+            path: Путь к JSON файлу.
+            normalizer: Функция преобразования JSON в DataFrame.
+
+        Returns:
+            Ключ набора.
+
+        Raises:
+            OSError: Если файл недоступен.
+        """
+        stat = os.stat(path)
+        return (
+            os.path.abspath(path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            normalizer_name(normalizer),
+        )
+
+    def acquire(
+        self,
+        path: str,
+        normalizer: Callable[[Any], Any],
+        loader: Callable[[str], Any],
+    ) -> Any:
+        """
+        Возвращает набор данных, загружая его только при отсутствии в реестре.
+
+        Каждый вызов увеличивает число ссылок; после использования набор
+        нужно вернуть методом release.
+
+        Args:
+            path: Путь к JSON файлу.
+            normalizer: Функция преобразования JSON в DataFrame или записи.
+            loader: Функция чтения JSON файла.
+
+        Returns:
+            Общий для всех пользователей набор данных. Его нельзя изменять.
+        """
+        key = self.key_for(path, normalizer)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self._entries.move_to_end(key)
+                return entry.dataframe
+
+        # Загрузка выполняется без блокировки, чтобы не задерживать
+        # другие потоки; при гонке остается набор, загруженный первым
+        dataframe = normalizer(loader(path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(dataframe)
+                self._entries[key] = entry
+                self._keys_by_id[id(dataframe)] = key
+            entry.refs += 1
+            self._entries.move_to_end(key)
+            self._evict()
+            return entry.dataframe
+
+    def retain(self, dataframe: Any) -> bool:
+        """
+        Добавляет ссылку на набор, уже полученный другим пользователем.
+
+        Args:
+            dataframe: Набор из реестра.
+
+        Returns:
+            True, если набор найден в реестре.
+        """
+        with self._lock:
+            entry = self._find(dataframe)
+            if entry is None:
+                return False
+            entry.refs += 1
+            return True
+
+    def release(self, dataframe: Optional[Any]) -> None:
+        """
+        Возвращает ссылку на набор данных.
+
+        Args:
+            dataframe: Набор, полученный из acquire. Прочие значения игнорируются.
+        """
+        if dataframe is None:
+            return
+        with self._lock:
+            entry = self._find(dataframe)
+            if entry is None:
+                return
+            entry.refs = max(entry.refs - 1, 0)
+            self._evict()
+
+    def memory_usage(self) -> int:
+        """
+        Возвращает суммарный размер наборов в реестре.
+
+        Returns:
+            Размер в байтах.
+        """
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _find(self, dataframe: Any) -> Optional[_Entry]:
+        """Находит запись реестра по самому объекту набора данных."""
+        key = self._keys_by_id.get(id(dataframe))
+        entry = self._entries.get(key) if key else None
+        if entry is None or entry.dataframe is not dataframe:
+            return None
+        return entry
+
+    def _evict(self) -> None:
+        """Вытесняет неиспользуемые наборы, пока размер превышает бюджет."""
+        total = sum(entry.size for entry in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.memory_budget:
+                break
+            entry = self._entries[key]
+            if entry.refs:
+                continue
+            del self._entries[key]
+            self._keys_by_id.pop(id(entry.dataframe), None)
+            total -= entry.size
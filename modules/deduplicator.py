@@ -0,0 +1,249 @@
+# modules/deduplicator.py
+
+"""Модуль удаления повторяющихся докладов.
+
+Выгрузки часто содержат один и тот же доклад несколько раз (повторная
+подача, отозванная и заново поданная заявка). Записи сравниваются по
+нормализованным названию, докладчику и номеру группы через хэш-индекс
+(словарь ключей), поэтому проверка выполняется за линейное время,
+без попарного сравнения. Записи, у которых все эти поля пусты,
+повторами не считаются. Какая из повторяющихся записей остается,
+определяется правилом, а удаленные записи собираются в отчет.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from modules.records import RecordSet, columns_of, is_missing
+
+# Правила выбора остающейся записи:
+#   first    — первая в выгрузке;
+#   last     — последняя в выгрузке (самая поздняя подача);
+#   complete — с наибольшим числом заполненных полей, при равенстве последняя.
+DEDUP_RULES = ("first", "last", "complete")
+
+DEFAULT_DEDUP_RULE = "last"
+
+# Варианты названий столбцов для каждой части ключа
+KEY_COLUMNS = (
+    ("Название доклада", "Title"),
+    ("ФИО докладчика", "Submitter"),
+    ("Номер группы",),
+)
+
+# Атрибут набора данных, в котором хранится отчет об удаленных записях
+DUPLICATES_ATTR = "duplicates"
+
+_PUNCTUATION_RE = re.compile(r"[\W_]+")
+
+
+def normalize_text(values: Iterable[Any]) -> List[str]:
+    """
+    Нормализует строки для сравнения: регистр, "ё", знаки препинания и пробелы.
+
+    Каждое уникальное значение обрабатывается один раз.
+
+    Args:
+        values: Значения столбца.
+
+    Returns:
+        Нормализованные строки в исходном порядке.
+    """
+    normalized: Dict[Any, str] = {}
+    result = []
+    for value in values:
+        text = "" if is_missing(value) else str(value)
+        key = normalized.get(text)
+        if key is None:
+            key = _PUNCTUATION_RE.sub(" ", text.casefold().replace("ё", "е")).strip()
+            normalized[text] = key
+        result.append(key)
+    return result
+
+
+def key_columns(records: Any) -> List[str]:
+    """
+    Определяет столбцы, из которых строится ключ записи.
+
+    Args:
+        records: Записи с докладами (RecordSet, список словарей или DataFrame).
+
+    Returns:
+        Имена имеющихся в данных столбцов ключа.
+    """
+    available = columns_of(records)
+    columns = []
+    for variants in KEY_COLUMNS:
+        column = next((c for c in variants if c in available), None)
+        if column:
+            columns.append(column)
+    return columns
+
+
+def _filled(record: Mapping[str, Any]) -> int:
+    """Возвращает число заполненных полей записи."""
+    return sum(
+        1 for value in record.values() if not is_missing(value) and str(value) != ""
+    )
+
+
+def _priority(records: List[Mapping[str, Any]], rule: str) -> List[int]:
+    """Возвращает номера записей в порядке убывания приоритета."""
+    if rule == "first":
+        return list(range(len(records)))
+    if rule == "last":
+        return list(range(len(records) - 1, -1, -1))
+    if rule == "complete":
+        filled = [_filled(record) for record in records]
+        # Устойчивая сортировка по убыванию заполненности,
+        # при равенстве — более поздняя запись
+        return sorted(range(len(records) - 1, -1, -1), key=lambda i: -filled[i])
+    raise ValueError(
+        f"Неизвестное правило: {rule}. Допустимые значения: {', '.join(DEDUP_RULES)}"
+    )
+
+
+def deduplicate(
+    records: List[Mapping[str, Any]], rule: str = DEFAULT_DEDUP_RULE
+) -> Tuple[RecordSet, List[Dict[str, Any]]]:
+    """
+    Удаляет повторяющиеся записи.
+
+    Args:
+        records: Записи с докладами (RecordSet или список словарей).
+        rule: Правило выбора остающейся записи (см. DEDUP_RULES).
+
+    Returns:
+        Кортеж (записи без повторов в исходном порядке, отчет об удаленных
+        записях: для каждой — номер записи в загруженных данных, номер
+        оставленной записи и поля ключа).
+
+    Raises:
+        ValueError: Если правило неизвестно.
+    """
+    columns = key_columns(records)
+    kept = RecordSet(records, columns_of(records), getattr(records, "attrs", None))
+    if not records or not columns:
+        return kept, []
+
+    keys = list(zip(*(normalize_text(record.get(c) for record in records) for c in columns)))
+
+    # Ключ -> номер оставленной записи; проверка по хэшу ключа
+    winners: Dict[Tuple[str, ...], int] = {}
+    dropped = []
+    for i in _priority(records, rule):
+        if not any(keys[i]):
+            # Записи без названия, докладчика и группы не с чем сравнивать
+            continue
+        if keys[i] in winners:
+            dropped.append(i)
+        else:
+            winners[keys[i]] = i
+    if not dropped:
+        return kept, []
+
+    dropped.sort()
+    report = []
+    for i in dropped:
+        entry = {"Запись": i + 1, "Оставлена запись": winners[keys[i]] + 1}
+        for column in columns:
+            entry[column] = records[i].get(column)
+        report.append(entry)
+
+    skip = set(dropped)
+    kept[:] = [record for i, record in enumerate(records) if i not in skip]
+    return kept, report
+
+
+class Deduplicated:
+    """Функция нормализации JSON с последующим удалением повторов.
+
+    Отчет об удаленных записях сохраняется в атрибутах набора данных
+    (records.attrs["duplicates"]; при построении DataFrame переносится в
+    dataframe.attrs), поэтому он хранится вместе с набором данных в
+    реестре и доступен всем вкладкам.
+    """
+
+    def __init__(self, normalizer: Callable[[Any], RecordSet], rule: str) -> None:
+        """
+        Args:
+            normalizer: Функция преобразования JSON в записи.
+            rule: Правило выбора остающейся записи.
+        """
+        if rule not in DEDUP_RULES:
+            raise ValueError(
+                f"Неизвестное правило: {rule}. "
+                f"Допустимые значения: {', '.join(DEDUP_RULES)}"
+            )
+        self.normalizer = normalizer
+        self.rule = rule
+        # Имя учитывается в ключах реестра наборов данных и кэша документов
+        self.__module__ = normalizer.__module__
+        self.__qualname__ = f"{normalizer.__qualname__}[dedup={rule}]"
+        self.__name__ = normalizer.__name__
+
+    def __call__(self, data: Any) -> RecordSet:
+        records, report = deduplicate(self.normalizer(data), self.rule)
+        records.attrs[DUPLICATES_ATTR] = report
+        return records
+
+
+def with_deduplication(
+    normalizer: Callable[[Any], RecordSet], rule: Optional[str] = DEFAULT_DEDUP_RULE
+) -> Callable[[Any], RecordSet]:
+    """
+    Добавляет к функции нормализации этап удаления повторов.
+
+    Args:
+        normalizer: Функция преобразования JSON в записи (в том числе
+            уже обернутая with_deduplication).
+        rule: Правило выбора остающейся записи; None — без удаления повторов.
+
+    Returns:
+        Функция преобразования JSON в записи.
+
+    Raises:
+        ValueError: Если правило неизвестно.
+    """
+    if isinstance(normalizer, Deduplicated):
+        normalizer = normalizer.normalizer
+    return Deduplicated(normalizer, rule) if rule else normalizer
+
+
+def duplicates_report(dataframe: Any) -> List[Dict[str, Any]]:
+    """
+    Возвращает отчет об удаленных при загрузке записях.
+
+    Args:
+        dataframe: Записи, полученные функцией with_deduplication, или
+            построенный по ним DataFrame.
+
+    Returns:
+        Список удаленных записей; пустой, если повторов не было.
+    """
+    if dataframe is None:
+        return []
+    return list(dataframe.attrs.get(DUPLICATES_ATTR, []))
+
+
+def format_duplicates_report(report: List[Dict[str, Any]]) -> List[str]:
+    """
+    Формирует текстовые строки отчета об удаленных записях.
+
+    Args:
+        report: Отчет из deduplicate.
+
+    Returns:
+        Строки вида "Запись 5 (повтор записи 2): поля ключа".
+    """
+    lines = []
+    for record in report:
+        fields = "; ".join(
+            str(value) for key, value in record.items()
+            if key not in ("Запись", "Оставлена запись") and value
+        )
+        lines.append(
+            f"Запись {record['Запись']} (повтор записи {record['Оставлена запись']}): "
+            f"{fields}"
+        )
+    return lines
@@ -0,0 +1,299 @@
+# modules/document_pipeline.py
+
+"""Модуль, связывающий типы документов с функциями загрузки и генерации.
+
+Используется как графическим интерфейсом, так и фоновыми режимами работы
+(наблюдение за файлами), которым нужна генерация без диалоговых окон.
+Генерация работает с записями (см. modules.records) и не требует pandas;
+DataFrame строится только для интерфейса.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from modules import (
+    publish_docx_generator,
+    program_docx_generator,
+    report_docx_generator,
+)
+from modules.dataset_registry import normalizer_name
+from modules.deduplicator import DEFAULT_DEDUP_RULE, with_deduplication
+from modules.output_cache import OutputCache, digest_file, get_or_render, make_key
+from modules.records import (
+    AsDataFrame,
+    Dataset,
+    RecordSet,
+    papers_json_to_records,
+    report_json_to_records,
+)
+from modules.template_compiler import compile_template
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Функции преобразования JSON в записи для каждого типа документа (без
+# удаления повторов: правило выбирает пользователь, см. normalizer_for)
+JSON_TO_RECORDS_FUNCTIONS: Dict[str, Callable[[Any], RecordSet]] = {
+    "Список представляемых к публикации докладов": papers_json_to_records,
+    "Программа": report_json_to_records,
+    "Отчет о проведении": report_json_to_records,
+}
+
+# Те же функции для интерфейса: результат — DataFrame для таблицы,
+# предпросмотра и отбора записей (pandas загружается при первом вызове)
+JSON_TO_DF_FUNCTIONS: Dict[str, Callable[[Any], "pd.DataFrame"]] = {
+    name: AsDataFrame(normalizer) for name, normalizer in JSON_TO_RECORDS_FUNCTIONS.items()
+}
+
+# Модули генераторов для каждого типа документа
+GENERATORS: Dict[str, Any] = {
+    "Список представляемых к публикации докладов": publish_docx_generator,
+    "Программа": program_docx_generator,
+    "Отчет о проведении": report_docx_generator,
+}
+
+
+def normalizer_for(
+    name: str, dedup_rule: Optional[str] = DEFAULT_DEDUP_RULE, dataframe: bool = False
+) -> Callable[[Any], Dataset]:
+    """
+    Возвращает функцию нормализации JSON для типа документа.
+
+    Args:
+        name: Тип документа (название вкладки).
+        dedup_rule: Правило удаления повторяющихся докладов; None — не удалять.
+        dataframe: Возвращать DataFrame (для интерфейса) вместо записей.
+
+    Returns:
+        Функция преобразования JSON в записи или DataFrame.
+
+    Raises:
+        KeyError: Если тип документа неизвестен.
+        ValueError: Если правило неизвестно.
+    """
+    normalizer = with_deduplication(JSON_TO_RECORDS_FUNCTIONS[name], dedup_rule)
+    return AsDataFrame(normalizer) if dataframe else normalizer
+
+
+def read_template(path: str) -> bytes:
+    """
+    Читает шаблон DOCX целиком в память.
+
+    Args:
+        path: Путь к шаблону.
+
+    Returns:
+        Содержимое файла шаблона.
+    """
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def source_digest(path: str, normalizer: Callable[[Any], Dataset]) -> str:
+    """
+    Вычисляет хэш данных документа по JSON-файлу и функции нормализации.
+
+    Имя функции учитывается, чтобы смена правил обработки (например,
+    удаления повторов) не возвращала из кэша устаревший документ.
+
+    Args:
+        path: Путь к JSON файлу.
+        normalizer: Функция преобразования JSON в записи или DataFrame.
+
+    Returns:
+        Строка-хэш для render_cached.
+    """
+    return f"{digest_file(path)}:{normalizer_name(normalizer)}"
+
+
+def render_document(
+    name: str,
+    template: bytes,
+    dataframe: Dataset,
+    placeholders: Dict[str, str],
+) -> bytes:
+    """
+    Формирует документ заданного типа.
+
+    Args:
+        name: Тип документа (название вкладки).
+        template: Содержимое шаблона.
+        dataframe: Записи или DataFrame с данными.
+        placeholders: Значения плейсхолдеров.
+
+    Returns:
+        Содержимое файла DOCX.
+
+    Raises:
+        KeyError: Если для типа документа нет генератора.
+    """
+    return GENERATORS[name].render_bytes(template, dataframe, placeholders)
+
+
+def document_key(
+    name: str, template: bytes, data_digest: str, placeholders: Dict[str, str]
+) -> str:
+    """
+    Формирует ключ кэша готового документа.
+
+    Args:
+        name: Тип документа (название вкладки).
+        template: Содержимое шаблона.
+        data_digest: Хэш данных (source_digest или digest_dataframe).
+        placeholders: Значения плейсхолдеров.
+
+    Returns:
+        Ключ для OutputCache.
+    """
+    return make_key(
+        name, GENERATORS[name].GENERATOR_VERSION, data_digest, template, placeholders
+    )
+
+
+def render_cached(
+    name: str,
+    template: bytes,
+    data_digest: str,
+    placeholders: Dict[str, str],
+    load_dataframe: Callable[[], Dataset],
+    cache: Optional[OutputCache],
+) -> Tuple[bytes, bool]:
+    """
+    Формирует документ в виде байтов, используя кэш готовых документов.
+
+    Данные загружаются функцией load_dataframe только при промахе кэша,
+    поэтому при неизменных входных данных JSON даже не разбирается.
+
+    Args:
+        name: Тип документа (название вкладки).
+        template: Содержимое шаблона.
+        data_digest: Хэш данных (source_digest или digest_dataframe).
+        placeholders: Значения плейсхолдеров.
+        load_dataframe: Функция, возвращающая записи или DataFrame с данными.
+        cache: Кэш готовых документов или None.
+
+    Returns:
+        Кортеж (содержимое DOCX, взят ли документ из кэша).
+    """
+    key = document_key(name, template, data_digest, placeholders)
+    return get_or_render(
+        cache,
+        key,
+        lambda: render_document(name, template, load_dataframe(), placeholders),
+    )
+
+
+def _render_prepared(
+    name: str, template: bytes, context: Dict[str, Any], placeholders: Dict[str, str]
+) -> bytes:
+    """Заполняет шаблон подготовленными записями (в том числе в рабочем процессе)."""
+    return GENERATORS[name].render_prepared(template, context, placeholders)
+
+
+def render_variants(
+    name: str,
+    templates: Sequence[bytes],
+    dataframe: Dataset,
+    placeholders: Dict[str, str],
+    workers: int = 1,
+) -> List[bytes]:
+    """
+    Формирует документ одного типа по нескольким шаблонам за один проход.
+
+    Данные готовятся один раз (template_context генератора: разбор дат,
+    сортировка, группировка по заседаниям, строки для вывода), поэтому
+    каждый следующий вариант шаблона стоит только заполнения шаблона.
+
+    Шаблоны с блоками повторения заполняются склейкой готовых фрагментов
+    XML за доли секунды и формируются в текущем процессе. Остальные
+    шаблоны заполняются через python-docx: это работа интерпретатора,
+    которая в потоках не распараллеливается из-за GIL, поэтому при
+    workers > 1 такие варианты формируются в пуле процессов.
+
+    Args:
+        name: Тип документа (название вкладки).
+        templates: Содержимое шаблонов вариантов.
+        dataframe: Записи или DataFrame с данными.
+        placeholders: Значения плейсхолдеров, общие для всех вариантов.
+        workers: Число процессов для заполнения шаблонов; 1 — последовательно.
+
+    Returns:
+        Содержимое файлов DOCX в порядке шаблонов.
+
+    Raises:
+        KeyError: Если для типа документа нет генератора.
+    """
+    context = GENERATORS[name].template_context(dataframe)
+    slow = [i for i, template in enumerate(templates) if not compile_template(template).has_blocks]
+    if workers <= 1 or len(slow) <= 1:
+        return [_render_prepared(name, template, context, placeholders) for template in templates]
+
+    results: List[Optional[bytes]] = [None] * len(templates)
+    # Пул запускается и из фонового потока интерфейса, а fork многопоточного
+    # процесса небезопасен, поэтому рабочие процессы создаются через spawn
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(slow)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        futures = {
+            i: executor.submit(_render_prepared, name, templates[i], context, placeholders)
+            for i in slow
+        }
+        for i, template in enumerate(templates):
+            if i not in futures:
+                results[i] = _render_prepared(name, template, context, placeholders)
+        for i, future in futures.items():
+            results[i] = future.result()
+    return results
+
+
+def render_variants_cached(
+    name: str,
+    templates: Sequence[bytes],
+    data_digest: str,
+    placeholders: Dict[str, str],
+    load_dataframe: Callable[[], Dataset],
+    cache: Optional[OutputCache],
+    workers: int = 1,
+) -> List[Tuple[bytes, bool]]:
+    """
+    Формирует варианты документа, используя кэш готовых документов.
+
+    Данные загружаются и готовятся только если хотя бы одного варианта
+    нет в кэше; формируются только недостающие варианты.
+
+    Args:
+        name: Тип документа (название вкладки).
+        templates: Содержимое шаблонов вариантов.
+        data_digest: Хэш данных (source_digest или digest_dataframe).
+        placeholders: Значения плейсхолдеров.
+        load_dataframe: Функция, возвращающая записи или DataFrame с данными.
+        cache: Кэш готовых документов или None.
+        workers: Число процессов для заполнения шаблонов.
+
+    Returns:
+        Для каждого шаблона кортеж (содержимое DOCX, взят ли документ из кэша).
+    """
+    keys = [document_key(name, template, data_digest, placeholders) for template in templates]
+    results: List[Optional[Tuple[bytes, bool]]] = [None] * len(templates)
+    if cache is not None:
+        for i, key in enumerate(keys):
+            data = cache.get(key)
+            if data is not None:
+                results[i] = (data, True)
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        rendered = render_variants(
+            name, [templates[i] for i in missing], load_dataframe(), placeholders, workers
+        )
+        for i, data in zip(missing, rendered):
+            if cache is not None:
+                try:
+                    cache.put(keys[i], data)
+                except OSError:
+                    # Недоступный кэш не должен мешать генерации
+                    pass
+            results[i] = (data, False)
+    return results
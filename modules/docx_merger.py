@@ -0,0 +1,742 @@
+# modules/docx_merger.py
+
+"""Модуль сборки одного документа из готовых DOCX на уровне XML.
+
+После формирования программ или отчетов по всем секциям МСНК нужна общая
+книга. Вместо повторной генерации из объединенной выгрузки содержимое уже
+готовых документов (например, из кэша или папки пакетной генерации)
+переносится в первый документ:
+
+* номера заседаний ("Заседание N") становятся сквозными;
+* одинаковые стили и описания нумерации не дублируются, различающиеся
+  стили с совпадающим идентификатором переименовываются;
+* изображения и другие связанные части копируются с новыми
+  идентификаторами связей (одинаковые файлы — один раз).
+
+Каждый документ разбирается один раз, поэтому время сборки растет
+линейно с общим объемом.
+
+Пример запуска:
+
+    python -m modules.docx_merger book.docx "out/* - Программа.docx"
+    python -m modules.docx_merger book.docx --manifest out/manifest.json \\
+        --document "Программа"
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import posixpath
+import re
+import sys
+import zipfile
+from copy import deepcopy
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lxml import etree
+
+from modules.output_cache import write_file_atomic
+from modules.template_compiler import DOCUMENT_PART
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PR_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+_WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+_W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+_RT_STYLES = f"{_R_NS}/styles"
+_RT_NUMBERING = f"{_R_NS}/numbering"
+_CT_NUMBERING = "application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"
+
+_CONTENT_TYPES_PART = "[Content_Types].xml"
+_DOCUMENT_RELS = "word/_rels/document.xml.rels"
+
+# Заголовок заседания в начале абзаца: "Заседание 3." или "Заседание 3"
+SESSION_PATTERN = re.compile(r"^(\s*Заседание\s+)(\d+)")
+
+# Ссылки на части, которые сборка не переносит
+_UNSUPPORTED = {
+    "footnoteReference": "сноски",
+    "endnoteReference": "концевые сноски",
+    "commentReference": "примечания",
+}
+
+# Атрибуты со ссылками на стили и нумерацию
+_STYLE_REFS = ("pStyle", "rStyle", "tblStyle", "basedOn", "next", "link")
+
+
+def _w(tag: str) -> str:
+    """Возвращает полное имя элемента WordprocessingML."""
+    return f"{{{_W_NS}}}{tag}"
+
+
+_VAL = _w("val")
+
+# Элементы со ссылками на связи документа (изображения, гиперссылки и т. п.)
+_RELATED = etree.XPath("descendant-or-self::*[@r:*]", namespaces={"r": _R_NS})
+
+
+def _canonical(element: Any, ignore: Iterable[str] = ()) -> bytes:
+    """Возвращает каноническое представление элемента для сравнения."""
+    element = deepcopy(element)
+    for attribute in ignore:
+        element.attrib.pop(attribute, None)
+    return etree.tostring(element, method="c14n")
+
+
+def _rels_path(part: str) -> str:
+    """Возвращает путь к файлу связей части."""
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def _resolve(part: str, target: str) -> str:
+    """Возвращает имя части по цели связи относительно части-источника."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part), target))
+
+
+class _Source:
+    """Разобранный документ, содержимое которого переносится в книгу."""
+
+    def __init__(self, data: bytes) -> None:
+        self.zip = zipfile.ZipFile(io.BytesIO(data))
+        self.names = set(self.zip.namelist())
+        self.document = etree.fromstring(self.zip.read(DOCUMENT_PART))
+        self.rels = self.relationships(DOCUMENT_PART)
+        content_types = etree.fromstring(self.zip.read(_CONTENT_TYPES_PART))
+        self.defaults = {
+            item.get("Extension").lower(): item.get("ContentType")
+            for item in content_types.iter(f"{{{_CT_NS}}}Default")
+        }
+        self.overrides = {
+            item.get("PartName").lstrip("/"): item.get("ContentType")
+            for item in content_types.iter(f"{{{_CT_NS}}}Override")
+        }
+
+    def relationships(self, part: str) -> Dict[str, Any]:
+        """Возвращает связи части: идентификатор -> элемент Relationship."""
+        path = _rels_path(part)
+        if path not in self.names:
+            return {}
+        root = etree.fromstring(self.zip.read(path))
+        return {rel.get("Id"): rel for rel in root.iter(f"{{{_PR_NS}}}Relationship")}
+
+    def part_by_type(self, rel_type: str) -> Optional[Any]:
+        """Возвращает корневой элемент части, связанной с документом, по типу."""
+        for rel in self.rels.values():
+            if rel.get("Type") == rel_type and rel.get("TargetMode") != "External":
+                name = _resolve(DOCUMENT_PART, rel.get("Target"))
+                if name in self.names:
+                    return etree.fromstring(self.zip.read(name))
+        return None
+
+    def content_type(self, part: str) -> Optional[str]:
+        """Возвращает тип содержимого части."""
+        if part in self.overrides:
+            return self.overrides[part]
+        return self.defaults.get(posixpath.splitext(part)[1].lstrip(".").lower())
+
+
+class DocumentMerger:
+    """Сборщик книги: первый документ дополняется содержимым остальных.
+
+    Пример:
+        merger = DocumentMerger(first)
+        for data in others:
+            merger.append(data)
+        book = merger.to_bytes()
+    """
+
+    def __init__(self, data: bytes, page_break: bool = True) -> None:
+        """
+        Args:
+            data: Содержимое первого документа; его оформление страниц,
+                колонтитулы и стили по умолчанию становятся оформлением книги.
+            page_break: Начинать каждый следующий документ с новой страницы.
+        """
+        self.page_break = page_break
+        self.base = _Source(data)
+        self.count = 1
+        self.sessions = 0
+        self.body = self.base.document.find(_w("body"))
+        # Параметры последнего раздела остаются в конце тела книги
+        self._section = None
+        if len(self.body) and self.body[-1].tag == _w("sectPr"):
+            self._section = self.body[-1]
+
+        # Части, которые будут записаны заново или добавлены
+        self._parts: Dict[str, bytes] = {}
+        self._names = set(self.base.names)
+        # Одинаковые изображения первого и добавляемых документов хранятся один раз
+        self._media: Dict[Tuple[str, str], str] = {
+            self._media_key(self.base, name): name
+            for name in self.base.names
+            if name.startswith("word/media/")
+        }
+        self._content_types = etree.fromstring(self.base.zip.read(_CONTENT_TYPES_PART))
+
+        self._rels_root = etree.fromstring(self.base.zip.read(_DOCUMENT_RELS))
+        self._rel_ids = {rel.get("Id") for rel in self._rels_root}
+
+        self._styles_part, self.styles = self._base_part(_RT_STYLES)
+        self._style_keys: Dict[str, bytes] = {}
+        # Переименованные стили: (идентификатор, описание в документе) -> стиль книги
+        self._style_variants: Dict[Tuple[str, bytes], str] = {}
+        if self.styles is not None:
+            for style in self.styles.iter(_w("style")):
+                self._style_keys[style.get(_w("styleId"))] = _canonical(style)
+
+        self._numbering_part, self.numbering = self._base_part(_RT_NUMBERING)
+        self._abstract_keys: Dict[bytes, str] = {}
+        self._abstract_starts: Dict[str, str] = {}
+        self._last_abstract = None
+        self._next_abstract = 0
+        self._next_num = 1
+        if self.numbering is not None:
+            for abstract in self.numbering.iter(_w("abstractNum")):
+                self._add_abstract(abstract)
+            self._next_num = max(
+                (int(num.get(_w("numId"))) for num in self.numbering.iter(_w("num"))),
+                default=0,
+            ) + 1
+
+        self._bookmark_id = max(
+            (int(item.get(_w("id"), 0)) for item in self.body.iter(_w("bookmarkStart"))),
+            default=0,
+        )
+        self._drawing_id = max(
+            (int(item.get("id", 0)) for item in self.body.iter(f"{{{_WP_NS}}}docPr")),
+            default=0,
+        )
+
+    def _add_abstract(self, abstract: Any) -> str:
+        """Запоминает описание нумерации книги и возвращает его идентификатор."""
+        abstract_id = abstract.get(_w("abstractNumId"))
+        self._abstract_keys.setdefault(self._abstract_key(abstract), abstract_id)
+        start = abstract.find(f"{_w('lvl')}[@{_w('ilvl')}='0']/{_w('start')}")
+        self._abstract_starts[abstract_id] = "1" if start is None else start.get(_VAL, "1")
+        self._last_abstract = abstract
+        self._next_abstract = max(self._next_abstract, int(abstract_id) + 1)
+        return abstract_id
+
+    def _base_part(self, rel_type: str) -> Tuple[Optional[str], Optional[Any]]:
+        """Находит часть первого документа по типу связи."""
+        for rel in self._rels_root:
+            if rel.get("Type") == rel_type:
+                name = _resolve(DOCUMENT_PART, rel.get("Target"))
+                if name in self.base.names:
+                    return name, etree.fromstring(self.base.zip.read(name))
+        return None, None
+
+    @staticmethod
+    def _media_key(source: _Source, name: str) -> Tuple[str, str]:
+        """Ключ части по типу содержимого и хэшу."""
+        data = source.zip.read(name)
+        content_type = source.content_type(name) or "application/octet-stream"
+        return content_type, hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def _abstract_key(abstract: Any) -> bytes:
+        """Ключ описания нумерации без идентификаторов, не влияющих на вид."""
+        abstract = deepcopy(abstract)
+        for tag in ("nsid", "tmpl"):
+            for child in abstract.findall(_w(tag)):
+                abstract.remove(child)
+        return _canonical(abstract, ignore=(_w("abstractNumId"),))
+
+    def append(self, data: bytes) -> None:
+        """
+        Добавляет в книгу содержимое документа.
+
+        Args:
+            data: Содержимое DOCX.
+
+        Raises:
+            ValueError: Если документ содержит сноски или примечания.
+        """
+        source = _Source(data)
+        body = source.document.find(_w("body"))
+        content = [child for child in body if child.tag != _w("sectPr")]
+        for tag, label in _UNSUPPORTED.items():
+            for element in content:
+                if next(element.iter(_w(tag)), None) is not None:
+                    raise ValueError(f"Сборка документов со ссылками на {label} не поддерживается")
+
+        style_map, added_styles = self._merge_styles(source)
+        num_map = self._merge_numbering(source, style_map)
+        for style in added_styles:
+            for node in style.iter(_w("numId")):
+                if node.get(_VAL) in num_map:
+                    node.set(_VAL, num_map[node.get(_VAL)])
+        rel_map: Dict[str, str] = {}
+        part_map: Dict[str, str] = {}
+
+        if self.page_break:
+            paragraph = etree.SubElement(etree.Element(_w("body")), _w("p"))
+            run = etree.SubElement(paragraph, _w("r"))
+            etree.SubElement(run, _w("br")).set(_w("type"), "page")
+            self._insert(paragraph)
+
+        bookmark_base = self._bookmark_id + 1
+        for element in content:
+            self._remap(element, source, style_map, num_map, bookmark_base, rel_map, part_map)
+            self._insert(element)
+        self.count += 1
+
+    def _insert(self, element: Any) -> None:
+        """Добавляет элемент в конец тела книги (перед параметрами раздела)."""
+        if self._section is not None:
+            self._section.addprevious(element)
+        else:
+            self.body.append(element)
+
+    def _remap(
+        self,
+        element: Any,
+        source: _Source,
+        style_map: Dict[str, str],
+        num_map: Dict[str, str],
+        bookmark_base: int,
+        rel_map: Dict[str, str],
+        part_map: Dict[str, str],
+    ) -> None:
+        """Переводит ссылки элемента на стили, нумерацию, связи и идентификаторы."""
+        if style_map:
+            for node in element.iter(*(_w(tag) for tag in _STYLE_REFS)):
+                if node.get(_VAL) in style_map:
+                    node.set(_VAL, style_map[node.get(_VAL)])
+        if num_map:
+            for node in element.iter(_w("numId")):
+                if node.get(_VAL) in num_map:
+                    node.set(_VAL, num_map[node.get(_VAL)])
+        for node in element.iter(_w("bookmarkStart"), _w("bookmarkEnd")):
+            # Идентификаторы закладок должны быть уникальны во всей книге
+            bookmark_id = bookmark_base + int(node.get(_w("id"), 0))
+            node.set(_w("id"), str(bookmark_id))
+            self._bookmark_id = max(self._bookmark_id, bookmark_id)
+        for node in element.iter(_w("p")):
+            # Идентификаторы абзацев Word не обязательны и могут совпасть
+            node.attrib.pop(f"{{{_W14_NS}}}paraId", None)
+            node.attrib.pop(f"{{{_W14_NS}}}textId", None)
+        for node in element.iter(f"{{{_WP_NS}}}docPr"):
+            self._drawing_id += 1
+            node.set("id", str(self._drawing_id))
+
+        for node in _RELATED(element):
+            for attribute, value in node.attrib.items():
+                if attribute.startswith(f"{{{_R_NS}}}") and value in source.rels:
+                    if value not in rel_map:
+                        rel_map[value] = self._copy_relationship(
+                            source, source.rels[value], part_map
+                        )
+                    node.set(attribute, rel_map[value])
+
+    def _next_rel_id(self) -> str:
+        """Возвращает свободный идентификатор связи документа книги."""
+        number = len(self._rel_ids) + 1
+        while f"rId{number}" in self._rel_ids:
+            number += 1
+        rel_id = f"rId{number}"
+        self._rel_ids.add(rel_id)
+        return rel_id
+
+    def _copy_relationship(
+        self, source: _Source, rel: Any, part_map: Dict[str, str]
+    ) -> str:
+        """Добавляет в книгу связь документа-источника и возвращает ее идентификатор."""
+        new_rel = etree.SubElement(self._rels_root, f"{{{_PR_NS}}}Relationship")
+        new_rel.set("Id", self._next_rel_id())
+        new_rel.set("Type", rel.get("Type"))
+        if rel.get("TargetMode") == "External":
+            new_rel.set("Target", rel.get("Target"))
+            new_rel.set("TargetMode", "External")
+        else:
+            name = self._copy_part(source, _resolve(DOCUMENT_PART, rel.get("Target")), part_map)
+            new_rel.set("Target", posixpath.relpath(name, posixpath.dirname(DOCUMENT_PART)))
+        return new_rel.get("Id")
+
+    def _copy_part(self, source: _Source, name: str, part_map: Dict[str, str]) -> str:
+        """
+        Копирует часть (изображение, колонтитул и т. п.) вместе с ее связями.
+
+        Части без собственных связей с одинаковым содержимым копируются один
+        раз на всю книгу.
+
+        Returns:
+            Имя части в книге.
+        """
+        if name in part_map:
+            return part_map[name]
+        data = source.zip.read(name)
+        content_type = source.content_type(name) or "application/octet-stream"
+        own_rels = source.relationships(name)
+
+        media_key = (content_type, hashlib.sha256(data).hexdigest())
+        if not own_rels and media_key in self._media:
+            part_map[name] = self._media[media_key]
+            return part_map[name]
+
+        new_name = name
+        stem, extension = posixpath.splitext(name)
+        number = 1
+        while new_name in self._names:
+            number += 1
+            new_name = f"{stem}_{number}{extension}"
+        self._names.add(new_name)
+        part_map[name] = new_name
+        if not own_rels:
+            self._media[media_key] = new_name
+        self._add_content_type(new_name, content_type)
+
+        if own_rels:
+            rels_root = etree.Element(f"{{{_PR_NS}}}Relationships", nsmap={None: _PR_NS})
+            for rel in own_rels.values():
+                copied = deepcopy(rel)
+                if rel.get("TargetMode") != "External":
+                    target = self._copy_part(source, _resolve(name, rel.get("Target")), part_map)
+                    copied.set("Target", posixpath.relpath(target, posixpath.dirname(new_name)))
+                rels_root.append(copied)
+            self._parts[_rels_path(new_name)] = etree.tostring(
+                rels_root, xml_declaration=True, encoding="UTF-8", standalone=True
+            )
+        self._parts[new_name] = data
+        return new_name
+
+    def _add_content_type(self, name: str, content_type: str) -> None:
+        """Регистрирует тип содержимого новой части."""
+        extension = posixpath.splitext(name)[1].lstrip(".").lower()
+        for default in self._content_types.iter(f"{{{_CT_NS}}}Default"):
+            if default.get("Extension").lower() == extension:
+                if default.get("ContentType") == content_type:
+                    return
+                break
+        else:
+            if extension and extension != "xml":
+                etree.SubElement(
+                    self._content_types, f"{{{_CT_NS}}}Default",
+                    Extension=extension, ContentType=content_type,
+                )
+                return
+        etree.SubElement(
+            self._content_types, f"{{{_CT_NS}}}Override",
+            PartName=f"/{name}", ContentType=content_type,
+        )
+
+    def _merge_styles(self, source: _Source) -> Tuple[Dict[str, str], List[Any]]:
+        """
+        Переносит стили документа, которых нет в книге.
+
+        Returns:
+            Кортеж (переименования стилей: идентификатор в документе -> в
+            книге, добавленные в книгу стили).
+        """
+        styles = source.part_by_type(_RT_STYLES)
+        if styles is None or self.styles is None:
+            return {}, []
+        style_map: Dict[str, str] = {}
+        added = []
+        for style in styles.iter(_w("style")):
+            style_id = style.get(_w("styleId"))
+            key = _canonical(style)
+            existing = self._style_keys.get(style_id)
+            if existing == key:
+                continue
+            if (style_id, key) in self._style_variants:
+                # Такой же стиль уже перенесен из другого документа
+                style_map[style_id] = self._style_variants[(style_id, key)]
+                continue
+            if existing is not None:
+                # Стиль с тем же идентификатором, но другим оформлением
+                number = 2
+                while f"{style_id}{number}" in self._style_keys:
+                    number += 1
+                style_map[style_id] = f"{style_id}{number}"
+                self._style_variants[(style_id, key)] = style_map[style_id]
+            added.append(style)
+
+        copies = []
+        for style in added:
+            style = deepcopy(style)
+            style_id = style.get(_w("styleId"))
+            new_id = style_map.get(style_id, style_id)
+            style.set(_w("styleId"), new_id)
+            name = style.find(_w("name"))
+            if new_id != style_id:
+                # Стилем по умолчанию остается стиль первого документа
+                style.attrib.pop(_w("default"), None)
+                if name is not None:
+                    name.set(_VAL, f"{name.get(_VAL)} ({new_id})")
+            for node in style.iter():
+                if etree.QName(node).localname in _STYLE_REFS and node.get(_VAL) in style_map:
+                    node.set(_VAL, style_map[node.get(_VAL)])
+            self.styles.append(style)
+            self._style_keys[new_id] = _canonical(style)
+            copies.append(style)
+        return style_map, copies
+
+    def _ensure_numbering(self) -> Any:
+        """Создает часть нумерации книги, если ее не было."""
+        if self.numbering is None:
+            self._numbering_part = "word/numbering.xml"
+            while self._numbering_part in self._names:
+                self._numbering_part = f"word/numbering{len(self._names)}.xml"
+            self._names.add(self._numbering_part)
+            self.numbering = etree.Element(_w("numbering"), nsmap={"w": _W_NS})
+            rel = etree.SubElement(self._rels_root, f"{{{_PR_NS}}}Relationship")
+            rel.set("Id", self._next_rel_id())
+            rel.set("Type", _RT_NUMBERING)
+            rel.set("Target", posixpath.relpath(self._numbering_part, "word"))
+            self._add_content_type(self._numbering_part, _CT_NUMBERING)
+        return self.numbering
+
+    def _merge_numbering(self, source: _Source, style_map: Dict[str, str]) -> Dict[str, str]:
+        """
+        Переносит описания нумерации документа.
+
+        Одинаковые описания (abstractNum) используются повторно; каждому
+        списку документа соответствует новый список книги, который
+        начинает нумерацию заново.
+
+        Returns:
+            Новые номера списков: numId в документе -> numId в книге.
+        """
+        numbering = source.part_by_type(_RT_NUMBERING)
+        if numbering is None:
+            return {}
+        target = self._ensure_numbering()
+
+        abstract_map: Dict[str, str] = {}
+        for abstract in numbering.iter(_w("abstractNum")):
+            key = self._abstract_key(abstract)
+            if key not in self._abstract_keys:
+                copied = deepcopy(abstract)
+                copied.set(_w("abstractNumId"), str(self._next_abstract))
+                for node in copied.iter(_w("pStyle"), _w("styleLink"), _w("numStyleLink")):
+                    if node.get(_VAL) in style_map:
+                        node.set(_VAL, style_map[node.get(_VAL)])
+                # Описания нумерации должны предшествовать спискам
+                if self._last_abstract is not None:
+                    self._last_abstract.addnext(copied)
+                else:
+                    target.insert(0, copied)
+                self._add_abstract(copied)
+            abstract_map[abstract.get(_w("abstractNumId"))] = self._abstract_keys[key]
+
+        num_map: Dict[str, str] = {}
+        for num in numbering.iter(_w("num")):
+            abstract_id = num.find(_w("abstractNumId"))
+            if abstract_id is None or abstract_id.get(_VAL) not in abstract_map:
+                continue
+            new_abstract = abstract_map[abstract_id.get(_VAL)]
+            copied = deepcopy(num)
+            copied.set(_w("numId"), str(self._next_num))
+            copied.find(_w("abstractNumId")).set(_VAL, new_abstract)
+            if not any(item.get(_w("ilvl")) == "0" for item in copied.iter(_w("lvlOverride"))):
+                # Без переопределения Word продолжил бы нумерацию предыдущего раздела
+                override = etree.SubElement(copied, _w("lvlOverride"))
+                override.set(_w("ilvl"), "0")
+                etree.SubElement(override, _w("startOverride")).set(
+                    _VAL, self._abstract_starts[new_abstract]
+                )
+            target.append(copied)
+            num_map[num.get(_w("numId"))] = str(self._next_num)
+            self._next_num += 1
+        return num_map
+
+    def renumber_sessions(self) -> int:
+        """
+        Делает номера заседаний сквозными.
+
+        Returns:
+            Число заседаний в книге.
+        """
+        number = 0
+        for paragraph in self.body.iterchildren(_w("p")):
+            texts = list(paragraph.iter(_w("t")))
+            text = "".join(node.text or "" for node in texts)
+            match = SESSION_PATTERN.match(text)
+            if not match:
+                continue
+            number += 1
+            _replace_span(texts, match.start(2), match.end(2), str(number))
+        return number
+
+    def to_bytes(self) -> bytes:
+        """
+        Формирует содержимое итогового DOCX.
+
+        Returns:
+            Содержимое файла книги.
+        """
+        self.sessions = self.renumber_sessions()
+        parts = dict(self._parts)
+        parts[DOCUMENT_PART] = self.base.document
+        parts[_DOCUMENT_RELS] = self._rels_root
+        parts[_CONTENT_TYPES_PART] = self._content_types
+        if self.styles is not None:
+            parts[self._styles_part] = self.styles
+        if self.numbering is not None:
+            parts[self._numbering_part] = self.numbering
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as target:
+            for info in self.base.zip.infolist():
+                data = parts.pop(info.filename, None)
+                if data is None:
+                    data = self.base.zip.read(info)
+                target.writestr(
+                    info.filename, _serialize(data), compress_type=zipfile.ZIP_DEFLATED
+                )
+            for name, data in parts.items():
+                target.writestr(name, _serialize(data), compress_type=zipfile.ZIP_DEFLATED)
+        return buffer.getvalue()
+
+
+def _serialize(data: Any) -> bytes:
+    """Возвращает байты части: XML-элемент сериализуется с объявлением."""
+    if isinstance(data, bytes):
+        return data
+    return etree.tostring(data, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _replace_span(texts: List[Any], start: int, end: int, value: str) -> None:
+    """Заменяет фрагмент текста абзаца, который может занимать несколько w:t."""
+    position = 0
+    for node in texts:
+        text = node.text or ""
+        node_start, node_end = position, position + len(text)
+        position = node_end
+        if node_end <= start or node_start >= end:
+            continue
+        left = text[:max(start - node_start, 0)]
+        right = text[min(end - node_start, len(text)):]
+        # Новое значение записывается в первый затронутый элемент
+        node.text = left + (value if node_start <= start else "") + right
+        if node_start <= start:
+            value = ""
+
+
+def merge_documents(documents: Sequence[bytes], page_break: bool = True) -> bytes:
+    """
+    Собирает несколько документов DOCX в один.
+
+    Args:
+        documents: Содержимое документов в порядке следования в книге.
+        page_break: Начинать каждый следующий документ с новой страницы.
+
+    Returns:
+        Содержимое итогового DOCX.
+
+    Raises:
+        ValueError: Если документов нет или документ не поддерживается.
+    """
+    if not documents:
+        raise ValueError("Нет документов для сборки.")
+    merger = DocumentMerger(documents[0], page_break)
+    for data in documents[1:]:
+        merger.append(data)
+    return merger.to_bytes()
+
+
+def merge_files(paths: Sequence[str], output_path: str, page_break: bool = True) -> int:
+    """
+    Собирает документы из файлов и сохраняет книгу.
+
+    Файлы читаются по одному, поэтому в памяти одновременно находятся
+    только книга и очередной документ.
+
+    Args:
+        paths: Пути к документам в порядке следования.
+        output_path: Путь к итоговому файлу.
+        page_break: Начинать каждый следующий документ с новой страницы.
+
+    Returns:
+        Число заседаний в книге.
+
+    Raises:
+        ValueError: Если документов нет или документ не поддерживается.
+    """
+    if not paths:
+        raise ValueError("Нет документов для сборки.")
+    with open(paths[0], "rb") as file:
+        merger = DocumentMerger(file.read(), page_break)
+    for path in paths[1:]:
+        with open(path, "rb") as file:
+            merger.append(file.read())
+    data = merger.to_bytes()
+    write_file_atomic(output_path, data)
+    return merger.sessions
+
+
+def manifest_outputs(manifest_path: str, document: Optional[str] = None) -> List[str]:
+    """
+    Возвращает готовые документы из манифеста пакетной генерации.
+
+    Args:
+        manifest_path: Путь к manifest.json.
+        document: Тип документа; None — все типы.
+
+    Returns:
+        Пути к существующим документам успешных заданий в порядке заданий.
+    """
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+    return [
+        entry["output"]
+        for entry in manifest.get("jobs", [])
+        if entry.get("status") in ("ok", "skipped")
+        and (document is None or entry.get("document") == document)
+        and os.path.exists(entry["output"])
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Args:
+        argv: Аргументы командной строки.
+
+    Returns:
+        Код возврата.
+    """
+    parser = argparse.ArgumentParser(description="Сборка книги из готовых DOCX")
+    parser.add_argument("output", help="Итоговый файл DOCX")
+    parser.add_argument(
+        "inputs", nargs="*", help="Документы или glob-шаблоны (в порядке следования)"
+    )
+    parser.add_argument(
+        "--manifest", help="Взять документы из manifest.json пакетной генерации"
+    )
+    parser.add_argument("--document", help="Тип документа из манифеста")
+    parser.add_argument(
+        "--no-page-break", action="store_true",
+        help="Не начинать документы с новой страницы",
+    )
+    args = parser.parse_args(argv)
+
+    paths: List[str] = []
+    if args.manifest:
+        paths.extend(manifest_outputs(args.manifest, args.document))
+    for pattern in args.inputs:
+        paths.extend(sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern])
+    if not paths:
+        parser.error("Не указаны документы для сборки")
+
+    try:
+        sessions = merge_files(paths, args.output, page_break=not args.no_page_break)
+    except (OSError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        print(f"Ошибка: {e}")
+        return 1
+    print(f"Собрано документов: {len(paths)}, заседаний: {sessions} -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
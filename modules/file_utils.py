@@ -0,0 +1,31 @@
+# modules/file_utils.py
+
+"""Модуль вспомогательных функций для работы с файлами входных данных.
+
+Отпечаток файла (время изменения и размер) позволяет обнаружить
+изменение выгрузки или шаблона без чтения и хэширования содержимого.
+Используется режимом наблюдения, предпросмотром и пакетной генерацией.
+"""
+
+import os
+from typing import Optional, Tuple
+
+# Отпечаток файла: (время изменения в наносекундах, размер)
+FileStamp = Optional[Tuple[int, int]]
+
+
+def file_stamp(path: str) -> FileStamp:
+    """
+    Возвращает отпечаток файла для обнаружения изменений.
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Кортеж (mtime_ns, size) или None, если файл недоступен.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,107 @@
+# modules/json_decoder.py
+
+"""Модуль выбора декодера JSON.
+
+Если установлена библиотека orjson (или ujson), используется она,
+иначе — стандартный модуль json. Файл читается одной операцией в байты
+(для orjson — через mmap без копирования), без декодирования текста
+в режиме "r". Декодер можно выбрать явно переменной окружения
+SUAI_JSON_BACKEND=orjson|ujson|json, например для сравнения скорости.
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Callable, List, Optional, Tuple
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def _load_orjson() -> Optional[Tuple[str, Callable[[Any], Any], bool]]:
+    """Возвращает декодер orjson, если библиотека установлена."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return "orjson", orjson.loads, True
+
+
+def _load_ujson() -> Optional[Tuple[str, Callable[[Any], Any], bool]]:
+    """Возвращает декодер ujson, если библиотека установлена."""
+    try:
+        import ujson
+    except ImportError:
+        return None
+    return "ujson", ujson.loads, False
+
+
+def _load_stdlib() -> Tuple[str, Callable[[Any], Any], bool]:
+    """Возвращает декодер стандартной библиотеки."""
+    return "json", json.loads, False
+
+
+_BACKENDS = {"orjson": _load_orjson, "ujson": _load_ujson, "json": _load_stdlib}
+
+
+class JsonDecoder:
+    """Декодер JSON-файлов с выбранной реализацией."""
+
+    def __init__(self, preferred: Optional[List[str]] = None) -> None:
+        """
+        Выбирает первую доступную реализацию.
+
+        Args:
+            preferred: Имена реализаций в порядке предпочтения; по умолчанию
+                берутся из SUAI_JSON_BACKEND или ["orjson", "ujson", "json"].
+        """
+        if preferred is None:
+            forced = os.environ.get("SUAI_JSON_BACKEND")
+            preferred = [forced] if forced else ["orjson", "ujson", "json"]
+
+        backend = None
+        for name in preferred:
+            loader = _BACKENDS.get(name)
+            backend = loader() if loader else None
+            if backend:
+                break
+        # Стандартный модуль доступен всегда
+        self.name, self._loads, self._accepts_buffer = backend or _load_stdlib()
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Разбирает JSON из байтов.
+
+        Args:
+            data: Содержимое в кодировке UTF-8.
+
+        Returns:
+            Разобранные данные.
+        """
+        if data.startswith(_UTF8_BOM):
+            data = data[len(_UTF8_BOM):]
+        return self._loads(data)
+
+    def load_file(self, path: str) -> Any:
+        """
+        Читает и разбирает JSON файл.
+
+        Args:
+            path: Путь к JSON файлу.
+
+        Returns:
+            Разобранные данные.
+        """
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if not self._accepts_buffer or size == 0:
+                return self.loads(file.read())
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                start = len(_UTF8_BOM) if mapped[:3] == _UTF8_BOM else 0
+                # Представление должно быть освобождено до закрытия mmap
+                with memoryview(mapped)[start:] as view:
+                    return self._loads(view)
+
+
+# Декодер, используемый приложением
+DECODER = JsonDecoder()
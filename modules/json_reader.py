@@ -3,18 +3,27 @@
 """Модуль для чтения и обработки JSON файлов."""
 
 from tkinter import filedialog, messagebox
-from typing import Any, Dict, List, Callable
-import json
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Callable, Tuple
+import time
+
+from modules.json_decoder import DECODER
+from modules.name_normalizer import NAME_NORMALIZER
+from modules.records import papers_json_to_records, report_json_to_records, to_dataframe
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def load_json(
     self: Any,
     name: str,
-    json_to_df_functions: Dict[str, Callable[[Dict[str, Any]], pd.DataFrame]]
+    json_to_df_functions: Dict[str, Callable[[Dict[str, Any]], "pd.DataFrame"]]
 ) -> None:
     """
-    Загружает JSON файл и преобразует его в DataFrame.
+    Выбирает JSON файл и запускает его фоновую загрузку в DataFrame.
+
+    Разбор начинается сразу после выбора файла, поэтому пользователь может
+    тем временем выбирать шаблон.
 
     Args:
         self: Экземпляр главного окна.
@@ -26,65 +35,65 @@ def load_json(
         return
     getattr(self, f"{name}_json_path").set(path)
 
-    try:
-        with open(path, "r", encoding="utf-8") as file:
-            data = json.load(file)
+    json_to_df_func = json_to_df_functions.get(name)
+    if not json_to_df_func:
+        messagebox.showerror(
+            "Ошибка", f"Нет функции обработки JSON для вкладки {name}"
+        )
+        return
+
+    self.load_dataset_async(name, path, json_to_df_func)
+    self.status.set(f"Загрузка файла: {path}")
+
 
-        json_to_df_func = json_to_df_functions.get(name)
-        if not json_to_df_func:
-            messagebox.showerror(
-                "Ошибка", f"Нет функции обработки JSON для вкладки {name}"
-            )
-            return
+def load_dataset(
+    registry: Any,
+    path: str,
+    json_to_df_func: Callable[[Any], "pd.DataFrame"]
+) -> Tuple["pd.DataFrame", float]:
+    """
+    Загружает набор данных через общий реестр (можно вызывать в фоновом потоке).
 
-        df = json_to_df_func(data)
-        self.dataframes[name] = df
-        self.show_dataframe_in_tree(name, df)
-        self.status.set(f"Загружен файл: {path}")
-    except Exception as e:
-        messagebox.showerror("Ошибка", f"Не удалось загрузить файл:\n{e}")
+    Вкладки с одинаковыми файлом и обработчиком разделяют один DataFrame.
 
+    Args:
+        registry: Реестр наборов данных (DatasetRegistry).
+        path: Путь к JSON файлу.
+        json_to_df_func: Функция преобразования JSON в DataFrame.
 
-def papers_json_to_dataframe(data: Dict[str, Any]) -> pd.DataFrame:
+    Returns:
+        Кортеж (DataFrame, время загрузки в секундах).
     """
-    Преобразует JSON с данными о докладах в DataFrame.
+    started = time.perf_counter()
+    df = registry.acquire(path, json_to_df_func, read_json)
+    return df, time.perf_counter() - started
+
+
+def read_json(path: str) -> Any:
+    """
+    Читает JSON файл с диска выбранным декодером (см. modules.json_decoder).
 
     Args:
-        data: Словарь с данными из JSON файла.
+        path: Путь к JSON файлу.
 
     Returns:
-        DataFrame с отфильтрованными и обработанными данными о докладах.
+        Разобранные данные.
     """
-    papers = data.get("papers", [])
-    rows = []
-
-    for paper in papers:
-        state = paper.get("state", {}).get("name", "").lower()
-        if state != "accepted":
-            continue
-
-        contribution = paper.get("contribution", {})
-        last_revision = next(
-            (
-                rev
-                for rev in paper.get("revisions", [])
-                if rev.get("is_last_revision", False)
-            ),
-            paper.get("revisions", [{}])[0],
-        )
-        submitter = last_revision.get("submitter", {})
-        full_name = submitter.get("full_name", "")
+    return DECODER.load_file(path)
 
-        formatted_name = convert_full_name(full_name)
 
-        row = {
-            "Title": contribution.get("title", ""),
-            "State": paper.get("state", {}).get("title", ""),
-            "Submitter": formatted_name,
-        }
-        rows.append(row)
+def papers_json_to_dataframe(data: Dict[str, Any]) -> "pd.DataFrame":
+    """
+    Преобразует JSON с данными о докладах в DataFrame.
 
-    return pd.DataFrame(rows)
+    Args:
+        data: Словарь с данными из JSON файла.
+
+    Returns:
+        DataFrame с отфильтрованными и обработанными данными о докладах
+        (см. modules.records.papers_json_to_records).
+    """
+    return to_dataframe(papers_json_to_records(data))
 
 
 def convert_full_name(full_name: str) -> str:
@@ -92,23 +101,16 @@ def convert_full_name(full_name: str) -> str:
     Форматирует полное имя в сокращенный вид (Фамилия И.О.).
 
     Args:
-        full_name: Полное имя в формате "Имя Отчество Фамилия" или "Имя Фамилия".
+        full_name: Полное имя в формате "Имя [Отчество] Фамилия", в том
+            числе с двойными именами и отчествами вида "оглы".
 
     Returns:
         Отформатированное имя в виде "Фамилия И.О.".
     """
-    parts = full_name.strip().split()
-    if len(parts) == 3:
-        first_name, patronymic, last_name = parts
-        return f"{last_name} {first_name[0]}.{patronymic[0]}."
-    elif len(parts) == 2:
-        first_name, last_name = parts
-        return f"{last_name} {first_name[0]}."
-    else:
-        return full_name
-
-
-def report_json_to_dataframe(data: List[Dict[str, Any]]) -> pd.DataFrame:
+    return NAME_NORMALIZER.normalize([(full_name, "", "")])[0]
+
+
+def report_json_to_dataframe(data: List[Dict[str, Any]]) -> "pd.DataFrame":
     """
     Преобразует JSON с данными о докладах в DataFrame для программы/отчета.
 
@@ -116,32 +118,7 @@ def report_json_to_dataframe(data: List[Dict[str, Any]]) -> pd.DataFrame:
         data: Список словарей с данными о докладах.
 
     Returns:
-        DataFrame с обработанными данными о докладах.
+        DataFrame с обработанными данными о докладах
+        (см. modules.records.report_json_to_records).
     """
-    rows = []
-    for abstract in data:
-        group_number = ""
-        for field in abstract.get("custom_fields", []):
-            if field["name"] == "Номер группы основного автора (докладчика)":
-                group_number = field.get("value", "")
-                break
-
-        speaker_name = ""
-        if abstract.get("persons"):
-            speaker_name = abstract["persons"][0].get("full_name", "")
-
-        title = abstract.get("title", "")
-        start_dt = abstract.get("start_dt", "")
-        room_name = abstract.get("room_name", "")
-
-        rows.append(
-            {
-                "Номер группы": group_number,
-                "ФИО докладчика": speaker_name,
-                "Название доклада": title,
-                "Дата и время начала": start_dt,
-                "Ауд.": room_name,
-            }
-        )
-
-    return pd.DataFrame(rows)
\ No newline at end of file
+    return to_dataframe(report_json_to_records(data))
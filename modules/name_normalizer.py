@@ -0,0 +1,154 @@
+# modules/name_normalizer.py
+
+"""Модуль нормализации ФИО авторов.
+
+Приводит имена к виду "Фамилия И.О." и формирует списки авторов.
+Одни и те же авторы повторяются в тысячах заявок и в разных выгрузках,
+поэтому нормализация выполняется одним проходом по уникальным именам,
+а результаты запоминаются в кэше, общем для всех выгрузок процесса.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Части отчества, которые пишутся отдельным словом и не сокращаются
+PATRONYMIC_PARTICLES = {"оглы", "кызы", "улы", "уулу", "гызы"}
+
+# Разделитель авторов в списке
+AUTHORS_SEPARATOR = ", "
+
+# Имя автора: (полное имя, имя [и отчество], фамилия)
+PersonName = Tuple[str, str, str]
+
+
+def _initials(given_names: Sequence[str]) -> str:
+    """Сокращает имя и отчество до инициалов с учетом двойных имен."""
+    initials = []
+    for name in given_names:
+        if name.lower() in PATRONYMIC_PARTICLES:
+            continue
+        # Двойное имя "Анна-Мария" сокращается до "А.-М."
+        initials.append("-".join(f"{part[0]}." for part in name.split("-") if part))
+    return "".join(initials)
+
+
+def format_person_name(full_name: str, first_name: str = "", last_name: str = "") -> str:
+    """
+    Форматирует имя в сокращенный вид (Фамилия И.О.).
+
+    Если известны отдельно имя и фамилия (поля first_name и last_name
+    выгрузки), используются они; иначе фамилией считается последнее слово
+    полного имени "Имя [Отчество] Фамилия". Уже сокращенные имена
+    ("Иванов И.И.") возвращаются без изменений.
+
+    Args:
+        full_name: Полное имя.
+        first_name: Имя и отчество, если известны.
+        last_name: Фамилия, если известна.
+
+    Returns:
+        Отформатированное имя или исходная строка, если ее нельзя разобрать.
+    """
+    if last_name and last_name.strip():
+        given_names = first_name.split()
+        if not given_names:
+            return last_name.strip()
+        return f"{last_name.strip()} {_initials(given_names)}"
+
+    parts = full_name.split()
+    if len(parts) < 2 or any(part.endswith(".") for part in parts):
+        return full_name.strip()
+    *given_names, surname = parts
+    return f"{surname} {_initials(given_names)}"
+
+
+def person_name(person: Dict[str, Any]) -> PersonName:
+    """
+    Извлекает имя автора из записи выгрузки.
+
+    Args:
+        person: Запись автора (persons, submitter) из JSON.
+
+    Returns:
+        Кортеж (полное имя, имя, фамилия).
+    """
+    return (
+        person.get("full_name") or "",
+        person.get("first_name") or "",
+        person.get("last_name") or "",
+    )
+
+
+class NameNormalizer:
+    """Нормализатор имен с кэшем уже обработанных имен."""
+
+    def __init__(self, max_size: int = 100_000) -> None:
+        """
+        Инициализирует пустой кэш.
+
+        Args:
+            max_size: Максимальное число имен в кэше; при превышении
+                кэш очищается.
+        """
+        self.max_size = max_size
+        self._memo: Dict[PersonName, str] = {}
+        # Кэш общий для потоков интерфейса и наблюдателя; изменяется под блокировкой
+        self._lock = threading.Lock()
+
+    def normalize(self, names: Iterable[PersonName]) -> List[str]:
+        """
+        Нормализует имена одним проходом по уникальным значениям.
+
+        Args:
+            names: Имена в виде кортежей (полное имя, имя, фамилия).
+
+        Returns:
+            Отформатированные имена в исходном порядке.
+        """
+        names = list(names)
+        memo = self._memo
+        # Результат собирается в локальном словаре: другой поток может
+        # в это время очистить кэш
+        formatted: Dict[PersonName, str] = {}
+        missing: Dict[PersonName, str] = {}
+        for name in dict.fromkeys(names):
+            value = memo.get(name)
+            if value is None:
+                value = missing[name] = format_person_name(*name)
+            formatted[name] = value
+        if missing:
+            with self._lock:
+                if len(memo) + len(missing) > self.max_size:
+                    memo.clear()
+                memo.update(missing)
+        return [formatted[name] for name in names]
+
+    def author_lists(self, authors: Sequence[Sequence[PersonName]]) -> List[str]:
+        """
+        Формирует строки со списками авторов для множества записей.
+
+        Имена всех записей нормализуются одним вызовом normalize.
+
+        Args:
+            authors: Для каждой записи — последовательность имен авторов.
+
+        Returns:
+            Для каждой записи строка "Фамилия И.О., Фамилия И.О.".
+        """
+        formatted = iter(self.normalize(name for names in authors for name in names))
+        return [
+            AUTHORS_SEPARATOR.join(next(formatted) for _ in names) for names in authors
+        ]
+
+    def clear(self) -> None:
+        """Очищает кэш имен."""
+        with self._lock:
+            self._memo.clear()
+
+    def __len__(self) -> int:
+        """Возвращает число имен в кэше."""
+        return len(self._memo)
+
+
+# Нормализатор, общий для всех выгрузок процесса
+NAME_NORMALIZER = NameNormalizer()
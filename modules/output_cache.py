@@ -0,0 +1,274 @@
+# modules/output_cache.py
+
+"""Модуль кэша готовых документов.
+
+Готовый DOCX хранится на диске под ключом — хэшем всех входных данных:
+данных выгрузки, содержимого шаблона, значений плейсхолдеров, типа
+документа и версии генератора. При совпадении ключа документ берется
+из кэша без разбора, заполнения и сохранения. Размер кэша ограничен,
+при превышении удаляются давно не использованные записи (LRU).
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from docx.document import Document as DocumentObject
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "suai_json_to_docx", "output"
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def digest_bytes(data: bytes) -> str:
+    """
+    Вычисляет хэш содержимого.
+
+    Args:
+        data: Данные.
+
+    Returns:
+        Хэш SHA-256 в шестнадцатеричном виде.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def digest_file(path: str) -> str:
+    """
+    Вычисляет хэш содержимого файла, не разбирая его.
+
+    Args:
+        path: Путь к файлу.
+
+    Returns:
+        Хэш SHA-256 в шестнадцатеричном виде.
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def digest_dataframe(dataframe: "pd.DataFrame") -> str:
+    """
+    Вычисляет хэш содержимого DataFrame.
+
+    Используется, когда данные уже загружены и могли быть изменены после
+    чтения файла, поэтому хэш исходного JSON не подходит.
+
+    Args:
+        dataframe: DataFrame с данными.
+
+    Returns:
+        Хэш SHA-256 в шестнадцатеричном виде.
+    """
+    # DataFrame бывает только в интерфейсе, где pandas уже загружен
+    import pandas as pd
+
+    sha = hashlib.sha256()
+    sha.update(json.dumps(list(map(str, dataframe.columns))).encode("utf-8"))
+    sha.update(pd.util.hash_pandas_object(dataframe, index=True).values.tobytes())
+    return sha.hexdigest()
+
+
+def make_key(
+    name: str,
+    version: str,
+    data_digest: str,
+    template: bytes,
+    placeholders: Dict[str, str],
+) -> str:
+    """
+    Формирует ключ кэша по всем входным данным генерации.
+
+    Args:
+        name: Тип документа.
+        version: Версия генератора.
+        data_digest: Хэш данных (digest_file или digest_dataframe).
+        template: Содержимое шаблона.
+        placeholders: Значения плейсхолдеров.
+
+    Returns:
+        Ключ кэша.
+    """
+    payload = json.dumps(
+        [name, version, data_digest, digest_bytes(template), sorted(placeholders.items())],
+        ensure_ascii=False,
+    )
+    return digest_bytes(payload.encode("utf-8"))
+
+
+def document_to_bytes(doc: DocumentObject) -> bytes:
+    """
+    Сериализует документ docx в байты.
+
+    Args:
+        doc: Документ docx.
+
+    Returns:
+        Содержимое файла DOCX.
+    """
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def write_file_atomic(path: str, data: bytes, sync: bool = False) -> None:
+    """
+    Записывает файл через временный файл и переименование.
+
+    Args:
+        path: Путь к итоговому файлу.
+        data: Содержимое.
+        sync: Сбросить данные на диск перед переименованием.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+            if sync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class OutputCache:
+    """Дисковый кэш готовых документов с вытеснением по размеру (LRU).
+
+    Время последнего использования записи хранится во времени изменения
+    файла, поэтому кэш могут одновременно использовать несколько процессов.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """
+        Инициализирует кэш.
+
+        Args:
+            directory: Папка кэша.
+            max_bytes: Максимальный суммарный размер записей в байтах.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        """Возвращает путь к файлу записи."""
+        return os.path.join(self.directory, f"{key}.docx")
+
+    def contains(self, key: str) -> bool:
+        """
+        Проверяет наличие документа в кэше, не читая его.
+
+        Args:
+            key: Ключ из make_key.
+
+        Returns:
+            True, если запись есть.
+        """
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Возвращает документ из кэша.
+
+        Args:
+            key: Ключ из make_key.
+
+        Returns:
+            Содержимое DOCX или None, если записи нет.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Сохраняет документ в кэш и при необходимости вытесняет старые записи.
+
+        Args:
+            key: Ключ из make_key.
+            data: Содержимое DOCX.
+        """
+        if len(data) > self.max_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        write_file_atomic(self._path(key), data)
+        self.evict()
+
+    def evict(self) -> None:
+        """Удаляет давно не использованные записи сверх лимита размера."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".docx"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Запись уже удалена другим процессом
+                pass
+            total -= size
+
+
+def get_or_render(
+    cache: Optional[OutputCache],
+    key: str,
+    render: Callable[[], bytes],
+) -> Tuple[bytes, bool]:
+    """
+    Возвращает документ из кэша или формирует его и сохраняет в кэш.
+
+    Args:
+        cache: Кэш; если None, документ всегда формируется заново.
+        key: Ключ из make_key.
+        render: Функция, формирующая содержимое DOCX.
+
+    Returns:
+        Кортеж (содержимое DOCX, взят ли документ из кэша).
+    """
+    if cache is not None:
+        data = cache.get(key)
+        if data is not None:
+            return data, True
+
+    data = render()
+    if cache is not None:
+        try:
+            cache.put(key, data)
+        except OSError:
+            # Недоступный кэш не должен мешать генерации
+            pass
+    return data, False
@@ -0,0 +1,137 @@
+# modules/output_writer.py
+
+"""Модуль конвейерной записи готовых документов.
+
+Готовое содержимое DOCX передается в фоновый поток записи через
+ограниченную очередь, а поток формирования тем временем переходит
+к следующему документу. Запись выполняется во временный файл с
+последующим атомарным переименованием; ошибки собираются по каждому файлу.
+Это особенно заметно при сохранении на медленный сетевой диск.
+"""
+
+import os
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from modules.output_cache import write_file_atomic
+
+
+@dataclass
+class WriteResult:
+    """Результат записи одного файла."""
+
+    path: str
+    tag: Any
+    size: int
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True, если файл записан успешно."""
+        return self.error is None
+
+
+class OutputWriter:
+    """Фоновый поток записи файлов с ограниченной очередью.
+
+    Если очередь заполнена, submit блокируется, пока поток записи не
+    освободит место, — так число готовых, но не записанных документов
+    в памяти ограничено.
+
+    Пример:
+        with OutputWriter() as writer:
+            for path, data in documents:
+                writer.submit(path, data)
+        for result in writer.results:
+            ...
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 4,
+        on_written: Optional[Callable[[WriteResult], None]] = None,
+        sync: bool = True,
+    ) -> None:
+        """
+        Инициализирует и запускает поток записи.
+
+        Args:
+            max_pending: Максимальное число документов в очереди.
+            on_written: Вызывается в потоке записи после каждого файла.
+            sync: Сбрасывать данные на диск перед переименованием.
+        """
+        self.on_written = on_written
+        self.sync = sync
+        self.results: List[WriteResult] = []
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=max(max_pending, 1))
+        self._thread = threading.Thread(target=self._run, name="OutputWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, data: bytes, tag: Any = None) -> None:
+        """
+        Ставит файл в очередь записи.
+
+        Args:
+            path: Путь к итоговому файлу.
+            data: Содержимое файла.
+            tag: Произвольная метка, возвращаемая в WriteResult.
+        """
+        self._queue.put((path, data, tag))
+
+    def close(self) -> List[WriteResult]:
+        """
+        Дожидается записи всех файлов и останавливает поток.
+
+        Returns:
+            Результаты записи в порядке завершения.
+        """
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        return self.results
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Основной цикл потока записи."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            path, data, tag = item
+
+            started = time.perf_counter()
+            error = None
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                write_file_atomic(path, data, sync=self.sync)
+            except OSError as e:
+                error = f"Не удалось записать {path}: {e.strerror or e}"
+            except Exception as e:
+                error = f"Не удалось записать {path}: {type(e).__name__}: {e}"
+
+            result = WriteResult(
+                path=path,
+                tag=tag,
+                size=len(data),
+                seconds=time.perf_counter() - started,
+                error=error,
+            )
+            self.results.append(result)
+            if self.on_written:
+                try:
+                    self.on_written(result)
+                except Exception:
+                    # Ошибка обработчика не должна останавливать запись
+                    traceback.print_exc()
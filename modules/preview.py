@@ -0,0 +1,150 @@
+# modules/preview.py
+
+"""Модуль предпросмотра содержимого документа.
+
+Формирует текстовое содержимое будущего документа (абзацы шаблона с
+подставленными плейсхолдерами, заголовки заседаний, строки докладов и
+таблиц) напрямую из данных и шаблона — без сборки объектов python-docx,
+сериализации и записи архива. Текст шаблона и строки списка кэшируются
+отдельно, поэтому при изменении плейсхолдеров пересчитывается только
+подстановка.
+"""
+
+import io
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+from modules.file_utils import FileStamp, file_stamp
+from modules.records import Dataset
+from modules.template_compiler import DOCUMENT_PART, compile_template
+from utils.docx_utils import substitute_placeholders
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_P = f"{{{_W_NS}}}p"
+_TBL = f"{{{_W_NS}}}tbl"
+_TR = f"{{{_W_NS}}}tr"
+_TC = f"{{{_W_NS}}}tc"
+_T = f"{{{_W_NS}}}t"
+_TAB = f"{{{_W_NS}}}tab"
+_BR = f"{{{_W_NS}}}br"
+
+
+def _element_text(element: Any) -> str:
+    """Собирает текст элемента с учетом табуляций и переносов строк."""
+    parts = []
+    for node in element.iter(_T, _TAB, _BR):
+        if node.tag == _T:
+            parts.append(node.text or "")
+        elif node.tag == _TAB:
+            parts.append("\t")
+        else:
+            parts.append("\n")
+    return "".join(parts)
+
+
+def document_lines(document_xml: bytes) -> List[str]:
+    """
+    Извлекает текстовые строки из основной части документа.
+
+    Абзацы выводятся по одному на строку, строки таблиц — с
+    разделителем " | " между ячейками.
+
+    Args:
+        document_xml: Содержимое word/document.xml.
+
+    Returns:
+        Строки документа в порядке следования.
+    """
+    root = etree.fromstring(document_xml)
+    body = root.find(f"{{{_W_NS}}}body")
+    lines: List[str] = []
+    for element in body:
+        if element.tag == _P:
+            lines.extend(_element_text(element).split("\n"))
+        elif element.tag == _TBL:
+            for row in element.iter(_TR):
+                lines.append(" | ".join(
+                    _element_text(cell).replace("\n", " ") for cell in row.iter(_TC)
+                ))
+    return lines
+
+
+class DocumentPreview:
+    """Построитель предпросмотра с кэшированием шаблонов и данных."""
+
+    def __init__(self) -> None:
+        """Инициализирует пустые кэши."""
+        # Путь к шаблону -> (отпечаток, содержимое, строки шаблона)
+        self._templates: Dict[str, Tuple[FileStamp, bytes, List[str]]] = {}
+        # (тип документа, id набора данных) -> (набор данных, подготовленные данные)
+        self._prepared: Dict[Tuple[str, int], Tuple[Dataset, Any]] = {}
+
+    def lines(
+        self,
+        generator: Any,
+        template_path: str,
+        dataframe: Optional[Dataset],
+        placeholders: Dict[str, str],
+    ) -> List[str]:
+        """
+        Формирует строки предпросмотра документа.
+
+        Args:
+            generator: Модуль генератора документа.
+            template_path: Путь к шаблону; может быть пустым.
+            dataframe: Записи или DataFrame с данными; None — без данных.
+            placeholders: Значения плейсхолдеров.
+
+        Returns:
+            Строки текста будущего документа.
+        """
+        has_data = dataframe is not None and len(dataframe) > 0
+        if not template_path:
+            return self._prepare(generator, "lines", dataframe) if has_data else []
+
+        template, template_lines = self._load_template(template_path)
+        plan = compile_template(template)
+        if plan.has_blocks:
+            context = self._prepare(generator, "context", dataframe) if has_data else {}
+            return document_lines(plan.render_xml(context, placeholders))
+
+        result: List[str] = []
+        for line in template_lines:
+            if has_data and generator.LIST_MARKER in line:
+                result.extend(self._prepare(generator, "lines", dataframe))
+            else:
+                result.append(substitute_placeholders(line, placeholders))
+        return result
+
+    def _load_template(self, path: str) -> Tuple[bytes, List[str]]:
+        """Возвращает содержимое и строки шаблона, читая файл только при изменении."""
+        stamp = file_stamp(path)
+        cached = self._templates.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1], cached[2]
+
+        with open(path, "rb") as file:
+            template = file.read()
+        with zipfile.ZipFile(io.BytesIO(template)) as package:
+            template_lines = document_lines(package.read(DOCUMENT_PART))
+        self._templates[path] = (stamp, template, template_lines)
+        return template, template_lines
+
+    def _prepare(self, generator: Any, kind: str, dataframe: Dataset) -> Any:
+        """Возвращает строки списка или данные для плана из кэша."""
+        key = (f"{generator.__name__}:{kind}", id(dataframe))
+        cached = self._prepared.get(key)
+        if cached and cached[0] is dataframe:
+            return cached[1]
+
+        if kind == "lines":
+            prepared = generator.preview_lines(dataframe)
+        else:
+            prepared = generator.template_context(dataframe)
+        # Данные прежних наборов больше не нужны
+        for old_key in [k for k in self._prepared if k[0] == key[0]]:
+            del self._prepared[old_key]
+        self._prepared[key] = (dataframe, prepared)
+        return prepared
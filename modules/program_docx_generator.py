@@ -2,16 +2,33 @@
 
 """Модуль для генерации DOCX файла программы."""
 
+import io
 from tkinter import filedialog, messagebox
-from typing import Any
+from typing import IO, Any, Dict, List, Union
 
-import pandas as pd
 from docx import Document
 from docx.shared import Pt
 from docx.oxml.ns import qn
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
-from utils.docx_utils import replace_placeholders_in_para, months_ru
+from modules.output_cache import (
+    digest_dataframe,
+    document_to_bytes,
+    get_or_render,
+    make_key,
+    write_file_atomic,
+)
+from modules.records import Dataset, as_records, group_by_date
+from modules.template_compiler import compile_template
+from utils.docx_utils import replace_placeholders_in_doc, months_ru
+
+
+# Версия генератора; увеличивается при изменении формируемого документа,
+# чтобы кэш готовых документов не возвращал устаревший результат
+GENERATOR_VERSION = "1"
+
+# Маркер в шаблоне, вместо которого вставляется список
+LIST_MARKER = "[[Список]]"
 
 
 def generate_docx(self: Any, name: str) -> None:
@@ -28,26 +45,24 @@ def generate_docx(self: Any, name: str) -> None:
             messagebox.showerror("Ошибка", "Не выбран шаблон документа.")
             return
 
-        doc = Document(template_path)
         placeholders = self.placeholder_values.get(name, {})
-        dataframe = self.dataframes.get(name)
+        # Данные с учетом фильтра отбора записей вкладки
+        dataframe = self.current_dataframe(name)
 
         if dataframe is None or dataframe.empty:
             messagebox.showerror("Ошибка", "Нет данных для вставки.")
             return
 
-        # Замена плейсхолдеров в документе
-        for para in doc.paragraphs:
-            replace_placeholders_in_para(para, placeholders)
-
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for para in cell.paragraphs:
-                        replace_placeholders_in_para(para, placeholders)
-
-        # Вставка списка докладов
-        insert_list(doc, dataframe)
+        with open(template_path, "rb") as file:
+            template = file.read()
+        key = make_key(
+            name, GENERATOR_VERSION, digest_dataframe(dataframe), template, placeholders
+        )
+        data, _ = get_or_render(
+            self.output_cache,
+            key,
+            lambda: render_bytes(template, dataframe, placeholders),
+        )
 
         # Сохранение документа
         save_path = filedialog.asksaveasfilename(
@@ -55,7 +70,7 @@ def generate_docx(self: Any, name: str) -> None:
             filetypes=[("Word Documents", "*.docx")]
         )
         if save_path:
-            doc.save(save_path)
+            write_file_atomic(save_path, data)
             self.status.set(f"Файл сохранён: {save_path}")
     except Exception as e:
         messagebox.showerror(
@@ -64,47 +79,169 @@ def generate_docx(self: Any, name: str) -> None:
         )
 
 
-def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
+def render_docx(
+    template: Union[str, IO[bytes]],
+    dataframe: Dataset,
+    placeholders: Dict[str, str]
+) -> Document:
+    """
+    Формирует документ программы без обращения к интерфейсу.
+
+    Args:
+        template: Путь к шаблону или файловый объект с его содержимым.
+        dataframe: Записи или DataFrame с данными о докладах (не изменяется).
+        placeholders: Значения плейсхолдеров.
+
+    Returns:
+        Заполненный документ docx.
+    """
+    doc = Document(template)
+
+    # Замена плейсхолдеров в документе
+    replace_placeholders_in_doc(doc, placeholders)
+
+    # Вставка списка докладов
+    insert_list(doc, dataframe)
+    return doc
+
+
+def render_bytes(
+    template: bytes,
+    dataframe: Dataset,
+    placeholders: Dict[str, str]
+) -> bytes:
+    """
+    Формирует документ программы в виде содержимого файла DOCX.
+
+    Шаблоны с блоками повторения заполняются по скомпилированному плану
+    (см. modules.template_compiler), остальные — вставкой списка
+    на место маркера (см. render_prepared).
+
+    Args:
+        template: Содержимое шаблона
+        dataframe: Записи или DataFrame с данными
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Содержимое файла DOCX
+    """
+    return render_prepared(template, template_context(dataframe), placeholders)
+
+
+def render_prepared(
+    template: bytes,
+    context: Dict[str, Any],
+    placeholders: Dict[str, str]
+) -> bytes:
+    """
+    Формирует документ программы по заранее подготовленным записям.
+
+    Подготовка данных (разбор дат, сортировка, группировка по заседаниям)
+    выполняется один раз функцией template_context, после чего записи
+    можно вставить в несколько шаблонов.
+
+    Args:
+        template: Содержимое шаблона
+        context: Результат template_context (не изменяется)
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Содержимое файла DOCX
+    """
+    plan = compile_template(template)
+    if plan.has_blocks:
+        return plan.render(template, context, placeholders)
+    doc = Document(io.BytesIO(template))
+    replace_placeholders_in_doc(doc, placeholders)
+    insert_context(doc, context)
+    return document_to_bytes(doc)
+
+
+def template_context(dataframe: Dataset) -> Dict[str, Any]:
+    """
+    Готовит записи для шаблона с блоками [[#Заседания]] и [[#Доклады]].
+
+    Args:
+        dataframe: Записи или DataFrame с данными о докладах (не изменяются).
+
+    Returns:
+        Словарь с ключом "Заседания": список заседаний, у каждого из которых
+        поля Номер, Дата, Время, Ауд. и список "Доклады".
+    """
+    sessions = []
+    grouped = group_by_date(as_records(dataframe), 'Дата и время начала')
+    for session_number, (date, talks) in enumerate(grouped, start=1):
+        earliest_dt = talks[0][0]
+        sessions.append({
+            "Номер": session_number,
+            "Дата": f"{earliest_dt.day} {months_ru[earliest_dt.month]}",
+            "Время": earliest_dt.strftime("%H:%M"),
+            "Ауд.": talks[0][1]['Ауд.'],
+            "Доклады": [
+                dict(row, **{'Дата и время начала': start, 'Дата': date}, Номер=i)
+                for i, (start, row) in enumerate(talks, start=1)
+            ],
+        })
+    return {"Заседания": sessions}
+
+
+def preview_lines(dataframe: Dataset) -> List[str]:
+    """
+    Формирует текстовое содержимое списка докладов для предпросмотра.
+
+    Args:
+        dataframe: Записи или DataFrame с данными о докладах.
+
+    Returns:
+        Строки, которые insert_list вставит вместо маркера.
+    """
+    lines = []
+    for session in template_context(dataframe)["Заседания"]:
+        lines.append(f"Заседание {session['Номер']}.")
+        lines.append(f"{session['Дата']}, {session['Время']}, ауд. {session['Ауд.']}")
+        for talk in session["Доклады"]:
+            lines.append(
+                f"\t{talk['Номер']}. {talk['ФИО докладчика']}, "
+                f"группа {talk['Номер группы']}"
+            )
+            lines.append(str(talk['Название доклада']))
+    return lines
+
+
+def insert_list(doc: Document, dataframe: Dataset) -> None:
     """
     Вставляет список докладов в документ, группируя по датам.
 
     Args:
         doc: Объект документа docx.
-        dataframe: DataFrame с данными о докладах.
-    """
-    # Преобразование и очистка данных
-    dataframe['Дата и время начала'] = pd.to_datetime(
-        dataframe['Дата и время начала'],
-        errors='coerce'
-    )
-    dataframe = dataframe.dropna(subset=['Дата и время начала']).copy()
-    dataframe['Дата'] = dataframe['Дата и время начала'].dt.date
-    dataframe = dataframe.sort_values(['Дата', 'Дата и время начала'])
-    grouped = dataframe.groupby('Дата')
+        dataframe: Записи или DataFrame с данными о докладах.
+    """
+    insert_context(doc, template_context(dataframe))
+
 
+def insert_context(doc: Document, context: Dict[str, Any]) -> None:
+    """
+    Вставляет подготовленный список заседаний на место маркера [[Список]].
+
+    Args:
+        doc: Объект документа docx.
+        context: Результат template_context.
+    """
     # Поиск места для вставки
     for para in doc.paragraphs:
-        if '[[Список]]' in para.text:
+        if LIST_MARKER in para.text:
             parent = para._element.getparent()
             index = parent.index(para._element)
             parent.remove(para._element)
 
-            session_number = 1
             insert_pos = index
 
             # Вставка данных по сессиям
-            for date, group_df in grouped:
-                earliest_dt = group_df['Дата и время начала'].min()
-                day = earliest_dt.day
-                month = months_ru[earliest_dt.month]
-                date_str = f"{day} {month}"
-                time_str = earliest_dt.strftime("%H:%M")
-                room = group_df.iloc[0]['Ауд.']
-
+            for session in context["Заседания"]:
                 # Заголовок сессии
                 session_header = doc.add_paragraph()
                 session_header.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                run_header = session_header.add_run(f"\nЗаседание {session_number}.")
+                run_header = session_header.add_run(f"\nЗаседание {session['Номер']}.")
                 run_header.font.name = 'Times New Roman'
                 run_header.font.size = Pt(14)
                 run_header.bold = True
@@ -114,7 +251,9 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
                 # Информация о сессии
                 session_info = doc.add_paragraph()
                 session_info.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                run_info = session_info.add_run(f"{date_str}, {time_str}, ауд. {room}\n")
+                run_info = session_info.add_run(
+                    f"{session['Дата']}, {session['Время']}, ауд. {session['Ауд.']}\n"
+                )
                 run_info.font.name = 'Times New Roman'
                 run_info.font.size = Pt(12)
                 run_info.bold = True
@@ -126,12 +265,13 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
                 insert_pos += 2
 
                 # Вставка докладов
-                for i, (_, row) in enumerate(group_df.iterrows(), start=1):
+                for talk in session["Доклады"]:
                     # Строка с докладчиком
                     p1 = doc.add_paragraph()
                     p1.alignment = WD_ALIGN_PARAGRAPH.LEFT
                     run1 = p1.add_run(
-                        f"\t{i}. {row['ФИО докладчика']}, группа {row['Номер группы']}"
+                        f"\t{talk['Номер']}. {talk['ФИО докладчика']}, "
+                        f"группа {talk['Номер группы']}"
                     )
                     run1.font.name = 'Times New Roman'
                     run1.font.size = Pt(14)
@@ -141,7 +281,7 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
                     # Строка с названием доклада
                     p2 = doc.add_paragraph()
                     p2.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    run2 = p2.add_run(row['Название доклада'])
+                    run2 = p2.add_run(talk['Название доклада'])
                     run2.font.name = 'Times New Roman'
                     run2.font.size = Pt(14)
                     run2._element.rPr.rFonts.set(qn('w:eastAsia'), 'Times New Roman')
@@ -150,6 +290,4 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
                     parent.insert(insert_pos, p1._element)
                     parent.insert(insert_pos + 1, p2._element)
                     insert_pos += 2
-
-                session_number += 1
             break
@@ -2,16 +2,33 @@
 
 """Модуль для генерации DOCX-файлов со списками публикаций."""
 
+import io
 from tkinter import filedialog, messagebox
-from typing import Any, Dict
+from typing import IO, Any, Dict, List, Union
 
 from docx import Document
 from docx.shared import Pt
 from docx.oxml.ns import qn
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-import pandas as pd
 
-from utils.docx_utils import replace_placeholders_in_para
+from modules.output_cache import (
+    digest_dataframe,
+    document_to_bytes,
+    get_or_render,
+    make_key,
+    write_file_atomic,
+)
+from modules.records import Dataset, as_records
+from modules.template_compiler import compile_template
+from utils.docx_utils import replace_placeholders_in_doc
+
+
+# Версия генератора; увеличивается при изменении формируемого документа,
+# чтобы кэш готовых документов не возвращал устаревший результат
+GENERATOR_VERSION = "2"
+
+# Маркер в шаблоне, вместо которого вставляется список
+LIST_MARKER = "[[Список]]"
 
 
 def generate_docx(self: Any, name: str) -> None:
@@ -29,27 +46,25 @@ def generate_docx(self: Any, name: str) -> None:
             messagebox.showerror("Ошибка", "Не выбран шаблон документа.")
             return
 
-        # Создаем документ и получаем данные
-        doc = Document(template_path)
+        # Получаем данные
         placeholders = self.placeholder_values.get(name, {})
-        dataframe = self.dataframes.get(name)
+        # Данные с учетом фильтра отбора записей вкладки
+        dataframe = self.current_dataframe(name)
 
         if dataframe is None or dataframe.empty:
             messagebox.showerror("Ошибка", "Нет данных для вставки.")
             return
 
-        # Заменяем плейсхолдеры в документе
-        for para in doc.paragraphs:
-            replace_placeholders_in_para(para, placeholders)
-
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for para in cell.paragraphs:
-                        replace_placeholders_in_para(para, placeholders)
-
-        # Вставляем список публикаций
-        insert_list(doc, dataframe)
+        with open(template_path, "rb") as file:
+            template = file.read()
+        key = make_key(
+            name, GENERATOR_VERSION, digest_dataframe(dataframe), template, placeholders
+        )
+        data, _ = get_or_render(
+            self.output_cache,
+            key,
+            lambda: render_bytes(template, dataframe, placeholders),
+        )
 
         # Сохраняем документ
         save_path = filedialog.asksaveasfilename(
@@ -58,7 +73,7 @@ def generate_docx(self: Any, name: str) -> None:
             title="Сохранить список публикаций"
         )
         if save_path:
-            doc.save(save_path)
+            write_file_atomic(save_path, data)
             self.status.set(f"Файл сохранен: {save_path}")
     except Exception as e:
         messagebox.showerror(
@@ -67,31 +82,150 @@ def generate_docx(self: Any, name: str) -> None:
         )
 
 
-def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
+def render_docx(
+    template: Union[str, IO[bytes]],
+    dataframe: Dataset,
+    placeholders: Dict[str, str]
+) -> Document:
+    """
+    Формирует документ со списком публикаций без обращения к интерфейсу.
+
+    Args:
+        template: Путь к шаблону или файловый объект с его содержимым
+        dataframe: Записи или DataFrame с данными о публикациях
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Заполненный документ docx
+    """
+    doc = Document(template)
+
+    # Заменяем плейсхолдеры в документе
+    replace_placeholders_in_doc(doc, placeholders)
+
+    # Вставляем список публикаций
+    insert_list(doc, dataframe)
+    return doc
+
+
+def render_bytes(
+    template: bytes,
+    dataframe: Dataset,
+    placeholders: Dict[str, str]
+) -> bytes:
+    """
+    Формирует список публикаций в виде содержимого файла DOCX.
+
+    Шаблоны с блоками повторения заполняются по скомпилированному плану
+    (см. modules.template_compiler), остальные — вставкой списка
+    на место маркера (см. render_prepared).
+
+    Args:
+        template: Содержимое шаблона
+        dataframe: Записи или DataFrame с данными
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Содержимое файла DOCX
+    """
+    return render_prepared(template, template_context(dataframe), placeholders)
+
+
+def render_prepared(
+    template: bytes,
+    context: Dict[str, Any],
+    placeholders: Dict[str, str]
+) -> bytes:
+    """
+    Формирует список публикаций по заранее подготовленным записям.
+
+    Args:
+        template: Содержимое шаблона
+        context: Результат template_context (не изменяется)
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Содержимое файла DOCX
+    """
+    plan = compile_template(template)
+    if plan.has_blocks:
+        return plan.render(template, context, placeholders)
+    doc = Document(io.BytesIO(template))
+    replace_placeholders_in_doc(doc, placeholders)
+    insert_context(doc, context)
+    return document_to_bytes(doc)
+
+
+def template_context(dataframe: Dataset) -> Dict[str, Any]:
+    """
+    Готовит записи для шаблона с блоком [[#Публикации]].
+
+    Args:
+        dataframe: Записи или DataFrame с данными о публикациях
+
+    Returns:
+        Словарь с ключом "Публикации": список записей с полями Номер,
+        Авторы, Submitter, Title
+    """
+    return {
+        "Публикации": [
+            dict(row, Номер=i)
+            for i, row in enumerate(as_records(dataframe), start=1)
+        ]
+    }
+
+
+def preview_lines(dataframe: Dataset) -> List[str]:
+    """
+    Формирует текстовое содержимое списка публикаций для предпросмотра.
+
+    Args:
+        dataframe: Записи или DataFrame с данными о публикациях
+
+    Returns:
+        Строки, которые insert_list вставит вместо маркера
+    """
+    return [
+        f"{i}. {row['Авторы']} {row['Title']}"
+        for i, row in enumerate(as_records(dataframe), start=1)
+    ]
+
+
+def insert_list(doc: Document, dataframe: Dataset) -> None:
     """
     Вставляет список публикаций в документ на место маркера [[Список]].
 
     Args:
         doc: Объект документа для модификации
-        dataframe: DataFrame с данными о публикациях
+        dataframe: Записи или DataFrame с данными о публикациях
+    """
+    insert_context(doc, template_context(dataframe))
+
+
+def insert_context(doc: Document, context: Dict[str, Any]) -> None:
+    """
+    Вставляет подготовленный список публикаций на место маркера [[Список]].
+
+    Args:
+        doc: Объект документа для модификации
+        context: Результат template_context
     """
     for para in doc.paragraphs:
-        if '[[Список]]' in para.text:
+        if LIST_MARKER in para.text:
             parent = para._element.getparent()
             index = parent.index(para._element)
             parent.remove(para._element)
 
             # Вставляем каждую публикацию как нумерованный пункт
-            for i, (_, row) in enumerate(dataframe.iterrows(), start=1):
+            for i, row in enumerate(context["Публикации"], start=1):
                 new_para = doc.add_paragraph()
                 new_para.alignment = WD_ALIGN_PARAGRAPH.JUSTIFY
                 new_para.paragraph_format.first_line_indent = Pt(18)  # Правильный отступ
 
-                run = new_para.add_run(f"{i}. {row['Submitter']} {row['Title']}")
+                run = new_para.add_run(f"{row['Номер']}. {row['Авторы']} {row['Title']}")
                 run.font.name = 'Times New Roman'
                 run.font.size = Pt(14)
                 run._element.rPr.rFonts.set(qn('w:eastAsia'), 'Times New Roman')
 
                 parent.insert(index + i - 1, new_para._element)
             break
-
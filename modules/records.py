@@ -0,0 +1,335 @@
+# modules/records.py
+
+"""Модуль записей для формирования документов без pandas.
+
+Формирование документов требует только сортировки, группировки докладов
+по датам и перебора записей, поэтому ядро генерации работает с обычными
+словарями (типизированными через TypedDict) и средствами стандартной
+библиотеки. Сам pandas импортируется только при построении DataFrame для
+интерфейса (таблица, предпросмотр, отбор записей), поэтому пакетная
+генерация и рабочие процессы запускаются без него.
+
+Ключи записей совпадают с названиями столбцов DataFrame, так что
+генераторы и шаблоны одинаково работают с обоими видами данных.
+"""
+
+import datetime
+import itertools
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+)
+
+from modules.name_normalizer import NAME_NORMALIZER, person_name
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Запись списка публикаций
+PaperRecord = TypedDict(
+    "PaperRecord",
+    {"Title": str, "State": str, "Submitter": str, "Авторы": str},
+)
+
+# Запись доклада программы и отчета
+TalkRecord = TypedDict(
+    "TalkRecord",
+    {
+        "Номер группы": str,
+        "ФИО докладчика": str,
+        "Название доклада": str,
+        "Дата и время начала": str,
+        "Ауд.": str,
+        "Авторы": str,
+    },
+)
+
+PAPER_COLUMNS = list(PaperRecord.__annotations__)
+TALK_COLUMNS = list(TalkRecord.__annotations__)
+
+# Данные документа: записи или DataFrame интерфейса
+Dataset = Union[Sequence[Mapping[str, Any]], "pd.DataFrame"]
+
+
+class RecordSet(list):
+    """Список записей с порядком столбцов и атрибутами набора данных.
+
+    Атрибут attrs соответствует DataFrame.attrs (например, в нем хранится
+    отчет об удаленных повторах), поэтому код, которому нужны только эти
+    сведения, работает с обоими видами данных.
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Mapping[str, Any]] = (),
+        columns: Optional[Sequence[str]] = None,
+        attrs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Args:
+            records: Записи.
+            columns: Порядок столбцов; по умолчанию — ключи первой записи.
+            attrs: Атрибуты набора данных.
+        """
+        super().__init__(records)
+        if columns is None:
+            columns = list(self[0]) if self else []
+        self.columns = list(columns)
+        self.attrs: Dict[str, Any] = dict(attrs or {})
+
+    @property
+    def empty(self) -> bool:
+        """True, если записей нет (как DataFrame.empty)."""
+        return not self
+
+
+def as_records(data: Dataset) -> List[Mapping[str, Any]]:
+    """
+    Возвращает данные в виде списка записей.
+
+    Args:
+        data: Записи или DataFrame.
+
+    Returns:
+        Записи; DataFrame преобразуется в список словарей.
+    """
+    if hasattr(data, "to_dict"):
+        return data.to_dict("records")
+    return data
+
+
+def columns_of(data: Dataset) -> List[str]:
+    """
+    Возвращает порядок столбцов данных.
+
+    Args:
+        data: RecordSet, список записей или DataFrame.
+
+    Returns:
+        Названия столбцов.
+    """
+    columns = getattr(data, "columns", None)
+    if columns is not None:
+        return [str(column) for column in columns]
+    return list(data[0]) if len(data) else []
+
+
+def is_missing(value: Any) -> bool:
+    """True для None и NaN (в том числе pd.NaT и pd.NA)."""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        return False
+
+
+def parse_datetime(value: Any) -> Optional[datetime.datetime]:
+    """
+    Разбирает дату и время начала доклада.
+
+    Args:
+        value: Строка ISO 8601 (например, "2025-04-14T06:20:00+00:00"),
+            datetime или пустое значение.
+
+    Returns:
+        Дата и время или None, если значение пусто или не разбирается
+        (аналог pd.to_datetime(errors="coerce")).
+    """
+    if isinstance(value, datetime.datetime):
+        return None if is_missing(value) else value
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip()
+    if text.endswith(("Z", "z")):
+        text = f"{text[:-1]}+00:00"
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def group_by_date(
+    records: Iterable[Mapping[str, Any]], column: str
+) -> List[Tuple[datetime.date, List[Tuple[datetime.datetime, Mapping[str, Any]]]]]:
+    """
+    Сортирует записи по дате и времени и группирует их по дням.
+
+    Записи без даты пропускаются. Сортировка устойчивая, по местному
+    времени записи, поэтому доклады с одинаковым временем остаются в
+    порядке выгрузки.
+
+    Args:
+        records: Записи с докладами.
+        column: Столбец с датой и временем начала.
+
+    Returns:
+        Список (дата, [(дата и время, запись), ...]) в порядке дат.
+    """
+    dated = []
+    for record in records:
+        start = parse_datetime(record.get(column))
+        if start is not None:
+            dated.append((start, record))
+    dated.sort(key=lambda item: item[0].replace(tzinfo=None))
+    return [
+        (date, list(items))
+        for date, items in itertools.groupby(dated, key=lambda item: item[0].date())
+    ]
+
+
+def papers_json_to_records(data: Dict[str, Any]) -> RecordSet:
+    """
+    Преобразует JSON с данными о докладах в записи списка публикаций.
+
+    Args:
+        data: Словарь с данными из JSON файла.
+
+    Returns:
+        Записи принятых докладов (столбцы PAPER_COLUMNS).
+    """
+    papers = data.get("papers", [])
+    rows = []
+    submitters = []
+    authors = []
+
+    for paper in papers:
+        state = paper.get("state", {}).get("name", "").lower()
+        if state != "accepted":
+            continue
+
+        contribution = paper.get("contribution", {})
+        last_revision = next(
+            (
+                rev
+                for rev in paper.get("revisions", [])
+                if rev.get("is_last_revision", False)
+            ),
+            paper.get("revisions", [{}])[0],
+        )
+        submitter = last_revision.get("submitter", {})
+        # Авторы доклада, если выгрузка их содержит, иначе — отправитель
+        persons = contribution.get("persons") or [submitter]
+
+        rows.append({
+            "Title": contribution.get("title") or "",
+            "State": paper.get("state", {}).get("title") or "",
+        })
+        submitters.append(person_name(submitter))
+        authors.append([person_name(person) for person in persons])
+
+    # Имена нормализуются проходом по уникальным значениям; повторяющиеся
+    # авторы берутся из кэша нормализатора
+    for row, submitter_name, author_list in zip(
+        rows,
+        NAME_NORMALIZER.normalize(submitters),
+        NAME_NORMALIZER.author_lists(authors),
+    ):
+        row["Submitter"] = submitter_name
+        row["Авторы"] = author_list
+
+    return RecordSet(rows, PAPER_COLUMNS)
+
+
+def report_json_to_records(data: List[Dict[str, Any]]) -> RecordSet:
+    """
+    Преобразует JSON с данными о докладах в записи программы/отчета.
+
+    Args:
+        data: Список словарей с данными о докладах.
+
+    Returns:
+        Записи докладов (столбцы TALK_COLUMNS).
+    """
+    rows = []
+    authors = []
+    for abstract in data:
+        group_number = ""
+        for field in abstract.get("custom_fields", []):
+            if field["name"] == "Номер группы основного автора (докладчика)":
+                group_number = field.get("value") or ""
+                break
+
+        persons = abstract.get("persons") or []
+        speaker_name = (persons[0].get("full_name") or "") if persons else ""
+        authors.append([person_name(person) for person in persons])
+
+        rows.append(
+            {
+                "Номер группы": group_number,
+                "ФИО докладчика": speaker_name,
+                "Название доклада": abstract.get("title") or "",
+                "Дата и время начала": abstract.get("start_dt") or "",
+                "Ауд.": abstract.get("room_name") or "",
+            }
+        )
+
+    # Все имена нормализуются одним проходом по уникальным значениям
+    for row, author_list in zip(rows, NAME_NORMALIZER.author_lists(authors)):
+        row["Авторы"] = author_list
+
+    return RecordSet(rows, TALK_COLUMNS)
+
+
+def to_dataframe(records: Sequence[Mapping[str, Any]]) -> "pd.DataFrame":
+    """
+    Строит DataFrame для интерфейса (pandas импортируется только здесь).
+
+    Args:
+        records: Записи (RecordSet или список словарей).
+
+    Returns:
+        DataFrame с теми же столбцами; атрибуты RecordSet переносятся в attrs.
+    """
+    import pandas as pd
+
+    dataframe = pd.DataFrame(list(records), columns=columns_of(records) or None)
+    dataframe.attrs.update(getattr(records, "attrs", {}))
+    return dataframe
+
+
+class AsDataFrame:
+    """Функция нормализации JSON, возвращающая DataFrame вместо записей."""
+
+    def __init__(self, normalizer: Callable[[Any], RecordSet]) -> None:
+        """
+        Args:
+            normalizer: Функция преобразования JSON в записи.
+        """
+        self.normalizer = normalizer
+        # Имя учитывается в ключах реестра наборов данных
+        self.__module__ = normalizer.__module__
+        self.__qualname__ = f"{normalizer.__qualname__}[dataframe]"
+        self.__name__ = normalizer.__name__
+
+    def __call__(self, data: Any) -> "pd.DataFrame":
+        return to_dataframe(self.normalizer(data))
+
+
+def records_size(records: Sequence[Mapping[str, Any]]) -> int:
+    """
+    Оценивает объем памяти, занимаемый записями.
+
+    Args:
+        records: Записи.
+
+    Returns:
+        Приблизительный размер в байтах.
+    """
+    size = sys.getsizeof(records)
+    for record in records:
+        size += sys.getsizeof(record)
+        size += sum(sys.getsizeof(value) for value in record.values())
+    return size
+
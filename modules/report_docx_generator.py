@@ -2,17 +2,37 @@
 
 """Модуль для генерации отчетов в формате DOCX."""
 
+import io
 from tkinter import filedialog, messagebox
-from typing import Any
+from typing import IO, Any, Dict, List, Union
 
-import pandas as pd
 from docx import Document
 from docx.shared import Pt, Inches
 from docx.oxml import parse_xml
 from docx.oxml.ns import nsdecls, qn
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
-from utils.docx_utils import replace_placeholders_in_para, months_ru
+from modules.output_cache import (
+    digest_dataframe,
+    document_to_bytes,
+    get_or_render,
+    make_key,
+    write_file_atomic,
+)
+from modules.records import Dataset, as_records, group_by_date
+from modules.template_compiler import compile_template
+from utils.docx_utils import replace_placeholders_in_doc, months_ru
+
+
+# Версия генератора; увеличивается при изменении формируемого документа,
+# чтобы кэш готовых документов не возвращал устаревший результат
+GENERATOR_VERSION = "3"
+
+# Маркер в шаблоне, вместо которого вставляется список
+LIST_MARKER = "[[Таблица]]"
+
+# Заголовки столбцов таблицы докладов
+TABLE_HEADERS = ['№ п/п', 'ФИО докладчика и тема', 'Статус', 'Решение']
 
 
 def generate_docx(self: Any, name: str) -> None:
@@ -30,35 +50,24 @@ def generate_docx(self: Any, name: str) -> None:
             messagebox.showerror("Ошибка", "Не выбран шаблон документа.")
             return
 
-        # Создание документа и обработка данных
-        doc = Document(template_path)
         placeholders = self.placeholder_values.get(name, {})
-        dataframe = self.dataframes.get(name)
+        # Данные с учетом фильтра отбора записей вкладки
+        dataframe = self.current_dataframe(name)
 
         if dataframe is None or dataframe.empty:
             messagebox.showerror("Ошибка", "Нет данных для вставки.")
             return
 
-        # Преобразование дат
-        dataframe['Дата и время начала'] = pd.to_datetime(
-            dataframe['Дата и время начала'],
-            errors='coerce'
+        with open(template_path, "rb") as file:
+            template = file.read()
+        key = make_key(
+            name, GENERATOR_VERSION, digest_dataframe(dataframe), template, placeholders
+        )
+        data, _ = get_or_render(
+            self.output_cache,
+            key,
+            lambda: render_bytes(template, dataframe, placeholders),
         )
-        dataframe['Дата'] = dataframe['Дата и время начала'].dt.date
-        dataframe['Время'] = dataframe['Дата и время начала'].dt.time
-
-        # Замена плейсхолдеров
-        for para in doc.paragraphs:
-            replace_placeholders_in_para(para, placeholders)
-
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for para in cell.paragraphs:
-                        replace_placeholders_in_para(para, placeholders)
-
-        # Вставка таблицы с данными
-        insert_list(doc, dataframe)
 
         # Сохранение документа
         save_path = filedialog.asksaveasfilename(
@@ -67,7 +76,7 @@ def generate_docx(self: Any, name: str) -> None:
             title="Сохранить отчет"
         )
         if save_path:
-            doc.save(save_path)
+            write_file_atomic(save_path, data)
             self.status.set(f"Файл сохранен: {save_path}")
 
     except Exception as e:
@@ -77,6 +86,155 @@ def generate_docx(self: Any, name: str) -> None:
         )
 
 
+def render_docx(
+    template: Union[str, IO[bytes]],
+    dataframe: Dataset,
+    placeholders: Dict[str, str]
+) -> Document:
+    """
+    Формирует отчет без обращения к интерфейсу.
+
+    Args:
+        template: Путь к шаблону или файловый объект с его содержимым
+        dataframe: Записи или DataFrame с данными о докладах (не изменяется)
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Заполненный документ docx
+    """
+    doc = Document(template)
+
+    # Замена плейсхолдеров
+    replace_placeholders_in_doc(doc, placeholders)
+
+    # Вставка таблицы с данными
+    insert_list(doc, dataframe)
+    return doc
+
+
+def render_bytes(
+    template: bytes,
+    dataframe: Dataset,
+    placeholders: Dict[str, str]
+) -> bytes:
+    """
+    Формирует отчет в виде содержимого файла DOCX.
+
+    Шаблоны с блоками повторения заполняются по скомпилированному плану
+    (см. modules.template_compiler), остальные — вставкой списка
+    на место маркера (см. render_prepared).
+
+    Args:
+        template: Содержимое шаблона
+        dataframe: Записи или DataFrame с данными
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Содержимое файла DOCX
+    """
+    return render_prepared(template, template_context(dataframe), placeholders)
+
+
+def render_prepared(
+    template: bytes,
+    context: Dict[str, Any],
+    placeholders: Dict[str, str]
+) -> bytes:
+    """
+    Формирует отчет по заранее подготовленным записям.
+
+    Args:
+        template: Содержимое шаблона
+        context: Результат template_context (не изменяется)
+        placeholders: Значения плейсхолдеров
+
+    Returns:
+        Содержимое файла DOCX
+    """
+    plan = compile_template(template)
+    if plan.has_blocks:
+        return plan.render(template, context, placeholders)
+    doc = Document(io.BytesIO(template))
+    replace_placeholders_in_doc(doc, placeholders)
+    insert_context(doc, context)
+    return document_to_bytes(doc)
+
+
+def template_context(dataframe: Dataset) -> Dict[str, Any]:
+    """
+    Готовит записи для шаблона с блоками [[#Заседания]] и [[#Доклады]].
+
+    Args:
+        dataframe: Записи или DataFrame с данными о докладах (не изменяются)
+
+    Returns:
+        Словарь с ключом "Заседания": список заседаний с полями Номер, Дата,
+        Время, Адрес, Ауд. и списком "Доклады" (с полем Статус)
+    """
+    sessions = []
+    grouped = group_by_date(as_records(dataframe), 'Дата и время начала')
+    for session_number, (date, rows) in enumerate(grouped, start=1):
+        earliest_dt, first_row = rows[0]
+        # Аудитория определяется один раз и используется и в шаблонах
+        # с блоками, и при вставке на место маркера
+        room = next((row['Ауд.'] for _, row in rows if row.get('Ауд.')), '—')
+        talks = []
+        for i, (start, row) in enumerate(rows, start=1):
+            group_number = row.get('Номер группы', '')
+            talks.append(dict(
+                row,
+                **{'Дата и время начала': start, 'Дата': date},
+                Номер=i,
+                Статус=(
+                    f"Магистрант гр. {group_number}" if group_number.endswith('М')
+                    else f"Студент гр. {group_number}" if group_number else ''
+                ),
+                Решение=row.get('Решение', ''),
+            ))
+        sessions.append({
+            "Номер": session_number,
+            "Дата": (
+                f"{earliest_dt.day} {months_ru[earliest_dt.month]} "
+                f"{earliest_dt.year} г."
+            ),
+            "Время": earliest_dt.strftime("%H:%M"),
+            "Адрес": first_row.get('Адрес', 'ул. Б. Морская, д. 67'),
+            "Ауд.": room,
+            "Доклады": talks,
+        })
+    return {"Заседания": sessions}
+
+
+def preview_lines(dataframe: Dataset) -> List[str]:
+    """
+    Формирует текстовое содержимое заседаний и таблиц для предпросмотра.
+
+    Args:
+        dataframe: Записи или DataFrame с данными о докладах
+
+    Returns:
+        Строки, которые insert_list вставит вместо маркера; строки таблиц
+        выводятся с разделителем " | "
+    """
+    lines = []
+    for session in template_context(dataframe)["Заседания"]:
+        lines.append(f"Заседание {session['Номер']}")
+        lines.append(f"{session['Дата']}, {session['Время']}")
+        lines.append(f"{session['Адрес']}, ауд. {session['Ауд.']}")
+        lines.append("Научный руководитель секции – ")
+        lines.append("Секретарь – ")
+        lines.append("Список докладов")
+        lines.append(" | ".join(TABLE_HEADERS))
+        for talk in session["Доклады"]:
+            lines.append(" | ".join([
+                str(talk['Номер']),
+                f"{talk['ФИО докладчика']}. {talk['Название доклада']}",
+                talk['Статус'],
+                str(talk['Решение']),
+            ]))
+    return lines
+
+
 def set_table_borders(table: Any) -> None:
     """
     Устанавливает границы для таблицы.
@@ -116,44 +274,40 @@ def set_column_width(cell: Any, width_inches: float) -> None:
     tc_pr.append(tc_w)
 
 
-def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
+def insert_list(doc: Document, dataframe: Dataset) -> None:
     """
     Вставляет список докладов в документ в виде таблицы.
 
     Args:
         doc: Объект документа docx
-        dataframe: DataFrame с данными о докладах
+        dataframe: Записи или DataFrame с данными о докладах
+    """
+    insert_context(doc, template_context(dataframe))
+
+
+def insert_context(doc: Document, context: Dict[str, Any]) -> None:
     """
-    # Подготовка данных
-    dataframe = dataframe.dropna(subset=['Дата и время начала']).copy()
-    dataframe = dataframe.sort_values(['Дата', 'Дата и время начала'])
-    grouped = dataframe.groupby('Дата')
+    Вставляет подготовленные заседания с таблицами докладов на место маркера.
 
+    Args:
+        doc: Объект документа docx
+        context: Результат template_context
+    """
     # Поиск места для вставки
     for para in doc.paragraphs:
-        if '[[Таблица]]' not in para.text:
+        if LIST_MARKER not in para.text:
             continue
 
         parent = para._element.getparent()
         index = parent.index(para._element)
         parent.remove(para._element)
 
-        session_number = 1
         insert_pos = index
 
-        # Обработка каждой группы (по датам)
-        for date, group_df in grouped:
-            earliest_dt = group_df['Дата и время начала'].min()
-            day = earliest_dt.day
-            month = months_ru[earliest_dt.month]
-            year = earliest_dt.year
-            date_str = f"{day} {month} {year} г."
-            time_str = earliest_dt.strftime("%H:%M")
-            room = group_df.iloc[0].get('Комната', '—')
-            address = group_df.iloc[0].get('Адрес', 'ул. Б. Морская, д. 67')
-
+        # Обработка каждого заседания (по датам)
+        for session in context["Заседания"]:
             # Заголовок заседания
-            p0 = doc.add_paragraph(f"\nЗаседание {session_number}")
+            p0 = doc.add_paragraph(f"\nЗаседание {session['Номер']}")
             p0.alignment = WD_ALIGN_PARAGRAPH.LEFT
             p0.runs[0].font.name = 'Times New Roman'
             p0.runs[0].font.size = Pt(14)
@@ -161,8 +315,8 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
             p0.runs[0]._element.rPr.rFonts.set(qn('w:eastAsia'), 'Times New Roman')
 
             # Информация о заседании
-            p1 = doc.add_paragraph(f"{date_str}, {time_str}")
-            p1.add_run(f"\n{address}, ауд. {room}")
+            p1 = doc.add_paragraph(f"{session['Дата']}, {session['Время']}")
+            p1.add_run(f"\n{session['Адрес']}, ауд. {session['Ауд.']}")
             p1.alignment = WD_ALIGN_PARAGRAPH.LEFT
             for run in p1.runs:
                 run.font.name = 'Times New Roman'
@@ -192,8 +346,7 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
 
             # Настройка заголовков таблицы
             hdr_cells = table.rows[0].cells
-            headers = ['№ п/п', 'ФИО докладчика и тема', 'Статус', 'Решение']
-            for i, header in enumerate(headers):
+            for i, header in enumerate(TABLE_HEADERS):
                 hdr_cells[i].text = header
                 for para in hdr_cells[i].paragraphs:
                     for run in para.runs:
@@ -208,19 +361,13 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
                 set_column_width(cell, col_widths[i])
 
             # Заполнение таблицы данными
-            for i, (_, row) in enumerate(group_df.iterrows(), start=1):
-                group_number = row.get('Номер группы', '')
-                status = (
-                    f"Магистрант гр. {group_number}" if group_number.endswith('М')
-                    else f"Студент гр. {group_number}" if group_number else ''
-                )
-
+            for talk in session["Доклады"]:
                 row_cells = table.add_row().cells
                 row_data = [
-                    str(i),
-                    f"{row['ФИО докладчика']}. {row['Название доклада']}",
-                    status,
-                    row.get('Решение', '')
+                    str(talk['Номер']),
+                    f"{talk['ФИО докладчика']}. {talk['Название доклада']}",
+                    talk['Статус'],
+                    talk['Решение'],
                 ]
 
                 for j, (cell, data) in enumerate(zip(row_cells, row_data)):
@@ -238,7 +385,6 @@ def insert_list(doc: Document, dataframe: pd.DataFrame) -> None:
                 parent.insert(insert_pos + i, element._element)
 
             insert_pos += len(elements)
-            session_number += 1
 
         break
 
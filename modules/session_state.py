@@ -0,0 +1,62 @@
+# modules/session_state.py
+
+"""Модуль сохранения и восстановления состояния сеанса.
+
+Для каждой вкладки запоминаются выбранные JSON-файл, шаблон, папка вывода,
+режим наблюдения и значения плейсхолдеров, чтобы при следующем запуске не
+выбирать их заново.
+"""
+
+import json
+import os
+from typing import Any, Dict
+
+DEFAULT_SESSION_PATH = os.path.join(
+    os.path.expanduser("~"), ".config", "suai_json_to_docx", "session.json"
+)
+
+SESSION_VERSION = 1
+
+
+def load_session(path: str = DEFAULT_SESSION_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    Читает сохраненное состояние вкладок.
+
+    Args:
+        path: Путь к файлу сеанса.
+
+    Returns:
+        Словарь {название вкладки: состояние}; пустой, если файла нет
+        или он поврежден.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            session = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(session, dict) or session.get("version") != SESSION_VERSION:
+        return {}
+    tabs = session.get("tabs", {})
+    return tabs if isinstance(tabs, dict) else {}
+
+
+def save_session(
+    tabs: Dict[str, Dict[str, Any]], path: str = DEFAULT_SESSION_PATH
+) -> None:
+    """
+    Атомарно сохраняет состояние вкладок.
+
+    Args:
+        tabs: Словарь {название вкладки: состояние}.
+        path: Путь к файлу сеанса.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(
+            {"version": SESSION_VERSION, "tabs": tabs},
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+    os.replace(tmp_path, path)
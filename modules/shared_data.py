@@ -0,0 +1,310 @@
+# modules/shared_data.py
+
+"""Модуль передачи наборов данных и шаблонов рабочим процессам через общую память.
+
+При пакетной генерации одна выгрузка нужна нескольким заданиям (например,
+программе и отчету), а один шаблон — всем выгрузкам. Вместо того чтобы
+передавать каждому процессу копию записей и шаблона (через pickle), данные
+один раз помещаются в блок multiprocessing.shared_memory, а процессы
+подключаются к нему по имени.
+
+Записи хранятся по столбцам: строковые столбцы — общим буфером UTF-8
+и массивом смещений, как в Apache Arrow, прочие — через pickle. Рабочий
+процесс не восстанавливает записи целиком: SharedRecords держит блок
+подключенным и читает значения строки из него при обращении, так что
+данные существуют в одном экземпляре на все процессы. Столбцы, переданные
+через pickle, и шаблоны (их разбирает python-docx) копируются один раз на
+процесс. Модуль использует только стандартную библиотеку, поэтому рабочим
+процессам не нужен pandas.
+"""
+
+import atexit
+import os
+import pickle
+from array import array
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Sequence, Tuple, Union
+
+from modules.records import columns_of
+
+# Описание блока данных: (имя блока общей памяти, размер в байтах)
+SharedHandle = Tuple[str, int]
+
+# Выравнивание начала столбцов в блоке
+_ALIGNMENT = 8
+
+# Максимальное число блоков, данные которых процесс хранит в кэше
+MAX_ATTACHED = 8
+
+# Данные блоков, к которым подключался процесс: имя -> данные
+_attached: "OrderedDict[str, Any]" = OrderedDict()
+
+# Созданные процессом блоки, которые ждут подключения получателя (Windows)
+_held: List[shared_memory.SharedMemory] = []
+
+
+def _align(offset: int) -> int:
+    """Округляет смещение вверх до границы выравнивания."""
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _create(size: int) -> shared_memory.SharedMemory:
+    """Создает блок общей памяти (нулевой размер недопустим)."""
+    return shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+
+def share_bytes(data: bytes) -> Tuple[shared_memory.SharedMemory, SharedHandle]:
+    """
+    Помещает байты (например, шаблон DOCX) в общую память.
+
+    Блок принадлежит вызывающему процессу: после завершения всех заданий
+    его нужно закрыть и удалить функцией release.
+
+    Args:
+        data: Содержимое.
+
+    Returns:
+        Кортеж (блок общей памяти, описание для передачи процессам).
+    """
+    block = _create(len(data))
+    block.buf[:len(data)] = data
+    return block, (block.name, len(data))
+
+
+def _encode_column(values: List[Any]) -> Tuple[str, List[bytes]]:
+    """Кодирует столбец: (вид, буферы)."""
+    if all(item is None or isinstance(item, str) for item in values):
+        encoded = [b"" if item is None else item.encode("utf-8") for item in values]
+        offsets = array("q", [0])
+        total = 0
+        for item in encoded:
+            total += len(item)
+            offsets.append(total)
+        nulls = bytes(item is None for item in values)
+        return "str", [offsets.tobytes(), nulls, b"".join(encoded)]
+
+    # Прочие значения (числа, списки, даты и т. п.) передаются как есть
+    return "pickle", [pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)]
+
+
+def share_records(
+    records: Sequence[Mapping[str, Any]],
+) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+    """
+    Помещает записи в общую память по столбцам.
+
+    Args:
+        records: Записи (RecordSet или список словарей).
+
+    Returns:
+        Кортеж (блок общей памяти, описание для attach_records). Описание
+        содержит только имя блока и смещения, поэтому передается процессам
+        почти бесплатно.
+    """
+    columns = []
+    buffers: List[Tuple[int, bytes]] = []
+    offset = 0
+    for name in columns_of(records):
+        kind, parts = _encode_column([record.get(name) for record in records])
+        spans = []
+        for part in parts:
+            offset = _align(offset)
+            spans.append((offset, len(part)))
+            buffers.append((offset, part))
+            offset += len(part)
+        columns.append({"name": name, "kind": kind, "spans": spans})
+
+    block = _create(offset)
+    for start, part in buffers:
+        block.buf[start:start + len(part)] = part
+    layout = {
+        "name": block.name,
+        "size": offset,
+        "rows": len(records),
+        "columns": columns,
+    }
+    return block, layout
+
+
+class SharedRecords(Sequence):
+    """Записи, которые читаются из блока общей памяти при обращении.
+
+    Поддерживает то же, что нужно генераторам и выгрузке таблиц от
+    RecordSet: len, перебор, индексацию, columns, attrs и empty. Каждая
+    запись — новый словарь, поэтому изменять ее можно без влияния на блок.
+    """
+
+    def __init__(self, layout: Dict[str, Any]) -> None:
+        """
+        Args:
+            layout: Описание из share_records.
+        """
+        self._block = _attach(layout["name"])
+        self._rows = layout["rows"]
+        self._views: List[memoryview] = []
+        self.columns = [column["name"] for column in layout["columns"]]
+        self.attrs: Dict[str, Any] = {}
+        self._readers = [self._reader(column) for column in layout["columns"]]
+
+    def _view(self, span: Tuple[int, int], fmt: str = "B") -> memoryview:
+        """Возвращает представление части блока без копирования."""
+        start, size = span
+        view = self._block.buf[start:start + size]
+        self._views.append(view)
+        if fmt != "B":
+            view = view.cast(fmt)
+            self._views.append(view)
+        return view
+
+    def _reader(self, column: Dict[str, Any]) -> Callable[[int], Any]:
+        """Возвращает функцию чтения значения столбца по номеру строки."""
+        if column["kind"] == "str":
+            offsets = self._view(column["spans"][0], "q")
+            nulls = self._view(column["spans"][1])
+            data = self._view(column["spans"][2])
+
+            def read(row: int) -> Any:
+                if nulls[row]:
+                    return None
+                return str(data[offsets[row]:offsets[row + 1]], "utf-8")
+
+            return read
+
+        # Столбцы произвольных значений разбираются один раз
+        view = self._view(column["spans"][0])
+        values = pickle.loads(view)
+        return values.__getitem__
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(self._rows))]
+        if index < 0:
+            index += self._rows
+        if not 0 <= index < self._rows:
+            raise IndexError("Номер записи вне диапазона")
+        return {name: read(index) for name, read in zip(self.columns, self._readers)}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self._rows):
+            yield {name: read(row) for name, read in zip(self.columns, self._readers)}
+
+    @property
+    def empty(self) -> bool:
+        """True, если записей нет (как DataFrame.empty)."""
+        return not self._rows
+
+    def close(self) -> None:
+        """Отключается от блока общей памяти; записи больше не читаются."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._block.close()
+
+
+def _remember(name: str, value: Any) -> Any:
+    """Запоминает данные блока, забывая (и отключая) давно не используемые."""
+    _attached[name] = value
+    while len(_attached) > MAX_ATTACHED:
+        _, forgotten = _attached.popitem(last=False)
+        if isinstance(forgotten, SharedRecords):
+            forgotten.close()
+    return value
+
+
+@atexit.register
+def _close_attached() -> None:
+    """Отключается от блоков при выходе (иначе блок не закрыть из-за представлений)."""
+    while _attached:
+        _, value = _attached.popitem()
+        if isinstance(value, SharedRecords):
+            value.close()
+
+
+def hand_over(block: shared_memory.SharedMemory) -> None:
+    """
+    Передает созданный блок другому процессу, который удалит его функцией release.
+
+    В POSIX блок существует до удаления по имени, поэтому он сразу
+    закрывается. В Windows блок удаляется, когда закрыт последний
+    дескриптор, поэтому процесс держит его открытым, пока получатель
+    не успеет подключиться (до MAX_ATTACHED последних блоков).
+
+    Args:
+        block: Блок из share_records или share_bytes.
+    """
+    if os.name != "nt":
+        block.close()
+        return
+    _held.append(block)
+    while len(_held) > MAX_ATTACHED:
+        _held.pop(0).close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Подключается к существующему блоку по имени."""
+    return shared_memory.SharedMemory(name=name)
+
+
+def attach_bytes(handle: SharedHandle) -> bytes:
+    """
+    Возвращает байты из общей памяти.
+
+    Содержимое копируется один раз на процесс и затем берется из кэша,
+    поэтому шаблон не передается с каждым заданием.
+
+    Args:
+        handle: Описание из share_bytes.
+
+    Returns:
+        Содержимое блока.
+    """
+    name, size = handle
+    cached = _attached.get(name)
+    if cached is not None:
+        _attached.move_to_end(name)
+        return cached
+    block = _attach(name)
+    data = bytes(block.buf[:size])
+    block.close()
+    return _remember(name, data)
+
+
+def attach_records(layout: Dict[str, Any]) -> SharedRecords:
+    """
+    Подключается к записям в общей памяти.
+
+    Записи не копируются в процесс: значения читаются из блока при
+    обращении. Подключение кэшируется на процесс, поэтому задания одного
+    набора данных получают один и тот же объект.
+
+    Args:
+        layout: Описание из share_records.
+
+    Returns:
+        Записи (только для чтения).
+    """
+    name = layout["name"]
+    cached = _attached.get(name)
+    if cached is not None:
+        _attached.move_to_end(name)
+        return cached
+    return _remember(name, SharedRecords(layout))
+
+
+def release(block: shared_memory.SharedMemory) -> None:
+    """
+    Закрывает и удаляет блок общей памяти.
+
+    Args:
+        block: Блок из share_bytes или share_records либо подключенный
+            по имени блок, созданный рабочим процессом.
+    """
+    block.close()
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
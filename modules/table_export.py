@@ -0,0 +1,256 @@
+# modules/table_export.py
+
+"""Модуль выгрузки нормализованных данных в таблицы CSV и XLSX.
+
+Записи передаются в файл построчно прямо из записей или столбцов
+DataFrame, без построения второй копии данных в памяти (как при
+DataFrame.to_csv или to_excel); pandas для выгрузки не нужен. XLSX
+формируется в режиме только для записи библиотеки openpyxl, которая
+устанавливается отдельно; CSV доступен всегда.
+
+Пример запуска без графического интерфейса:
+    python -m modules.table_export export.json "Программа" program.xlsx
+"""
+
+import argparse
+import csv
+import datetime
+import os
+import sys
+from typing import Any, Iterator, List, Optional, Tuple
+
+from modules.deduplicator import DEDUP_RULES, DEFAULT_DEDUP_RULE
+from modules.document_pipeline import JSON_TO_RECORDS_FUNCTIONS, normalizer_for
+from modules.json_reader import read_json
+from modules.records import Dataset, columns_of, is_missing
+
+# Поддерживаемые форматы таблиц
+EXPORT_FORMATS = ("csv", "xlsx")
+
+# Разделитель CSV, который Excel с русской локалью распознает без настройки
+CSV_DELIMITER = ";"
+
+# Максимальная длина имени листа XLSX
+_SHEET_NAME_LIMIT = 31
+
+
+def export_format(path: str) -> str:
+    """
+    Определяет формат таблицы по расширению файла.
+
+    Args:
+        path: Путь к файлу таблицы.
+
+    Returns:
+        Формат из EXPORT_FORMATS.
+
+    Raises:
+        ValueError: Если расширение не поддерживается.
+    """
+    fmt = os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Неподдерживаемый формат таблицы: {path}. "
+            f"Допустимые расширения: {', '.join(EXPORT_FORMATS)}"
+        )
+    return fmt
+
+
+def table_path(docx_path: str, fmt: str) -> str:
+    """
+    Возвращает путь к таблице рядом с документом DOCX.
+
+    Args:
+        docx_path: Путь к документу.
+        fmt: Формат таблицы.
+
+    Returns:
+        Путь с тем же именем и расширением формата.
+    """
+    return f"{os.path.splitext(docx_path)[0]}.{fmt}"
+
+
+def _cell_value(value: Any) -> Any:
+    """Приводит значение ячейки к типу, который понимают csv и openpyxl."""
+    if is_missing(value):
+        return None
+    if isinstance(value, datetime.datetime) and value.tzinfo:
+        # Excel не хранит часовой пояс
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # Скаляры numpy
+        return value.item()
+    return value
+
+
+def iter_rows(dataframe: Dataset) -> Iterator[Tuple[Any, ...]]:
+    """
+    Перебирает строки данных без создания промежуточной копии.
+
+    Args:
+        dataframe: Записи или DataFrame с данными.
+
+    Yields:
+        Кортежи значений ячеек в порядке столбцов.
+    """
+    if hasattr(dataframe, "itertuples"):
+        rows = dataframe.itertuples(index=False, name=None)
+    else:
+        columns = columns_of(dataframe)
+        rows = (tuple(record.get(column) for column in columns) for record in dataframe)
+    for row in rows:
+        yield tuple(_cell_value(value) for value in row)
+
+
+def _remove_temporary(path: str) -> None:
+    """Удаляет временный файл, оставшийся после неудачной записи."""
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def write_csv(dataframe: Dataset, path: str, delimiter: str = CSV_DELIMITER) -> int:
+    """
+    Записывает данные в CSV построчно.
+
+    Файл сохраняется в UTF-8 с BOM, чтобы Excel правильно показал кириллицу.
+
+    Args:
+        dataframe: Записи или DataFrame с данными.
+        path: Путь к итоговому файлу.
+        delimiter: Разделитель полей.
+
+    Returns:
+        Число записанных строк данных.
+    """
+    count = 0
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8-sig", newline="") as file:
+            writer = csv.writer(file, delimiter=delimiter)
+            writer.writerow(columns_of(dataframe))
+            for row in iter_rows(dataframe):
+                writer.writerow(["" if value is None else value for value in row])
+                count += 1
+        os.replace(tmp_path, path)
+    finally:
+        _remove_temporary(tmp_path)
+    return count
+
+
+def write_xlsx(dataframe: Dataset, path: str, sheet_name: str = "Данные") -> int:
+    """
+    Записывает данные в XLSX в режиме только для записи (openpyxl).
+
+    В этом режиме строки сразу сериализуются во временный файл листа,
+    а не хранятся в памяти в виде объектов ячеек.
+
+    Args:
+        dataframe: Записи или DataFrame с данными.
+        path: Путь к итоговому файлу.
+        sheet_name: Имя листа.
+
+    Returns:
+        Число записанных строк данных.
+
+    Raises:
+        ImportError: Если библиотека openpyxl не установлена.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError(
+            "Для выгрузки в XLSX установите библиотеку openpyxl "
+            "(pip install openpyxl) или выберите формат CSV."
+        ) from None
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_name[:_SHEET_NAME_LIMIT])
+    sheet.append(columns_of(dataframe))
+    count = 0
+    for row in iter_rows(dataframe):
+        sheet.append(row)
+        count += 1
+
+    tmp_path = f"{path}.tmp"
+    try:
+        workbook.save(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        _remove_temporary(tmp_path)
+    return count
+
+
+def export_table(
+    dataframe: Dataset,
+    path: str,
+    fmt: Optional[str] = None,
+    sheet_name: str = "Данные",
+) -> int:
+    """
+    Выгружает нормализованные данные в таблицу.
+
+    Args:
+        dataframe: Записи (например, из report_json_to_records) или DataFrame.
+        path: Путь к итоговому файлу.
+        fmt: Формат таблицы; по умолчанию определяется по расширению.
+        sheet_name: Имя листа (только для XLSX).
+
+    Returns:
+        Число записанных строк данных.
+
+    Raises:
+        ValueError: Если формат не поддерживается.
+        ImportError: Если для XLSX не установлена библиотека openpyxl.
+    """
+    fmt = fmt or export_format(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if fmt == "csv":
+        return write_csv(dataframe, path)
+    if fmt == "xlsx":
+        return write_xlsx(dataframe, path, sheet_name)
+    raise ValueError(
+        f"Неподдерживаемый формат таблицы: {fmt}. "
+        f"Допустимые значения: {', '.join(EXPORT_FORMATS)}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Args:
+        argv: Аргументы командной строки.
+
+    Returns:
+        Код возврата.
+    """
+    parser = argparse.ArgumentParser(
+        description="Выгрузка нормализованных данных JSON в CSV/XLSX"
+    )
+    parser.add_argument("export", help="JSON-выгрузка")
+    parser.add_argument(
+        "document", choices=sorted(JSON_TO_RECORDS_FUNCTIONS), help="Тип документа"
+    )
+    parser.add_argument("output", help="Файл таблицы (.csv или .xlsx)")
+    parser.add_argument(
+        "--dedup", choices=DEDUP_RULES + ("off",), default=DEFAULT_DEDUP_RULE,
+        help="Какой из повторяющихся докладов оставлять (off — не удалять повторы)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        fmt = export_format(args.output)
+    except ValueError as e:
+        parser.error(str(e))
+
+    normalizer = normalizer_for(args.document, None if args.dedup == "off" else args.dedup)
+    records = normalizer(read_json(args.export))
+    count = export_table(records, args.output, fmt, sheet_name=args.document)
+    print(f"Записано строк: {count} -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+# modules/template_compiler.py
+
+"""Модуль компиляции шаблонов DOCX с блоками повторения.
+
+Шаблон может содержать блоки, которые повторяются для каждой записи:
+
+    [[#Заседания]]                  — начало блока (отдельный абзац)
+    Заседание [[Номер]]. [[Дата]], [[Время]], ауд. [[Ауд.]]
+    [[#Доклады]]
+    [[Номер]]. [[ФИО докладчика]], группа [[Номер группы]]
+    [[Название доклада]]
+    [[/Доклады]]
+    [[/Заседания]]                  — конец блока
+
+Если маркер начала блока находится в ячейке таблицы, повторяются строки
+таблицы от строки с маркером начала до строки с маркером конца.
+Поля записей подставляются вместо ``[[поле]]``, обычные плейсхолдеры
+``{имя::значение_по_умолчанию}`` — из значений плейсхолдеров.
+
+Шаблон компилируется один раз в план: последовательность заранее
+сериализованных фрагментов XML и слотов. Формирование документа сводится
+к склейке строк, без построения объектов python-docx.
+"""
+
+import io
+import json
+import re
+import zipfile
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+DOCUMENT_PART = "word/document.xml"
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+_PI_TARGET = "docx-plan"
+
+_BLOCK_PATTERN = re.compile(r"\[\[([#/])([^\[\]]+?)\]\]")
+_SLOT_PATTERN = re.compile(r"\[\[([^#/\[\]][^\[\]]*?)\]\]|\{([^{}]+?)\}")
+_PI_PATTERN = re.compile(r"<\?" + _PI_TARGET + r" (\w+) (\d+)\?>")
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _w(tag: str) -> str:
+    """Возвращает полное имя элемента WordprocessingML."""
+    return f"{{{_W_NS}}}{tag}"
+
+
+def _xml_text(value: Any) -> str:
+    """
+    Преобразует значение в текст для вставки внутрь элемента w:t.
+
+    Переводы строк и табуляции превращаются в w:br и w:tab,
+    как это делает python-docx при записи run.text.
+    """
+    text = escape(_INVALID_XML_CHARS.sub("", str(value)))
+    if "\t" in text or "\n" in text:
+        text = text.replace(
+            "\t", '</w:t><w:tab/><w:t xml:space="preserve">'
+        ).replace(
+            "\n", '</w:t><w:br/><w:t xml:space="preserve">'
+        )
+    return text
+
+
+class RenderPlan:
+    """Скомпилированный шаблон: дерево фрагментов XML, слотов и блоков.
+
+    Узел дерева — строка (готовый фрагмент XML), словарь слота
+    ``{"slot": имя, "placeholder": bool, "default": str}`` или словарь
+    блока ``{"block": имя, "body": [узлы]}``.
+    """
+
+    def __init__(self, nodes: List[Any]) -> None:
+        """
+        Инициализирует план.
+
+        Args:
+            nodes: Узлы плана верхнего уровня.
+        """
+        self.nodes = nodes
+        self.has_blocks = any(isinstance(node, dict) and "block" in node for node in nodes)
+
+    def to_json(self) -> str:
+        """
+        Сериализует план.
+
+        Returns:
+            План в формате JSON.
+        """
+        return json.dumps(self.nodes, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, data: str) -> "RenderPlan":
+        """
+        Восстанавливает план из JSON.
+
+        Args:
+            data: Результат to_json.
+
+        Returns:
+            План.
+        """
+        return cls(json.loads(data))
+
+    def render_xml(
+        self, context: Mapping[str, Any], placeholders: Dict[str, str]
+    ) -> bytes:
+        """
+        Формирует содержимое word/document.xml.
+
+        Args:
+            context: Поля и списки записей для блоков.
+            placeholders: Значения плейсхолдеров.
+
+        Returns:
+            XML основной части документа.
+        """
+        out: List[str] = []
+        self._render_nodes(self.nodes, [context], placeholders, out)
+        return "".join(out).encode("utf-8")
+
+    def render(
+        self,
+        template: bytes,
+        context: Mapping[str, Any],
+        placeholders: Dict[str, str],
+    ) -> bytes:
+        """
+        Формирует документ DOCX.
+
+        Все части пакета, кроме основной, копируются из шаблона без изменений.
+
+        Args:
+            template: Содержимое шаблона, из которого скомпилирован план.
+            context: Поля и списки записей для блоков.
+            placeholders: Значения плейсхолдеров.
+
+        Returns:
+            Содержимое файла DOCX.
+        """
+        document_xml = self.render_xml(context, placeholders)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(template)) as source, zipfile.ZipFile(
+            buffer, "w", zipfile.ZIP_DEFLATED
+        ) as target:
+            for info in source.infolist():
+                data = document_xml if info.filename == DOCUMENT_PART else source.read(info)
+                target.writestr(info, data, compress_type=zipfile.ZIP_DEFLATED)
+        return buffer.getvalue()
+
+    def _render_nodes(
+        self,
+        nodes: List[Any],
+        scopes: List[Mapping[str, Any]],
+        placeholders: Dict[str, str],
+        out: List[str],
+    ) -> None:
+        """Рекурсивно формирует XML узлов плана."""
+        for node in nodes:
+            if isinstance(node, str):
+                out.append(node)
+            elif "slot" in node:
+                name = node["slot"]
+                if node["placeholder"]:
+                    out.append(_xml_text(placeholders.get(name, node["default"])))
+                else:
+                    out.append(_xml_text(_lookup(scopes, name)))
+            else:
+                for record in _lookup(scopes, node["block"]) or []:
+                    scopes.append(record)
+                    self._render_nodes(node["body"], scopes, placeholders, out)
+                    scopes.pop()
+
+
+def _lookup(scopes: List[Mapping[str, Any]], name: str) -> Any:
+    """Ищет поле от самой вложенной записи к внешним."""
+    for scope in reversed(scopes):
+        if name in scope:
+            return scope[name]
+    return ""
+
+
+def _paragraph_text(para: Any) -> str:
+    """Возвращает текст абзаца из всех его элементов w:t."""
+    return "".join(t.text or "" for t in para.iter(_w("t")))
+
+
+def _merge_runs(para: Any, text: str) -> Optional[Any]:
+    """
+    Собирает текст абзаца в первый run, как replace_placeholders_in_para.
+
+    Returns:
+        Элемент w:t первого run'а или None, если в абзаце нет run'ов.
+    """
+    runs = [run for run in para.iter(_w("r")) if run.find(_w("t")) is not None]
+    if not runs:
+        return None
+    first_t = runs[0].find(_w("t"))
+    for t in runs[0].findall(_w("t"))[1:]:
+        runs[0].remove(t)
+    for run in runs[1:]:
+        run.getparent().remove(run)
+    first_t.text = text
+    first_t.set(_XML_SPACE, "preserve")
+    return first_t
+
+
+def _compile_element_tree(root: Any, slots: List[Dict[str, Any]], blocks: List[str]) -> None:
+    """Заменяет маркеры блоков и слоты в дереве XML инструкциями обработки."""
+    body = root.find(_w("body"))
+    for para in list(body.iter(_w("p"))):
+        text = _paragraph_text(para)
+        if "[[" not in text and "{" not in text:
+            continue
+
+        block_matches = list(_BLOCK_PATTERN.finditer(text))
+        if block_matches:
+            row = next(para.iterancestors(_w("tr")), None)
+            text = _BLOCK_PATTERN.sub("", text)
+            if row is None and text.strip():
+                raise ValueError(
+                    f"Маркер блока {block_matches[0].group(0)} "
+                    "должен занимать отдельный абзац"
+                )
+
+            last_end = row
+            for match in block_matches:
+                kind = "start" if match.group(1) == "#" else "end"
+                blocks.append(match.group(2).strip())
+                instruction = etree.ProcessingInstruction(
+                    _PI_TARGET, f"{kind} {len(blocks) - 1}"
+                )
+                if row is None:
+                    # Блок абзацев: маркер заменяет сам абзац
+                    para.addprevious(instruction)
+                elif kind == "start":
+                    # Блок строк таблицы: маркеры ставятся до и после строк
+                    row.addprevious(instruction)
+                else:
+                    last_end.addnext(instruction)
+                    last_end = instruction
+
+            if row is None:
+                para.getparent().remove(para)
+                continue
+            _merge_runs(para, text)
+
+        if not _SLOT_PATTERN.search(text):
+            continue
+        t = _merge_runs(para, "")
+        if t is None:
+            continue
+
+        last_index = 0
+        last_node: Any = None
+        for match in _SLOT_PATTERN.finditer(text):
+            literal = text[last_index:match.start()]
+            if last_node is None:
+                t.text = literal
+            else:
+                last_node.tail = literal
+
+            field, placeholder = match.groups()
+            if field is not None:
+                slots.append({"slot": field.strip(), "placeholder": False, "default": ""})
+            else:
+                key, _, default = placeholder.partition("::")
+                slots.append(
+                    {"slot": key.strip(), "placeholder": True, "default": default.strip()}
+                )
+            last_node = etree.ProcessingInstruction(_PI_TARGET, f"slot {len(slots) - 1}")
+            t.append(last_node)
+            last_index = match.end()
+        last_node.tail = text[last_index:]
+
+
+def _build_nodes(xml: str, slots: List[Dict[str, Any]], blocks: List[str]) -> List[Any]:
+    """Разбивает сериализованный XML на узлы плана по инструкциям обработки."""
+    root: List[Any] = []
+    stack = [(None, root)]
+    last_index = 0
+
+    for match in _PI_PATTERN.finditer(xml):
+        if match.start() > last_index:
+            stack[-1][1].append(xml[last_index:match.start()])
+        last_index = match.end()
+
+        kind, index = match.group(1), int(match.group(2))
+        if kind == "slot":
+            stack[-1][1].append(dict(slots[index]))
+        elif kind == "start":
+            node = {"block": blocks[index], "body": []}
+            stack[-1][1].append(node)
+            stack.append((blocks[index], node["body"]))
+        else:
+            if stack[-1][0] != blocks[index]:
+                raise ValueError(
+                    f"Маркер [[/{blocks[index]}]] не соответствует открытому блоку"
+                )
+            stack.pop()
+
+    if len(stack) > 1:
+        raise ValueError(f"Блок [[#{stack[-1][0]}]] не закрыт")
+    if last_index < len(xml):
+        root.append(xml[last_index:])
+    return root
+
+
+def compile_document_xml(document_xml: bytes) -> RenderPlan:
+    """
+    Компилирует основную часть документа в план.
+
+    Args:
+        document_xml: Содержимое word/document.xml.
+
+    Returns:
+        План формирования документа.
+
+    Raises:
+        ValueError: Если маркеры блоков расставлены неверно.
+    """
+    root = etree.fromstring(document_xml)
+    slots: List[Dict[str, Any]] = []
+    blocks: List[str] = []
+    _compile_element_tree(root, slots, blocks)
+
+    xml = etree.tostring(
+        root, xml_declaration=True, encoding="UTF-8", standalone=True
+    ).decode("utf-8")
+    return RenderPlan(_build_nodes(xml, slots, blocks))
+
+
+@lru_cache(maxsize=16)
+def compile_template(template: bytes) -> RenderPlan:
+    """
+    Компилирует шаблон DOCX в план; результат кэшируется по содержимому.
+
+    Args:
+        template: Содержимое шаблона.
+
+    Returns:
+        План формирования документа.
+    """
+    with zipfile.ZipFile(io.BytesIO(template)) as package:
+        return compile_document_xml(package.read(DOCUMENT_PART))
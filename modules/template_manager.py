@@ -3,7 +3,7 @@
 """Модуль для работы с шаблонами DOCX."""
 
 from tkinter import filedialog, messagebox
-from typing import Any, Set
+from typing import Any, Dict, Optional, Set
 import re
 from docx import Document
 
@@ -22,6 +22,74 @@ def choose_template(self: Any, name: str) -> None:
         scan_template_for_placeholders(self, name, path)
 
 
+def read_template_placeholders(template_path: str) -> Dict[str, str]:
+    """
+    Извлекает плейсхолдеры шаблона со значениями по умолчанию.
+
+    Не обращается к интерфейсу, поэтому может выполняться в фоновом потоке.
+
+    Args:
+        template_path: Путь к файлу шаблона.
+
+    Returns:
+        Словарь {имя плейсхолдера: значение по умолчанию}.
+    """
+    doc = Document(template_path)
+    placeholder_pattern = re.compile(r"\{([^{}]+?)\}")
+
+    found_placeholders: Set[str] = set()
+
+    # Найти все плейсхолдеры в документе
+    for para in doc.paragraphs:
+        found_placeholders.update(placeholder_pattern.findall(para.text))
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                found_placeholders.update(placeholder_pattern.findall(cell.text))
+
+    defaults: Dict[str, str] = {}
+    for full_placeholder in found_placeholders:
+        if "::" in full_placeholder:
+            ph_name, default_value = full_placeholder.split("::", 1)
+        else:
+            ph_name, default_value = full_placeholder, ""
+        defaults[ph_name.strip()] = default_value.strip()
+    return defaults
+
+
+def apply_template_placeholders(
+    self: Any,
+    name: str,
+    defaults: Dict[str, str],
+    saved_values: Optional[Dict[str, str]] = None,
+) -> None:
+    """
+    Устанавливает плейсхолдеры вкладки и отображает их.
+
+    Args:
+        self: Экземпляр главного окна.
+        name: Название вкладки.
+        defaults: Плейсхолдеры шаблона со значениями по умолчанию.
+        saved_values: Значения из прошлого сеанса, имеющие приоритет.
+    """
+    self.placeholders[name] = set()
+    self.placeholder_values[name] = {}
+
+    # Используем значение из UI, если есть, иначе — стандартное
+    tab_params = {
+        "Название": getattr(self, f"{name}_event_name").get(),
+    }
+    tab_params.update(saved_values or {})
+
+    for ph_name, default_value in defaults.items():
+        self.placeholders[name].add(ph_name)
+        self.placeholder_values[name][ph_name] = tab_params.get(
+            ph_name, default_value
+        )
+
+    self.show_placeholders_in_tree(name)
+
+
 def scan_template_for_placeholders(
     self: Any, name: str, template_path: str
 ) -> None:
@@ -34,41 +102,8 @@ def scan_template_for_placeholders(
         template_path: Путь к файлу шаблона.
     """
     try:
-        doc = Document(template_path)
-        placeholder_pattern = re.compile(r"\{([^{}]+?)\}")
-
-        found_placeholders: Set[str] = set()
-
-        # Найти все плейсхолдеры в документе
-        for para in doc.paragraphs:
-            found_placeholders.update(placeholder_pattern.findall(para.text))
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    found_placeholders.update(placeholder_pattern.findall(cell.text))
-
-        self.placeholders[name] = set()
-        self.placeholder_values[name] = {}
-
-        for full_placeholder in found_placeholders:
-            if "::" in full_placeholder:
-                ph_name, default_value = full_placeholder.split("::", 1)
-            else:
-                ph_name, default_value = full_placeholder, ""
-
-            ph_name = ph_name.strip()
-            default_value = default_value.strip()
-
-            self.placeholders[name].add(ph_name)
-
-            # Используем значение из UI, если есть, иначе — стандартное
-            tab_params = {
-                "Название": getattr(self, f"{name}_event_name").get(),
-            }
-            self.placeholder_values[name][ph_name] = tab_params.get(
-                ph_name, default_value
-            )
-
-        self.show_placeholders_in_tree(name)
+        apply_template_placeholders(
+            self, name, read_template_placeholders(template_path)
+        )
     except Exception as e:
         messagebox.showerror("Ошибка", f"Не удалось обработать шаблон:\n{e}")
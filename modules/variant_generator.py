@@ -0,0 +1,188 @@
+# modules/variant_generator.py
+
+"""Модуль формирования одного документа в нескольких вариантах шаблона.
+
+Одна и та же программа выпускается в разных вариантах (с разными шапками,
+на русском и английском языках, для печати и для сайта). Выгрузка
+разбирается и подготавливается один раз, после чего подготовленные записи
+вставляются во все шаблоны за один вызов (см. render_variants_cached),
+а файлы сохраняются в фоновом потоке. Шаблоны, заполняемые через
+python-docx, при --workers больше 1 формируются в пуле процессов.
+
+Пример запуска:
+
+    python -m modules.variant_generator export.json "Программа" out \\
+        templates/program_ru.docx templates/program_en.docx --workers 2
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+from modules.batch_generator import parse_pairs, path_labels
+from modules.deduplicator import DEDUP_RULES, DEFAULT_DEDUP_RULE, with_deduplication
+from modules.document_pipeline import (
+    GENERATORS,
+    JSON_TO_RECORDS_FUNCTIONS,
+    read_template,
+    render_variants_cached,
+    source_digest,
+)
+from modules.json_reader import read_json
+from modules.output_cache import DEFAULT_CACHE_DIR, OutputCache
+from modules.output_writer import OutputWriter, WriteResult
+from modules.records import RecordSet
+
+
+def variant_paths(output_dir: str, export: str, templates: Sequence[str]) -> List[str]:
+    """
+    Возвращает пути к документам вариантов.
+
+    Имя варианта — имя файла шаблона. Если имена шаблонов из разных папок
+    совпадают, в имя добавляется путь шаблона относительно общей папки
+    (см. path_labels), чтобы варианты не перезаписывали друг друга.
+
+    Args:
+        output_dir: Папка для результатов.
+        export: Путь к JSON-выгрузке.
+        templates: Пути к шаблонам вариантов.
+
+    Returns:
+        Пути вида "<папка>/<выгрузка> - <шаблон>.docx" в порядке шаблонов.
+    """
+    stem = os.path.splitext(os.path.basename(export))[0]
+    labels = path_labels(templates)
+    return [
+        os.path.join(output_dir, f"{stem} - {labels[template]}.docx")
+        for template in templates
+    ]
+
+
+def generate_variants(
+    export: str,
+    name: str,
+    templates: List[str],
+    output_dir: str,
+    placeholders: Optional[Dict[str, str]] = None,
+    workers: int = 1,
+    cache: Optional[OutputCache] = None,
+    dedup_rule: Optional[str] = DEFAULT_DEDUP_RULE,
+) -> List[WriteResult]:
+    """
+    Формирует документ по всем шаблонам и сохраняет файлы.
+
+    Args:
+        export: Путь к JSON-выгрузке.
+        name: Тип документа (название вкладки).
+        templates: Пути к шаблонам вариантов.
+        output_dir: Папка для результатов.
+        placeholders: Значения плейсхолдеров, общие для всех вариантов.
+        workers: Число процессов для заполнения шаблонов.
+        cache: Кэш готовых документов или None.
+        dedup_rule: Правило удаления повторяющихся докладов; None — не удалять.
+
+    Returns:
+        Результаты сохранения файлов; в поле tag — кортеж (путь к шаблону,
+        взят ли документ из кэша).
+
+    Raises:
+        KeyError: Если для типа документа нет генератора.
+        ValueError: Если в выгрузке нет данных.
+    """
+    if name not in GENERATORS:
+        raise KeyError(f"Неизвестный тип документа: {name}")
+    normalizer = with_deduplication(JSON_TO_RECORDS_FUNCTIONS[name], dedup_rule)
+
+    def load_records() -> RecordSet:
+        """Загружает и нормализует выгрузку (только при промахе кэша)."""
+        records = normalizer(read_json(export))
+        if not records:
+            raise ValueError("Нет данных для вставки.")
+        return records
+
+    documents = render_variants_cached(
+        name,
+        [read_template(path) for path in templates],
+        source_digest(export, normalizer),
+        placeholders or {},
+        load_records,
+        cache,
+        workers,
+    )
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = variant_paths(output_dir, export, templates)
+    with OutputWriter() as writer:
+        for template, path, (data, cached) in zip(templates, paths, documents):
+            writer.submit(path, data, tag=(template, cached))
+    return writer.results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Args:
+        argv: Аргументы командной строки.
+
+    Returns:
+        Код возврата: 0 — все варианты сохранены, 1 — есть ошибки.
+    """
+    parser = argparse.ArgumentParser(
+        description="Формирование документа по нескольким шаблонам за один проход"
+    )
+    parser.add_argument("export", help="JSON-выгрузка")
+    parser.add_argument("document", choices=sorted(GENERATORS), help="Тип документа")
+    parser.add_argument("output_dir", help="Папка для результатов")
+    parser.add_argument("templates", nargs="+", help="Шаблоны вариантов")
+    parser.add_argument(
+        "--placeholder", action="append", default=[], metavar="ИМЯ=ЗНАЧЕНИЕ",
+        help="Значение плейсхолдера (можно указать несколько раз)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Число процессов заполнения шаблонов"
+    )
+    parser.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR, help="Папка кэша готовых документов"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Не использовать кэш готовых документов"
+    )
+    parser.add_argument(
+        "--dedup", choices=DEDUP_RULES + ("off",), default=DEFAULT_DEDUP_RULE,
+        help="Какой из повторяющихся докладов оставлять (off — не удалять повторы)",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        results = generate_variants(
+            args.export,
+            args.document,
+            args.templates,
+            args.output_dir,
+            placeholders=parse_pairs(args.placeholder),
+            workers=args.workers,
+            cache=None if args.no_cache else OutputCache(args.cache_dir),
+            dedup_rule=None if args.dedup == "off" else args.dedup,
+        )
+    except Exception as e:
+        print(f"Ошибка: {type(e).__name__}: {e}")
+        return 1
+
+    for result in results:
+        template, cached = result.tag
+        line = f"[{'ok' if result.ok else 'error'}] {template} -> {result.path}"
+        if cached:
+            line += " из кэша"
+        if result.error:
+            line += f": {result.error}"
+        print(line)
+    print(f"Вариантов: {len(results)} ({round(time.perf_counter() - started, 3)} с)")
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+# modules/watch_mode.py
+
+"""Модуль режима наблюдения за файлами.
+
+Следит за выбранными JSON-файлами, шаблонами и значениями плейсхолдеров
+и автоматически перегенерирует документы при их изменении. Разобранные
+данные (через общий реестр наборов) и содержимое шаблонов
+переиспользуются, если файлы не менялись.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from modules.deduplicator import DEFAULT_DEDUP_RULE
+from modules.document_pipeline import (
+    normalizer_for,
+    read_template,
+    render_cached,
+    source_digest,
+)
+from modules.dataset_registry import DatasetRegistry
+from modules.file_utils import FileStamp, file_stamp
+from modules.json_reader import read_json
+from modules.output_cache import OutputCache
+from modules.output_writer import OutputWriter, WriteResult
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class WatchTarget:
+    """Параметры документа, за которым ведется наблюдение."""
+
+    name: str
+    json_path: str
+    template_path: str
+    output_path: str
+    placeholders: Dict[str, str] = field(default_factory=dict)
+    # Правило удаления повторяющихся докладов; None — не удалять
+    dedup_rule: Optional[str] = DEFAULT_DEDUP_RULE
+
+
+class DocumentWatcher:
+    """Фоновый поток, перегенерирующий документы при изменении входных данных.
+
+    Изменения определяются опросом отпечатков файлов. После обнаружения
+    изменения поток выжидает паузу ``debounce``, чтобы не генерировать
+    документ на каждый промежуточный шаг (например, при скачивании файла).
+
+    Обратные вызовы выполняются в фоновом потоке, поэтому интерфейс должен
+    сам перенаправлять их в главный поток.
+    """
+
+    def __init__(
+        self,
+        on_generated: Callable[[str, str, float], None],
+        on_error: Callable[[str, Exception], None],
+        on_data_loaded: Optional[Callable[[str, "pd.DataFrame"], None]] = None,
+        interval: float = 0.5,
+        debounce: float = 0.3,
+        cache: Optional[OutputCache] = None,
+        registry: Optional[DatasetRegistry] = None,
+    ) -> None:
+        """
+        Инициализирует наблюдатель.
+
+        Args:
+            on_generated: Вызывается с (тип документа, путь, время в секундах).
+            on_error: Вызывается с (тип документа, исключение).
+            on_data_loaded: Вызывается с (тип документа, DataFrame) после
+                повторной загрузки JSON.
+            interval: Период опроса файлов в секундах.
+            debounce: Пауза после последнего изменения перед генерацией.
+            cache: Кэш готовых документов или None.
+            registry: Реестр наборов данных, общий с интерфейсом.
+        """
+        self.on_generated = on_generated
+        self.on_error = on_error
+        self.on_data_loaded = on_data_loaded
+        self.interval = interval
+        self.debounce = debounce
+        self.cache = cache
+        self.registry = registry if registry is not None else DatasetRegistry()
+
+        self._targets: Dict[str, WatchTarget] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Поток записи: сохранение идет, пока формируется следующий документ
+        self._writer: Optional[OutputWriter] = None
+
+        # Сигнатура последней успешной генерации для каждого документа
+        self._rendered: Dict[str, Any] = {}
+        # Сигнатура и время первого обнаружения ожидающего изменения
+        self._pending: Dict[str, Tuple[Any, float]] = {}
+        # Наборы данных, удерживаемые в реестре для каждого документа
+        self._datasets: Dict[str, "pd.DataFrame"] = {}
+        # Кэш шаблонов: путь -> (отпечаток, содержимое)
+        self._template_cache: Dict[str, Tuple[FileStamp, bytes]] = {}
+
+    def set_target(self, target: WatchTarget) -> None:
+        """
+        Добавляет или обновляет документ, за которым ведется наблюдение.
+
+        Args:
+            target: Параметры документа.
+        """
+        with self._lock:
+            self._targets[target.name] = WatchTarget(
+                target.name,
+                target.json_path,
+                target.template_path,
+                target.output_path,
+                dict(target.placeholders),
+                target.dedup_rule,
+            )
+
+    def remove_target(self, name: str) -> None:
+        """
+        Прекращает наблюдение за документом.
+
+        Args:
+            name: Тип документа.
+        """
+        with self._lock:
+            self._targets.pop(name, None)
+            self._rendered.pop(name, None)
+            self._pending.pop(name, None)
+            self.registry.release(self._datasets.pop(name, None))
+
+    def start(self) -> None:
+        """Запускает фоновый поток наблюдения, если он еще не запущен."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._writer = OutputWriter(on_written=self._on_written)
+        self._thread = threading.Thread(
+            target=self._run, name="DocumentWatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает фоновый поток наблюдения."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 4)
+        self._thread = None
+        if self._writer:
+            self._writer.close()
+        self._writer = None
+
+    def _run(self) -> None:
+        """Основной цикл опроса."""
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.interval)
+
+    def poll(self) -> None:
+        """Проверяет все документы и перегенерирует измененные."""
+        with self._lock:
+            targets = list(self._targets.values())
+
+        now = time.monotonic()
+        for target in targets:
+            if not (target.json_path and target.template_path and target.output_path):
+                continue
+
+            signature = self._signature(target)
+            with self._lock:
+                if self._targets.get(target.name) is not target:
+                    # Параметры изменены или наблюдение прекращено после снимка
+                    continue
+                if signature == self._rendered.get(target.name):
+                    self._pending.pop(target.name, None)
+                    continue
+
+                pending = self._pending.get(target.name)
+                if pending is None or pending[0] != signature:
+                    # Новое изменение: начинаем отсчет паузы заново
+                    self._pending[target.name] = (signature, now)
+                    continue
+                if now - pending[1] < self.debounce:
+                    continue
+
+            self._regenerate(target, signature)
+
+    def _signature(self, target: WatchTarget) -> Any:
+        """Вычисляет сигнатуру всех входных данных документа."""
+        return (
+            target.json_path,
+            file_stamp(target.json_path),
+            target.template_path,
+            file_stamp(target.template_path),
+            tuple(sorted(target.placeholders.items())),
+            target.output_path,
+            target.dedup_rule,
+        )
+
+    def _regenerate(self, target: WatchTarget, signature: Any) -> None:
+        """Формирует и сохраняет документ, переиспользуя неизмененные данные."""
+        started = time.perf_counter()
+        try:
+            template = self._load_template(target.template_path)
+            normalizer = normalizer_for(target.name, target.dedup_rule, dataframe=True)
+            data, _ = render_cached(
+                target.name,
+                template,
+                source_digest(target.json_path, normalizer),
+                target.placeholders,
+                lambda: self._load_data(target.name, target.json_path, normalizer),
+                self.cache,
+            )
+        except Exception as e:
+            # Повторяем попытку только после следующего изменения
+            if self._mark_rendered(target, signature):
+                self.on_error(target.name, e)
+            return
+
+        if not self._mark_rendered(target, signature):
+            return
+        writer = self._writer
+        if writer is None:
+            # poll() вызван без запуска потока наблюдения: пишем синхронно
+            writer = OutputWriter(on_written=self._on_written)
+            writer.submit(target.output_path, data, tag=(target.name, started))
+            writer.close()
+        else:
+            writer.submit(target.output_path, data, tag=(target.name, started))
+
+    def _mark_rendered(self, target: WatchTarget, signature: Any) -> bool:
+        """
+        Запоминает сигнатуру сформированного документа.
+
+        Состояние изменяется под блокировкой, так как remove_target
+        вызывается из потока интерфейса во время генерации.
+
+        Args:
+            target: Параметры документа, по которым он сформирован.
+            signature: Сигнатура входных данных документа.
+
+        Returns:
+            False, если наблюдение за документом прекращено во время генерации.
+        """
+        with self._lock:
+            if target.name not in self._targets:
+                return False
+            self._rendered[target.name] = signature
+            self._pending.pop(target.name, None)
+            return True
+
+    def _on_written(self, result: WriteResult) -> None:
+        """Сообщает о результате записи документа (вызывается в потоке записи)."""
+        name, started = result.tag
+        if result.ok:
+            self.on_generated(name, result.path, time.perf_counter() - started)
+        else:
+            self.on_error(name, OSError(result.error))
+
+    def _load_data(
+        self, name: str, path: str, normalizer: Callable[[Any], "pd.DataFrame"]
+    ) -> "pd.DataFrame":
+        """Возвращает DataFrame из реестра, загружая JSON только при изменении."""
+        dataframe = self.registry.acquire(path, normalizer, read_json)
+        with self._lock:
+            if name not in self._targets:
+                # Наблюдение прекращено: набор данных не удерживается
+                previous = dataframe
+            else:
+                previous = self._datasets.get(name)
+                self._datasets[name] = dataframe
+        self.registry.release(previous)
+        if previous is dataframe:
+            return dataframe
+
+        if self.on_data_loaded:
+            self.on_data_loaded(name, dataframe)
+        return dataframe
+
+    def _load_template(self, path: str) -> bytes:
+        """Возвращает содержимое шаблона из кэша или читает его заново."""
+        stamp = file_stamp(path)
+        cached = self._template_cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        template = read_template(path)
+        self._template_cache[path] = (stamp, template)
+        return template
+
+
+def default_output_path(folder: str, name: str) -> str:
+    """
+    Формирует путь к результату в папке вывода.
+
+    Args:
+        folder: Папка вывода.
+        name: Тип документа.
+
+    Returns:
+        Путь к файлу DOCX.
+    """
+    return os.path.join(folder, f"{name}.docx") if folder else ""
@@ -0,0 +1,47 @@
+# tests/conftest.py
+
+"""Общие фикстуры тестов."""
+
+import io
+from typing import Callable, Iterable, List
+
+import docx
+import pytest
+
+
+def _docx_bytes(document: docx.document.Document) -> bytes:
+    """Сохраняет документ python-docx в байты."""
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _paragraph_texts(data: bytes) -> List[str]:
+    """Возвращает тексты непустых абзацев документа."""
+    document = docx.Document(io.BytesIO(data))
+    return [paragraph.text for paragraph in document.paragraphs if paragraph.text]
+
+
+@pytest.fixture
+def docx_bytes() -> Callable[[docx.document.Document], bytes]:
+    """Функция сохранения документа python-docx в байты."""
+    return _docx_bytes
+
+
+@pytest.fixture
+def paragraph_texts() -> Callable[[bytes], List[str]]:
+    """Функция получения текстов непустых абзацев DOCX."""
+    return _paragraph_texts
+
+
+@pytest.fixture
+def make_docx() -> Callable[[Iterable[str]], bytes]:
+    """Фабрика документов DOCX из списка абзацев."""
+
+    def make(paragraphs: Iterable[str]) -> bytes:
+        document = docx.Document()
+        for text in paragraphs:
+            document.add_paragraph(text)
+        return _docx_bytes(document)
+
+    return make
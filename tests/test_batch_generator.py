@@ -0,0 +1,256 @@
+# tests/test_batch_generator.py
+
+"""Тесты пакетной генерации: манифест и продолжение прерванного запуска."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from modules import batch_generator
+from modules.batch_generator import MANIFEST_NAME, path_labels, main, run_batch, run_job
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+TEMPLATES = {
+    "Программа": os.path.join(TEMPLATES_DIR, "1_Программа_к43.docx"),
+    "Отчет о проведении": os.path.join(
+        TEMPLATES_DIR, "2_Отчет о проведении 77-й МСНК ГУАП.docx"
+    ),
+}
+
+
+@pytest.fixture
+def exports(tmp_path):
+    folder = tmp_path / "exports"
+    folder.mkdir()
+    paths = []
+    for name in ("s1.json", "s2.json"):
+        path = folder / name
+        shutil.copy(os.path.join(TEMPLATES_DIR, "contributions.json"), path)
+        paths.append(str(path))
+    return paths
+
+
+def batch(exports, output_dir, **options):
+    return run_batch(exports, TEMPLATES, str(output_dir), workers=2, cache_dir=None, **options)
+
+
+def read_manifest(output_dir):
+    with open(output_dir / MANIFEST_NAME, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def statuses(entries):
+    return {job_id: entry["status"] for job_id, entry in entries.items()}
+
+
+def test_manifest_lists_every_job(exports, tmp_path):
+    output_dir = tmp_path / "out"
+
+    entries = batch(exports, output_dir, table_formats=["csv"])
+
+    manifest = read_manifest(output_dir)
+    assert manifest["ok"] == 4
+    assert manifest["errors"] == 0
+    assert [job["id"] for job in manifest["jobs"]] == sorted(entries)
+    assert sorted(entries) == [
+        "s1::Отчет о проведении",
+        "s1::Программа",
+        "s2::Отчет о проведении",
+        "s2::Программа",
+    ]
+    for job in manifest["jobs"]:
+        assert job["status"] == "ok"
+        assert job["error"] is None
+        assert os.path.getsize(job["output"]) == job["size"]
+        assert job["tables"] == [job["output"][:-len(".docx")] + ".csv"]
+        assert os.path.exists(job["tables"][0])
+        # Выгрузка нужна двум документам и передается через общую память
+        assert {"attach", "render", "save"} <= set(job["timings"])
+    assert not [name for name in os.listdir(output_dir) if name.endswith(".tmp")]
+
+
+def test_shared_dataset_gives_same_document(exports, tmp_path):
+    batch(exports[:1], tmp_path / "shared")
+    single = run_batch(
+        exports[:1], {"Программа": TEMPLATES["Программа"]}, str(tmp_path / "single"),
+        cache_dir=None,
+    )
+
+    assert "attach" not in single["s1::Программа"]["timings"]
+    shared = (tmp_path / "shared" / "s1 - Программа.docx").read_bytes()
+    assert (tmp_path / "single" / "s1 - Программа.docx").read_bytes() == shared
+
+
+def test_resume_skips_completed_jobs(exports, tmp_path):
+    output_dir = tmp_path / "out"
+    batch(exports, output_dir)
+    program = output_dir / "s1 - Программа.docx"
+    stamp = os.stat(program).st_mtime_ns
+
+    entries = batch(exports, output_dir, resume=True)
+
+    assert set(statuses(entries).values()) == {"skipped"}
+    assert os.stat(program).st_mtime_ns == stamp
+    assert read_manifest(output_dir)["ok"] == 4
+
+
+def test_resume_reruns_changed_and_missing_jobs(exports, tmp_path):
+    output_dir = tmp_path / "out"
+    batch(exports, output_dir)
+
+    with open(exports[1], "r", encoding="utf-8") as file:
+        data = json.load(file)
+    with open(exports[1], "w", encoding="utf-8") as file:
+        json.dump(data[:10], file, ensure_ascii=False)
+    os.remove(output_dir / "s1 - Программа.docx")
+
+    entries = batch(exports, output_dir, resume=True)
+
+    assert statuses(entries) == {
+        "s1::Отчет о проведении": "skipped",
+        "s1::Программа": "ok",
+        "s2::Отчет о проведении": "ok",
+        "s2::Программа": "ok",
+    }
+
+
+def test_without_resume_all_jobs_run_again(exports, tmp_path):
+    output_dir = tmp_path / "out"
+    batch(exports, output_dir)
+
+    entries = batch(exports, output_dir)
+
+    assert set(statuses(entries).values()) == {"ok"}
+
+
+def test_failed_job_is_recorded_and_retried(exports, tmp_path):
+    output_dir = tmp_path / "out"
+    with open(exports[1], "w", encoding="utf-8") as file:
+        file.write("[{")
+
+    entries = batch(exports, output_dir, resume=True)
+
+    manifest = read_manifest(output_dir)
+    assert manifest["ok"] == 2
+    assert manifest["errors"] == 2
+    assert entries["s2::Программа"]["status"] == "error"
+    assert entries["s2::Программа"]["error"]
+    assert not os.path.exists(output_dir / "s2 - Программа.docx")
+
+    shutil.copy(exports[0], exports[1])
+    entries = batch(exports, output_dir, resume=True)
+
+    assert statuses(entries) == {
+        "s1::Отчет о проведении": "skipped",
+        "s1::Программа": "skipped",
+        "s2::Отчет о проведении": "ok",
+        "s2::Программа": "ok",
+    }
+    assert read_manifest(output_dir)["errors"] == 0
+
+
+def test_duplicates_are_reported(exports, tmp_path):
+    with open(exports[0], "r", encoding="utf-8") as file:
+        data = json.load(file)
+    with open(exports[0], "w", encoding="utf-8") as file:
+        json.dump(data + data[:3], file, ensure_ascii=False)
+
+    entries = batch(exports, tmp_path / "out")
+    unchanged = batch(exports, tmp_path / "off", dedup_rule=None)
+
+    for name in TEMPLATES:
+        # Повторно поданные три доклада удаляются в дополнение к повторам выгрузки
+        added = len(entries[f"s1::{name}"]["duplicates"])
+        assert added - len(entries[f"s2::{name}"]["duplicates"]) == 3
+        assert unchanged[f"s1::{name}"]["duplicates"] == []
+
+
+def test_missing_template_fails_only_its_jobs(exports, tmp_path):
+    templates = dict(TEMPLATES, Программа=str(tmp_path / "нет.docx"))
+    output_dir = tmp_path / "out"
+
+    entries = run_batch(exports, templates, str(output_dir), workers=2, cache_dir=None)
+
+    assert statuses(entries) == {
+        "s1::Отчет о проведении": "ok",
+        "s1::Программа": "error",
+        "s2::Отчет о проведении": "ok",
+        "s2::Программа": "error",
+    }
+    assert "FileNotFoundError" in entries["s1::Программа"]["error"]
+    manifest = read_manifest(output_dir)
+    assert (manifest["ok"], manifest["errors"]) == (2, 2)
+
+
+def test_unknown_document_type(exports, tmp_path):
+    with pytest.raises(KeyError):
+        run_batch(exports, {"Неизвестный": TEMPLATES["Программа"]}, str(tmp_path))
+
+
+def failing_run_job(job):
+    if job["id"] == "s1::Программа":
+        raise RuntimeError("сбой вне run_job")
+    return run_job(job)
+
+
+def crashing_run_job(job):
+    if job["id"] == "s1::Программа":
+        os._exit(1)
+    return run_job(job)
+
+
+def test_exception_outside_run_job_fails_only_its_job(exports, tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_generator, "run_job", failing_run_job)
+    output_dir = tmp_path / "out"
+
+    entries = batch(exports, output_dir)
+
+    assert entries["s1::Программа"]["status"] == "error"
+    assert "сбой вне run_job" in entries["s1::Программа"]["error"]
+    assert [status for job_id, status in statuses(entries).items()
+            if job_id != "s1::Программа"] == ["ok", "ok", "ok"]
+    manifest = read_manifest(output_dir)
+    assert (manifest["ok"], manifest["errors"]) == (3, 1)
+
+
+def test_crashed_worker_is_recorded_in_manifest(exports, tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_generator, "run_job", crashing_run_job)
+    output_dir = tmp_path / "out"
+
+    entries = batch(exports, output_dir)
+
+    assert sorted(entries) == sorted(job["id"] for job in read_manifest(output_dir)["jobs"])
+    assert len(entries) == 4
+    assert "BrokenProcessPool" in entries["s1::Программа"]["error"]
+
+
+def test_exports_with_same_name_do_not_collide(tmp_path):
+    exports = []
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / "s1.json"
+        shutil.copy(os.path.join(TEMPLATES_DIR, "contributions.json"), path)
+        exports.append(str(path))
+    other = tmp_path / "a" / "s2.json"
+    shutil.copy(exports[0], other)
+
+    labels = path_labels(exports + [str(other)])
+    entries = run_batch(
+        exports, {"Программа": TEMPLATES["Программа"]}, str(tmp_path / "out"),
+        cache_dir=None,
+    )
+
+    assert labels == {exports[0]: "a_s1", exports[1]: "b_s1", str(other): "s2"}
+    assert sorted(entries) == ["a_s1::Программа", "b_s1::Программа"]
+    assert len({entry["output"] for entry in entries.values()}) == 2
+    assert all(os.path.exists(entry["output"]) for entry in entries.values())
+
+
+def test_cli_rejects_unknown_document_type(exports, tmp_path, capsys):
+    with pytest.raises(SystemExit) as error:
+        main([exports[0], str(tmp_path), "--template", "Неизвестный=шаблон.docx"])
+
+    assert error.value.code == 2
+    assert "Неизвестный тип документа" in capsys.readouterr().err
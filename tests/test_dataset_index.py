@@ -0,0 +1,112 @@
+# tests/test_dataset_index.py
+
+"""Тесты отбора записей по индексам набора данных."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.dataset_index import DatasetFilter, DatasetIndex, parse_date
+
+
+@pytest.fixture
+def dataframe():
+    return pd.DataFrame(
+        {
+            "Ауд.": ["23-12", "23-12", "52-18", None, "23-12 "],
+            "Дата и время начала": [
+                "2025-04-14T06:00:00+00:00",
+                "2025-04-15T06:00:00+00:00",
+                # По UTC еще 14 апреля, по времени записи — 15-е
+                "2025-04-15T01:30:00+03:00",
+                None,
+                "2025-04-16T06:00:00+00:00",
+            ],
+            "Номер группы": ["1234", "1241", "4236", "1234", "М123"],
+            "Название доклада": [
+                "Модель распределенного хранения",
+                "Нейронные сети",
+                "Хранение данных в облаке",
+                "Ёмкость аккумуляторов",
+                "Распределенные вычисления",
+            ],
+            "ФИО докладчика": [
+                "Иванов И.И.",
+                "Петров П.П.",
+                "Иванова А.А.",
+                "Сидоров С.С.",
+                "Петров П.П.",
+            ],
+        }
+    )
+
+
+def select(dataframe, **conditions):
+    return DatasetIndex(dataframe).select(DatasetFilter(**conditions)).tolist()
+
+
+def test_empty_filter_selects_all(dataframe):
+    assert select(dataframe) == [0, 1, 2, 3, 4]
+
+
+def test_room_is_matched_after_normalization(dataframe):
+    assert select(dataframe, room="23-12") == [0, 1, 4]
+    assert select(dataframe, room="нет такой") == []
+
+
+def test_group_prefix(dataframe):
+    assert select(dataframe, group_prefix="12") == [0, 1, 3]
+    assert select(dataframe, group_prefix="м1") == [4]
+
+
+def test_dates_use_local_day(dataframe):
+    day = datetime.date(2025, 4, 15)
+
+    assert select(dataframe, date_from=day, date_to=day) == [1, 2]
+    assert select(dataframe, date_from=day) == [1, 2, 4]
+    assert select(dataframe, date_to=datetime.date(2025, 4, 14)) == [0]
+
+
+def test_speaker_and_text_match_word_prefixes(dataframe):
+    assert select(dataframe, speaker="петров") == [1, 4]
+    assert select(dataframe, speaker="иванов") == [0, 2]
+    assert select(dataframe, text="распредел") == [0, 4]
+    assert select(dataframe, text="емкость") == [3]
+    assert select(dataframe, text="хранен иванова") == [2]
+
+
+def test_conditions_are_combined(dataframe):
+    assert select(dataframe, room="23-12", speaker="петров") == [1, 4]
+    assert select(
+        dataframe, room="23-12", speaker="петров", date_to=datetime.date(2025, 4, 15)
+    ) == [1]
+
+
+def test_missing_columns_do_not_restrict(dataframe):
+    publications = dataframe.drop(columns=["Ауд.", "Дата и время начала"])
+
+    assert select(publications, room="23-12", date_from=datetime.date(2030, 1, 1)) == [
+        0, 1, 2, 3, 4,
+    ]
+
+
+def test_subset_keeps_order_and_reuses_result(dataframe):
+    index = DatasetIndex(dataframe)
+    record_filter = DatasetFilter(speaker="петров")
+
+    subset = index.subset(dataframe, record_filter)
+
+    assert subset["Номер группы"].tolist() == ["1241", "М123"]
+    assert index.subset(dataframe, record_filter) is subset
+    assert index.subset(dataframe, DatasetFilter()) is dataframe
+    assert isinstance(index.select(record_filter), np.ndarray)
+
+
+def test_parse_date():
+    assert parse_date("15.04.2025") == datetime.date(2025, 4, 15)
+    assert parse_date("2025-04-15") == datetime.date(2025, 4, 15)
+    assert parse_date(" ") is None
+    with pytest.raises(ValueError):
+        parse_date("15 апреля")
@@ -0,0 +1,99 @@
+# tests/test_dataset_registry.py
+
+"""Тесты общего реестра наборов данных."""
+
+import json
+import os
+
+from modules.dataset_registry import DatasetRegistry
+from modules.records import RecordSet
+
+
+def normalize(data):
+    return RecordSet([{"value": value} for value in data])
+
+
+def other_normalize(data):
+    return RecordSet([{"other": value} for value in data])
+
+
+def write_json(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path)
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def test_acquire_shares_dataset_and_counts_references(tmp_path):
+    path = write_json(tmp_path, "data.json", [1, 2])
+    loader = CountingLoader()
+    registry = DatasetRegistry()
+
+    first = registry.acquire(path, normalize, loader)
+    second = registry.acquire(path, normalize, loader)
+
+    assert first is second
+    assert loader.calls == [path]
+    assert registry.retain(first)
+    assert not registry.retain(RecordSet([{"value": 1}]))
+    assert registry._find(first).refs == 3
+
+    for _ in range(4):
+        registry.release(first)
+    registry.release(None)
+    assert registry._find(first).refs == 0
+    assert len(registry) == 1
+
+
+def test_key_depends_on_normalizer_and_file_change(tmp_path):
+    path = write_json(tmp_path, "data.json", [1])
+    loader = CountingLoader()
+    registry = DatasetRegistry()
+
+    first = registry.acquire(path, normalize, loader)
+    other = registry.acquire(path, other_normalize, loader)
+    assert other is not first
+
+    write_json(tmp_path, "data.json", [1, 2, 3])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed = registry.acquire(path, normalize, loader)
+
+    assert changed is not first
+    assert changed == [{"value": 1}, {"value": 2}, {"value": 3}]
+    assert len(loader.calls) == 3
+
+
+def test_budget_evicts_only_unused_datasets_in_lru_order(tmp_path):
+    paths = [write_json(tmp_path, f"{name}.json", list(range(50))) for name in "abc"]
+    loader = CountingLoader()
+    registry = DatasetRegistry(memory_budget=0)
+
+    used = registry.acquire(paths[0], normalize, loader)
+    released = registry.acquire(paths[1], normalize, loader)
+    registry.release(released)
+
+    # Используемый набор остается в памяти даже сверх бюджета
+    assert len(registry) == 1
+    assert registry._find(used) is not None
+    assert registry._find(released) is None
+
+    # Бюджет вмещает ровно два свободных набора одинакового размера
+    registry.memory_budget = registry.memory_usage() * 2
+    registry.release(used)
+    registry.release(registry.acquire(paths[1], normalize, loader))
+    registry.release(registry.acquire(paths[0], normalize, loader))
+    registry.release(registry.acquire(paths[2], normalize, loader))
+
+    # Вытесняется самый давно использованный набор
+    remaining = {key[0] for key in registry._entries}
+    assert remaining == {os.path.abspath(paths[0]), os.path.abspath(paths[2])}
@@ -0,0 +1,121 @@
+# tests/test_deduplicator.py
+
+"""Тесты удаления повторяющихся докладов."""
+
+import pytest
+
+from modules.deduplicator import (
+    DUPLICATES_ATTR,
+    deduplicate,
+    duplicates_report,
+    with_deduplication,
+)
+from modules.records import RecordSet
+
+
+def talk(title, speaker, group="1234", **fields):
+    return {
+        "Название доклада": title,
+        "ФИО докладчика": speaker,
+        "Номер группы": group,
+        **fields,
+    }
+
+
+RECORDS = [
+    talk("Модель сети", "Иванов И.И.", Ауд=""),
+    talk("Другой доклад", "Петров П.П.", Ауд="23-12"),
+    talk("МОДЕЛЬ  сети!", "иванов и.и.", Ауд="23-12"),
+    talk("Модель сети", "Иванов И.И.", Ауд=""),
+]
+
+
+def kept_positions(kept):
+    return [next(i for i, record in enumerate(RECORDS) if record is item) for item in kept]
+
+
+@pytest.mark.parametrize(
+    "rule, kept, dropped",
+    [
+        ("first", [0, 1], [(3, 1), (4, 1)]),
+        ("last", [1, 3], [(1, 4), (3, 4)]),
+        # Остается запись с заполненной аудиторией, а не последняя
+        ("complete", [1, 2], [(1, 3), (4, 3)]),
+    ],
+)
+def test_rules_choose_kept_record(rule, kept, dropped):
+    records, report = deduplicate(RECORDS, rule)
+
+    assert kept_positions(records) == kept
+    assert [(entry["Запись"], entry["Оставлена запись"]) for entry in report] == dropped
+    assert report[0]["Название доклада"] == RECORDS[report[0]["Запись"] - 1]["Название доклада"]
+
+
+def test_complete_rule_prefers_later_record_on_tie():
+    records, report = deduplicate([talk("Доклад", "Иванов"), talk("Доклад", "Иванов")], "complete")
+
+    assert records == [talk("Доклад", "Иванов")]
+    assert [(entry["Запись"], entry["Оставлена запись"]) for entry in report] == [(1, 2)]
+
+
+def test_kept_records_preserve_order_and_columns():
+    source = RecordSet(RECORDS, ["Название доклада", "ФИО докладчика", "Номер группы", "Ауд"])
+
+    records, _ = deduplicate(source, "last")
+
+    assert isinstance(records, RecordSet)
+    assert records.columns == source.columns
+    assert records == [RECORDS[1], RECORDS[3]]
+
+
+def test_different_group_is_not_a_duplicate():
+    records, report = deduplicate([talk("Доклад", "Иванов"), talk("Доклад", "Иванов", "5678")])
+
+    assert len(records) == 2
+    assert report == []
+
+
+def test_records_with_empty_key_are_kept():
+    empty = [talk("", "", ""), talk(None, None, None), talk("", "", "")]
+
+    records, report = deduplicate(empty, "last")
+
+    assert len(records) == 3
+    assert report == []
+
+
+def test_without_key_columns_nothing_is_removed():
+    records, report = deduplicate([{"Ауд.": "1"}, {"Ауд.": "1"}])
+
+    assert len(records) == 2
+    assert report == []
+
+
+def test_unknown_rule_is_rejected():
+    with pytest.raises(ValueError, match="Неизвестное правило"):
+        deduplicate(RECORDS, "newest")
+    with pytest.raises(ValueError, match="Неизвестное правило"):
+        with_deduplication(lambda data: RecordSet(data), "newest")
+
+
+def test_with_deduplication_stores_report():
+    def normalizer(data):
+        return RecordSet(data)
+
+    records = with_deduplication(normalizer, "first")(RECORDS)
+
+    assert len(records) == 2
+    assert duplicates_report(records) == records.attrs[DUPLICATES_ATTR]
+    assert len(duplicates_report(records)) == 2
+
+
+def test_with_deduplication_off_and_rewrap():
+    def normalizer(data):
+        return RecordSet(data)
+
+    assert with_deduplication(normalizer, None) is normalizer
+
+    first = with_deduplication(normalizer, "first")
+    last = with_deduplication(first, "last")
+    assert last.normalizer is normalizer
+    assert last.__qualname__ != first.__qualname__
@@ -0,0 +1,121 @@
+# tests/test_docx_merger.py
+
+"""Тесты сборки книги из готовых документов."""
+
+import io
+import json
+
+import docx
+
+from modules.docx_merger import DocumentMerger, manifest_outputs, merge_documents, merge_files
+
+
+def section(title, sessions):
+    paragraphs = [title]
+    for number in range(1, sessions + 1):
+        paragraphs += [f"Заседание {number}. 14.04.2025", f"Доклад {title} {number}"]
+    return paragraphs
+
+
+def test_sessions_are_numbered_through(make_docx, paragraph_texts):
+    documents = [make_docx(section("Секция А", 2)), make_docx(section("Секция Б", 3))]
+
+    merger = DocumentMerger(documents[0])
+    merger.append(documents[1])
+    book = merger.to_bytes()
+
+    assert merger.count == 2
+    assert merger.sessions == 5
+    assert paragraph_texts(book) == [
+        "Секция А",
+        "Заседание 1. 14.04.2025",
+        "Доклад Секция А 1",
+        "Заседание 2. 14.04.2025",
+        "Доклад Секция А 2",
+        "Секция Б",
+        "Заседание 3. 14.04.2025",
+        "Доклад Секция Б 1",
+        "Заседание 4. 14.04.2025",
+        "Доклад Секция Б 2",
+        "Заседание 5. 14.04.2025",
+        "Доклад Секция Б 3",
+    ]
+
+
+def test_number_split_across_runs_is_replaced(docx_bytes):
+    documents = []
+    for _ in range(2):
+        document = docx.Document()
+        paragraph = document.add_paragraph()
+        for part in ("Засед", "ание 1", "7. Ауд. 23-12"):
+            paragraph.add_run(part)
+        documents.append(docx_bytes(document))
+
+    book = docx.Document(io.BytesIO(merge_documents(documents)))
+
+    paragraphs = [p for p in book.paragraphs if p.text.startswith("Заседание")]
+    assert [p.text for p in paragraphs] == ["Заседание 1. Ауд. 23-12", "Заседание 2. Ауд. 23-12"]
+    # Разбиение на фрагменты (и их оформление) сохраняется
+    assert len(paragraphs[1].runs) == 3
+
+
+def test_page_break_between_documents(make_docx):
+    documents = [make_docx(["Первый"]), make_docx(["Второй"])]
+
+    with_break = docx.Document(io.BytesIO(merge_documents(documents)))
+    without_break = docx.Document(io.BytesIO(merge_documents(documents, page_break=False)))
+
+    def breaks(document):
+        return len(document.element.body.xpath('.//w:br[@w:type="page"]'))
+
+    assert breaks(with_break) == 1
+    assert breaks(without_break) == 0
+
+
+def test_identical_styles_are_not_duplicated(make_docx):
+    documents = [make_docx(["Первый"]), make_docx(["Второй"])]
+
+    book = docx.Document(io.BytesIO(merge_documents(documents)))
+
+    first = docx.Document(io.BytesIO(documents[0]))
+    assert len(book.styles.element.xpath("w:style")) == len(
+        first.styles.element.xpath("w:style")
+    )
+
+
+def test_merge_files_from_manifest(tmp_path, make_docx, paragraph_texts):
+    paths = []
+    for name, sessions in (("Секция А", 1), ("Секция Б", 2)):
+        path = tmp_path / f"{name} - Программа.docx"
+        path.write_bytes(make_docx(section(name, sessions)))
+        paths.append(str(path))
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "jobs": [
+                    {"output": paths[0], "status": "ok", "document": "Программа"},
+                    {"output": paths[1], "status": "skipped", "document": "Программа"},
+                    {"output": paths[1], "status": "ok", "document": "Отчет"},
+                    {"output": str(tmp_path / "нет.docx"), "status": "ok",
+                     "document": "Программа"},
+                    {"output": paths[0], "status": "error", "document": "Программа"},
+                ]
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+
+    outputs = manifest_outputs(str(manifest), "Программа")
+    book = tmp_path / "book.docx"
+    sessions = merge_files(outputs, str(book))
+
+    assert outputs == paths
+    assert sessions == 3
+    texts = paragraph_texts(book.read_bytes())
+    assert [text for text in texts if text.startswith("Заседание")] == [
+        "Заседание 1. 14.04.2025",
+        "Заседание 2. 14.04.2025",
+        "Заседание 3. 14.04.2025",
+    ]
@@ -0,0 +1,63 @@
+# tests/test_json_decoder.py
+
+"""Тесты выбора и работы декодера JSON."""
+
+import json
+import os
+
+import pytest
+
+from modules.json_decoder import JsonDecoder
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+DATA = {"title": "Доклад", "persons": [{"last_name": "Иванова"}], "n": 1}
+
+
+def test_environment_variable_selects_backend(monkeypatch):
+    monkeypatch.setenv("SUAI_JSON_BACKEND", "json")
+    assert JsonDecoder().name == "json"
+
+    monkeypatch.delenv("SUAI_JSON_BACKEND")
+    assert JsonDecoder().name in ("orjson", "ujson", "json")
+
+
+def test_unknown_backend_falls_back_to_stdlib():
+    assert JsonDecoder(["неизвестный"]).name == "json"
+    assert JsonDecoder([]).name == "json"
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+@pytest.mark.parametrize("prefix", [b"", b"\xef\xbb\xbf"])
+def test_load_file_reads_utf8_with_and_without_bom(tmp_path, backend, prefix):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    path = tmp_path / "data.json"
+    path.write_bytes(prefix + json.dumps(DATA, ensure_ascii=False).encode("utf-8"))
+    decoder = JsonDecoder([backend])
+
+    assert decoder.name == backend
+    assert decoder.load_file(str(path)) == DATA
+    assert decoder.loads(path.read_bytes()) == DATA
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_load_file_matches_stdlib_on_sample_data(backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    path = os.path.join(TEMPLATES_DIR, "contributions.json")
+    with open(path, encoding="utf-8-sig") as f:
+        expected = json.load(f)
+
+    assert JsonDecoder([backend]).load_file(path) == expected
+
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_empty_file_is_a_decode_error(tmp_path, backend):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+
+    with pytest.raises(ValueError):
+        JsonDecoder([backend]).load_file(str(path))
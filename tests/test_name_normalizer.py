@@ -0,0 +1,81 @@
+# tests/test_name_normalizer.py
+
+"""Тесты нормализации ФИО авторов."""
+
+import threading
+
+import pytest
+
+from modules.name_normalizer import NameNormalizer, format_person_name, person_name
+
+
+@pytest.mark.parametrize(
+    "full_name, first_name, last_name, expected",
+    [
+        ("Дмитрий Сергеевич Мартиросян", "", "", "Мартиросян Д.С."),
+        ("", "Дмитрий Сергеевич", "Мартиросян", "Мартиросян Д.С."),
+        ("Анна-Мария Петровна Иванова", "", "", "Иванова А.-М.П."),
+        ("", "Анна-Мария", "Иванова", "Иванова А.-М."),
+        ("", "Эльдар Рашид оглы", "Мамедов", "Мамедов Э.Р."),
+        ("Айгуль Ринат кызы Алиева", "", "", "Алиева А.Р."),
+        ("Иванов И.И.", "", "", "Иванов И.И."),
+        ("Платон", "", "", "Платон"),
+        ("  Иван   Петров ", "", "", "Петров И."),
+        ("", "", " Сидоров ", "Сидоров"),
+    ],
+)
+def test_format_person_name(full_name, first_name, last_name, expected):
+    assert format_person_name(full_name, first_name, last_name) == expected
+
+
+def test_person_name_tolerates_missing_fields():
+    assert person_name({"full_name": None, "last_name": "Петров"}) == ("", "", "Петров")
+
+
+def test_normalize_keeps_order_and_memoizes():
+    normalizer = NameNormalizer()
+    names = [("Иван Петров", "", ""), ("Анна Сидорова", "", ""), ("Иван Петров", "", "")]
+
+    assert normalizer.normalize(names) == ["Петров И.", "Сидорова А.", "Петров И."]
+    assert len(normalizer) == 2
+
+
+def test_cache_is_cleared_when_full():
+    normalizer = NameNormalizer(max_size=2)
+    normalizer.normalize([("Иван Петров", "", ""), ("Анна Сидорова", "", "")])
+
+    assert normalizer.normalize([("Олег Орлов", "", "")]) == ["Орлов О."]
+    assert len(normalizer) == 1
+
+
+def test_author_lists():
+    normalizer = NameNormalizer()
+
+    lists = normalizer.author_lists([
+        [("Иван Петров", "", ""), ("Анна Сидорова", "", "")],
+        [],
+        [("Иван Петров", "", "")],
+    ])
+
+    assert lists == ["Петров И., Сидорова А.", "", "Петров И."]
+
+
+def test_normalize_from_several_threads():
+    normalizer = NameNormalizer(max_size=50)
+    names = [(f"Имя{i} Фамилия{i}", "", "") for i in range(200)]
+    expected = [f"Фамилия{i} И." for i in range(200)]
+    errors = []
+
+    def work():
+        for _ in range(20):
+            if normalizer.normalize(names) != expected:
+                errors.append(1)
+            normalizer.clear()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
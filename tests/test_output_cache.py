@@ -0,0 +1,111 @@
+# tests/test_output_cache.py
+
+"""Тесты кэша готовых документов."""
+
+import os
+
+import pytest
+
+from modules.document_pipeline import normalizer_for, render_variants_cached
+from modules.json_reader import read_json
+from modules.output_cache import OutputCache, get_or_render, make_key
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+
+def key(**changes):
+    arguments = dict(
+        name="Программа",
+        version="1",
+        data_digest="data",
+        template=b"template",
+        placeholders={"Секция": "А", "Год": "2025"},
+    )
+    arguments.update(changes)
+    return make_key(**arguments)
+
+
+def test_key_does_not_depend_on_placeholder_order():
+    assert key() == key(placeholders={"Год": "2025", "Секция": "А"})
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"name": "Отчет о проведении"},
+        {"version": "2"},
+        {"data_digest": "other"},
+        {"template": b"other template"},
+        {"placeholders": {"Секция": "Б", "Год": "2025"}},
+    ],
+)
+def test_any_input_change_invalidates_key(changes):
+    assert key(**changes) != key()
+
+
+def test_put_and_get(tmp_path):
+    cache = OutputCache(str(tmp_path), max_bytes=1000)
+
+    cache.put("a", b"document")
+
+    assert cache.contains("a")
+    assert cache.get("a") == b"document"
+    assert cache.get("b") is None
+    assert not cache.contains("b")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = OutputCache(str(tmp_path), max_bytes=25)
+    for age, name in enumerate(("a", "b", "c")):
+        cache.put(name, b"x" * 10)
+        os.utime(tmp_path / f"{name}.docx", (1000 + age, 1000 + age))
+    # Без вытеснения: три записи по 10 байт превышают лимит
+    assert not cache.contains("a")
+
+    os.utime(tmp_path / "b.docx", (1000, 1000))
+    cache.get("b")  # обращение обновляет время использования
+    cache.put("d", b"x" * 10)
+
+    assert [cache.contains(name) for name in "bcd"] == [True, False, True]
+
+
+def test_too_large_document_is_not_stored(tmp_path):
+    cache = OutputCache(str(tmp_path), max_bytes=5)
+
+    cache.put("a", b"x" * 10)
+
+    assert not cache.contains("a")
+
+
+def test_get_or_render_renders_once(tmp_path):
+    cache = OutputCache(str(tmp_path))
+    calls = []
+
+    def render():
+        calls.append(1)
+        return b"document"
+
+    assert get_or_render(cache, "k", render) == (b"document", False)
+    assert get_or_render(cache, "k", render) == (b"document", True)
+    assert len(calls) == 1
+
+
+def test_unwritable_cache_does_not_fail_rendering(tmp_path):
+    # Папка кэша не может быть создана: на ее месте файл
+    blocked = tmp_path / "cache"
+    blocked.write_bytes(b"")
+    cache = OutputCache(str(blocked))
+
+    assert get_or_render(cache, "k", lambda: b"document") == (b"document", False)
+
+    with open(os.path.join(TEMPLATES_DIR, "1_Программа_к43.docx"), "rb") as file:
+        template = file.read()
+    records = normalizer_for("Программа")(
+        read_json(os.path.join(TEMPLATES_DIR, "contributions.json"))
+    )
+    results = render_variants_cached(
+        "Программа", [template, template], "data", {}, lambda: records, cache
+    )
+
+    assert [cached for _, cached in results] == [False, False]
+    assert results[0][0][:2] == b"PK"
@@ -0,0 +1,86 @@
+# tests/test_output_writer.py
+
+"""Тесты фоновой записи готовых документов."""
+
+import os
+import threading
+
+from modules import output_cache
+from modules.output_writer import OutputWriter
+
+
+def test_files_are_written_in_background(tmp_path):
+    written = []
+
+    with OutputWriter(on_written=lambda result: written.append(
+        (result.tag, threading.current_thread().name)
+    )) as writer:
+        for i in range(3):
+            writer.submit(str(tmp_path / "out" / f"{i}.docx"), b"x" * i, tag=i)
+
+    assert [result.tag for result in writer.results] == [0, 1, 2]
+    assert all(result.ok for result in writer.results)
+    assert [(tmp_path / "out" / f"{i}.docx").read_bytes() for i in range(3)] == [
+        b"", b"x", b"xx"
+    ]
+    assert written == [(0, "OutputWriter"), (1, "OutputWriter"), (2, "OutputWriter")]
+
+
+def test_failed_rename_keeps_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / "doc.docx"
+    path.write_bytes(b"old")
+
+    def fail(source, target):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(output_cache.os, "replace", fail)
+    with OutputWriter() as writer:
+        writer.submit(str(path), b"new")
+
+    assert not writer.results[0].ok
+    assert "No space left on device" in writer.results[0].error
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["doc.docx"]
+
+
+def test_error_affects_only_its_file(tmp_path):
+    (tmp_path / "file").write_bytes(b"")
+
+    with OutputWriter() as writer:
+        writer.submit(str(tmp_path / "file" / "a.docx"), b"a", tag="a")
+        writer.submit(str(tmp_path / "b.docx"), b"b", tag="b")
+
+    assert {result.tag: result.ok for result in writer.results} == {"a": False, "b": True}
+    assert (tmp_path / "b.docx").read_bytes() == b"b"
+
+
+def test_handler_error_does_not_stop_writing(tmp_path, capsys):
+    def on_written(result):
+        raise RuntimeError("ошибка обработчика")
+
+    with OutputWriter(on_written=on_written) as writer:
+        writer.submit(str(tmp_path / "a.docx"), b"a")
+        writer.submit(str(tmp_path / "b.docx"), b"b")
+
+    assert len(writer.results) == 2
+    assert "ошибка обработчика" in capsys.readouterr().err
+
+
+def test_submit_blocks_when_queue_is_full(tmp_path):
+    release = threading.Event()
+    writer = OutputWriter(max_pending=1, on_written=lambda result: release.wait(10))
+    # Первый файл записывается и удерживается обработчиком, второй ждет в очереди
+    writer.submit(str(tmp_path / "1.docx"), b"1")
+    writer.submit(str(tmp_path / "2.docx"), b"2")
+
+    third = threading.Thread(target=writer.submit, args=(str(tmp_path / "3.docx"), b"3"))
+    third.start()
+    third.join(0.2)
+    blocked = third.is_alive()
+    release.set()
+    third.join(10)
+    writer.close()
+
+    assert blocked
+    assert not third.is_alive()
+    assert len(writer.results) == 3
@@ -0,0 +1,71 @@
+# tests/test_preview.py
+
+"""Тесты предпросмотра содержимого документа."""
+
+import os
+import subprocess
+import sys
+
+from modules.document_pipeline import GENERATORS, normalizer_for
+from modules.json_reader import read_json
+from modules.preview import DocumentPreview
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+TEMPLATES_DIR = os.path.join(ROOT, "templates")
+
+
+def records():
+    return normalizer_for("Программа")(
+        read_json(os.path.join(TEMPLATES_DIR, "contributions.json"))
+    )
+
+
+def test_placeholders_are_substituted_without_data(make_docx, tmp_path):
+    template = tmp_path / "template.docx"
+    template.write_bytes(make_docx(["Секция {Секция::Информатика}", "Итог"]))
+    preview = DocumentPreview()
+
+    lines = preview.lines(GENERATORS["Программа"], str(template), None, {})
+    changed = preview.lines(GENERATORS["Программа"], str(template), [], {"Секция": "Физика"})
+
+    assert lines == ["Секция Информатика", "Итог"]
+    assert changed == ["Секция Физика", "Итог"]
+
+
+def test_template_is_reread_after_change(make_docx, tmp_path):
+    template = tmp_path / "template.docx"
+    template.write_bytes(make_docx(["Первый"]))
+    preview = DocumentPreview()
+    assert preview.lines(GENERATORS["Программа"], str(template), None, {}) == ["Первый"]
+
+    template.write_bytes(make_docx(["Второй вариант"]))
+
+    assert preview.lines(GENERATORS["Программа"], str(template), None, {}) == [
+        "Второй вариант"
+    ]
+
+
+def test_records_are_listed_and_prepared_once(make_docx, tmp_path):
+    generator = GENERATORS["Программа"]
+    template = tmp_path / "template.docx"
+    template.write_bytes(make_docx(["Программа", generator.LIST_MARKER]))
+    data = records()
+    preview = DocumentPreview()
+
+    lines = preview.lines(generator, str(template), data, {})
+
+    assert lines[0] == "Программа"
+    assert lines[1:] == generator.preview_lines(data)
+    assert preview.lines(generator, "", data, {}) is preview.lines(generator, "", data, {})
+
+
+def test_module_does_not_load_pandas_or_watcher():
+    code = (
+        "import sys, modules.preview; "
+        "print('pandas' in sys.modules, 'modules.watch_mode' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.split() == ["False", "False"]
@@ -0,0 +1,176 @@
+# tests/test_records.py
+
+"""Тесты записей и подготовки данных без pandas."""
+
+import datetime
+import os
+import subprocess
+import sys
+
+from modules.records import (
+    PAPER_COLUMNS,
+    TALK_COLUMNS,
+    AsDataFrame,
+    RecordSet,
+    columns_of,
+    group_by_date,
+    is_missing,
+    papers_json_to_records,
+    parse_datetime,
+    report_json_to_records,
+    to_dataframe,
+)
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+
+def person(first_name, last_name):
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "full_name": f"{first_name} {last_name}",
+    }
+
+
+def talk(title, start, group="", persons=(), room="23-12"):
+    return {
+        "title": title,
+        "start_dt": start,
+        "room_name": room,
+        "persons": list(persons),
+        "custom_fields": [
+            {"name": "Другое поле", "value": "x"},
+            {"name": "Номер группы основного автора (докладчика)", "value": group},
+        ],
+    }
+
+
+def test_record_set_keeps_columns_and_attrs():
+    records = RecordSet([{"a": 1, "b": 2}], attrs={"duplicates": []})
+
+    assert records.columns == ["a", "b"]
+    assert records.attrs == {"duplicates": []}
+    assert not records.empty
+    assert RecordSet().empty
+    assert columns_of(RecordSet([], ["x", "y"])) == ["x", "y"]
+    assert columns_of([{"c": 1}]) == ["c"]
+    assert columns_of([]) == []
+
+
+def test_is_missing():
+    assert is_missing(None)
+    assert is_missing(float("nan"))
+    assert not is_missing("")
+    assert not is_missing(0)
+    assert not is_missing([1, 2])
+
+
+def test_parse_datetime():
+    offset = datetime.timezone(datetime.timedelta(hours=3))
+
+    assert parse_datetime("2025-04-14T09:00:00+03:00") == datetime.datetime(
+        2025, 4, 14, 9, tzinfo=offset
+    )
+    assert parse_datetime("2025-04-14T06:00:00Z").utcoffset() == datetime.timedelta(0)
+    assert parse_datetime("") is None
+    assert parse_datetime("не дата") is None
+    assert parse_datetime(None) is None
+
+
+def test_group_by_date_sorts_stably_and_skips_undated():
+    records = [
+        {"id": 1, "start": "2025-04-15T10:00:00+03:00"},
+        {"id": 2, "start": "2025-04-14T12:00:00+03:00"},
+        {"id": 3, "start": ""},
+        {"id": 4, "start": "2025-04-14T09:00:00+03:00"},
+        {"id": 5, "start": "2025-04-14T12:00:00+03:00"},
+    ]
+
+    groups = group_by_date(records, "start")
+
+    assert [(date, [row["id"] for _, row in rows]) for date, rows in groups] == [
+        (datetime.date(2025, 4, 14), [4, 2, 5]),
+        (datetime.date(2025, 4, 15), [1]),
+    ]
+
+
+def test_report_json_to_records():
+    data = [
+        talk(
+            "Модель сети",
+            "2025-04-14T06:00:00+00:00",
+            "1234",
+            [person("Дмитрий Сергеевич", "Мартиросян"), person("Анна", "Иванова")],
+        ),
+        talk("Без авторов", None, room=None),
+    ]
+
+    records = report_json_to_records(data)
+
+    assert records.columns == TALK_COLUMNS
+    assert records[0] == {
+        "Номер группы": "1234",
+        "ФИО докладчика": "Дмитрий Сергеевич Мартиросян",
+        "Название доклада": "Модель сети",
+        "Дата и время начала": "2025-04-14T06:00:00+00:00",
+        "Ауд.": "23-12",
+        "Авторы": "Мартиросян Д.С., Иванова А.",
+    }
+    assert records[1]["ФИО докладчика"] == ""
+    assert records[1]["Ауд."] == ""
+    assert records[1]["Авторы"] == ""
+
+
+def test_papers_json_to_records_uses_accepted_papers_and_last_revision():
+    submitter = person("Иван", "Петров")
+    data = {
+        "papers": [
+            {
+                "state": {"name": "accepted", "title": "Принят"},
+                "contribution": {"title": "Доклад", "persons": []},
+                "revisions": [
+                    {"is_last_revision": False, "submitter": person("Олег", "Орлов")},
+                    {"is_last_revision": True, "submitter": submitter},
+                ],
+            },
+            {
+                "state": {"name": "rejected", "title": "Отклонен"},
+                "contribution": {"title": "Отклоненный"},
+                "revisions": [{"submitter": submitter}],
+            },
+        ]
+    }
+
+    records = papers_json_to_records(data)
+
+    assert records.columns == PAPER_COLUMNS
+    assert records == [
+        {"Title": "Доклад", "State": "Принят", "Submitter": "Петров И.", "Авторы": "Петров И."}
+    ]
+
+
+def test_to_dataframe_keeps_columns_and_attrs():
+    records = RecordSet([{"b": 1, "a": 2}], ["b", "a"], {"duplicates": [1]})
+
+    dataframe = to_dataframe(records)
+    empty = to_dataframe(RecordSet([], ["x"]))
+
+    assert list(dataframe.columns) == ["b", "a"]
+    assert dataframe.attrs == {"duplicates": [1]}
+    assert list(empty.columns) == ["x"]
+
+    as_dataframe = AsDataFrame(report_json_to_records)
+    assert as_dataframe.__qualname__ == "report_json_to_records[dataframe]"
+    assert list(as_dataframe([]).columns) == TALK_COLUMNS
+
+
+def test_batch_modules_do_not_load_pandas():
+    code = (
+        "import sys, modules.batch_generator, modules.variant_generator, "
+        "modules.table_export; print('pandas' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "False"
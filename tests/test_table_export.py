@@ -0,0 +1,124 @@
+# tests/test_table_export.py
+
+"""Тесты выгрузки нормализованных данных в CSV и XLSX."""
+
+import csv
+import datetime
+import os
+
+import pytest
+
+from modules import table_export
+from modules.records import RecordSet, to_dataframe
+from modules.table_export import (
+    export_format,
+    export_table,
+    main,
+    table_path,
+    write_csv,
+    write_xlsx,
+)
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+RECORDS = RecordSet(
+    [
+        {"ФИО": "Иванова А.", "Начало": "2025-04-14T09:00:00+03:00", "Балл": "5"},
+        {"ФИО": "Петров; И.", "Начало": float("nan"), "Балл": None},
+    ],
+    ["ФИО", "Начало", "Балл"],
+)
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f, delimiter=";"))
+
+
+def test_export_format_and_table_path():
+    assert export_format("out/Таблица.XLSX") == "xlsx"
+    assert export_format("table.csv") == "csv"
+    with pytest.raises(ValueError, match="Неподдерживаемый формат"):
+        export_format("table.ods")
+    with pytest.raises(ValueError, match="Неподдерживаемый формат"):
+        export_table(RECORDS, "table.csv", fmt="ods")
+    assert table_path(os.path.join("out", "Программа.docx"), "csv") == os.path.join(
+        "out", "Программа.csv"
+    )
+
+
+@pytest.mark.parametrize("as_dataframe", [False, True])
+def test_write_csv_uses_bom_and_semicolon(tmp_path, as_dataframe):
+    path = str(tmp_path / "table.csv")
+    data = to_dataframe(RECORDS) if as_dataframe else RECORDS
+
+    assert write_csv(data, path) == 2
+
+    with open(path, "rb") as f:
+        assert f.read(3) == b"\xef\xbb\xbf"
+    assert read_csv(path) == [
+        ["ФИО", "Начало", "Балл"],
+        ["Иванова А.", "2025-04-14T09:00:00+03:00", "5"],
+        ["Петров; И.", "", ""],
+    ]
+    assert os.listdir(tmp_path) == ["table.csv"]
+
+
+def test_write_xlsx_stores_rows_and_aware_datetimes_as_text(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    start = datetime.datetime(2025, 4, 14, 9, tzinfo=datetime.timezone.utc)
+    records = RecordSet([{"ФИО": "Иванова А.", "Начало": start}], ["ФИО", "Начало"])
+    path = str(tmp_path / "table.xlsx")
+
+    assert write_xlsx(records, path, sheet_name="Очень длинное имя листа для выгрузки") == 1
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    sheet = workbook.worksheets[0]
+    assert len(sheet.title) == 31
+    assert list(sheet.values) == [("ФИО", "Начало"), ("Иванова А.", start.isoformat())]
+    workbook.close()
+    assert os.listdir(tmp_path) == ["table.xlsx"]
+
+
+def test_failed_write_removes_temporary_file_and_keeps_old_table(tmp_path, monkeypatch):
+    path = tmp_path / "table.csv"
+    path.write_text("старая таблица", encoding="utf-8")
+
+    def broken_rows(dataframe):
+        yield ("Иванова А.", None, 5)
+        raise RuntimeError("ошибка данных")
+
+    monkeypatch.setattr(table_export, "iter_rows", broken_rows)
+    with pytest.raises(RuntimeError):
+        write_csv(RECORDS, str(path))
+
+    assert os.listdir(tmp_path) == ["table.csv"]
+    assert path.read_text(encoding="utf-8") == "старая таблица"
+
+
+def test_export_table_creates_directory(tmp_path):
+    path = str(tmp_path / "out" / "table.csv")
+
+    assert export_table(RECORDS, path) == 2
+    assert os.path.exists(path)
+
+
+def test_cli_dedup_option(tmp_path, capsys):
+    export = os.path.join(TEMPLATES_DIR, "contributions.json")
+    deduped = str(tmp_path / "deduped.csv")
+    full = str(tmp_path / "full.csv")
+
+    assert main([export, "Программа", deduped]) == 0
+    assert main([export, "Программа", full, "--dedup", "off"]) == 0
+
+    # В примере выгрузки один доклад повторяется
+    assert len(read_csv(full)) - len(read_csv(deduped)) == 1
+    assert "Записано строк" in capsys.readouterr().out
+
+
+def test_cli_rejects_unknown_extension(tmp_path):
+    export = os.path.join(TEMPLATES_DIR, "contributions.json")
+
+    with pytest.raises(SystemExit):
+        main([export, "Программа", str(tmp_path / "table.ods")])
+    assert os.listdir(tmp_path) == []
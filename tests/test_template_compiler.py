@@ -0,0 +1,140 @@
+# tests/test_template_compiler.py
+
+"""Тесты компиляции шаблонов с блоками повторения."""
+
+import io
+
+import docx
+import pytest
+
+from modules.template_compiler import RenderPlan, compile_document_xml, compile_template
+
+SESSIONS = [
+    {
+        "Номер": 1,
+        "Дата": "14.04.2025",
+        "Доклады": [
+            {"Номер": 1, "ФИО докладчика": "Иванов И.И."},
+            {"Номер": 2, "ФИО докладчика": "Петров П.П."},
+        ],
+    },
+    {
+        "Номер": 2,
+        "Дата": "15.04.2025",
+        "Доклады": [{"Номер": 1, "ФИО докладчика": "Сидоров С.С."}],
+    },
+]
+
+NESTED_TEMPLATE = [
+    "Секция {Секция::Информатика}",
+    "[[#Заседания]]",
+    "Заседание [[Номер]]. [[Дата]]",
+    "[[#Доклады]]",
+    "[[Номер]]. [[ФИО докладчика]] ([[Дата]])",
+    "[[/Доклады]]",
+    "[[/Заседания]]",
+    "Руководитель {Руководитель::}",
+]
+
+
+def render(template: bytes, context, placeholders=None) -> bytes:
+    return compile_template(template).render(template, context, placeholders or {})
+
+
+def test_nested_blocks_repeat_for_each_record(make_docx, paragraph_texts):
+    template = make_docx(NESTED_TEMPLATE)
+
+    texts = paragraph_texts(render(template, {"Заседания": SESSIONS}))
+
+    assert texts == [
+        "Секция Информатика",
+        "Заседание 1. 14.04.2025",
+        "1. Иванов И.И. (14.04.2025)",
+        "2. Петров П.П. (14.04.2025)",
+        "Заседание 2. 15.04.2025",
+        "1. Сидоров С.С. (15.04.2025)",
+        "Руководитель ",
+    ]
+
+
+def test_placeholder_values_replace_defaults(make_docx, paragraph_texts):
+    template = make_docx(NESTED_TEMPLATE)
+
+    texts = paragraph_texts(
+        render(template, {"Заседания": []}, {"Секция": "Физика", "Руководитель": "А.Б."})
+    )
+
+    assert texts == ["Секция Физика", "Руководитель А.Б."]
+
+
+def test_missing_block_renders_nothing(make_docx, paragraph_texts):
+    template = make_docx(["До", "[[#Доклады]]", "[[ФИО докладчика]]", "[[/Доклады]]", "После"])
+
+    assert paragraph_texts(render(template, {})) == ["До", "После"]
+
+
+def test_slot_split_across_runs(docx_bytes, paragraph_texts):
+    document = docx.Document()
+    paragraph = document.add_paragraph()
+    for part in ("Доклад: [[Наз", "вание]] {Ауд", "::23-12}"):
+        paragraph.add_run(part)
+    template = docx_bytes(document)
+
+    texts = paragraph_texts(render(template, {"Название": "Модель <сети> & данные"}))
+
+    assert texts == ["Доклад: Модель <сети> & данные 23-12"]
+
+
+def test_line_breaks_become_breaks(make_docx, paragraph_texts):
+    template = make_docx(["[[Текст]]"])
+
+    assert paragraph_texts(render(template, {"Текст": "первая\nвторая"})) == [
+        "первая\nвторая"
+    ]
+
+
+def test_table_rows_repeat(docx_bytes):
+    document = docx.Document()
+    table = document.add_table(rows=3, cols=2)
+    table.cell(0, 0).text = "Номер"
+    table.cell(0, 1).text = "Докладчик"
+    table.cell(1, 0).text = "[[#Доклады]][[Номер]]"
+    table.cell(1, 1).text = "[[ФИО докладчика]][[/Доклады]]"
+    table.cell(2, 0).text = "Итого"
+    template = docx_bytes(document)
+
+    result = docx.Document(io.BytesIO(render(template, SESSIONS[0])))
+
+    rows = [[cell.text for cell in row.cells] for row in result.tables[0].rows]
+    assert rows == [
+        ["Номер", "Докладчик"],
+        ["1", "Иванов И.И."],
+        ["2", "Петров П.П."],
+        ["Итого", ""],
+    ]
+
+
+def test_plan_survives_json_round_trip(make_docx):
+    template = make_docx(NESTED_TEMPLATE)
+    plan = compile_template(template)
+
+    restored = RenderPlan.from_json(plan.to_json())
+
+    context = {"Заседания": SESSIONS}
+    assert restored.has_blocks
+    assert restored.render_xml(context, {}) == plan.render_xml(context, {})
+
+
+@pytest.mark.parametrize(
+    "paragraphs, message",
+    [
+        (["[[#Доклады]]", "[[Номер]]"], "не закрыт"),
+        (["[[#Заседания]]", "[[#Доклады]]", "[[/Заседания]]", "[[/Доклады]]"], "не соответствует"),
+    ],
+)
+def test_unbalanced_blocks_are_rejected(make_docx, paragraphs, message):
+    document = docx.Document(io.BytesIO(make_docx(paragraphs)))
+    xml = document.part.blob
+
+    with pytest.raises(ValueError, match=message):
+        compile_document_xml(xml)
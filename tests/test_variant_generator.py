@@ -0,0 +1,64 @@
+# tests/test_variant_generator.py
+
+"""Тесты формирования документа по нескольким шаблонам."""
+
+import os
+import shutil
+
+from modules.document_pipeline import normalizer_for, render_variants
+from modules.json_reader import read_json
+from modules.variant_generator import generate_variants, variant_paths
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+EXPORT = os.path.join(TEMPLATES_DIR, "contributions.json")
+PROGRAM = os.path.join(TEMPLATES_DIR, "1_Программа_к43.docx")
+
+
+def test_variant_names_do_not_collide(tmp_path):
+    templates = [
+        str(tmp_path / "ru" / "program.docx"),
+        str(tmp_path / "en" / "program.docx"),
+        str(tmp_path / "ru" / "site.docx"),
+    ]
+
+    paths = variant_paths("out", "exports/s1.json", templates)
+
+    assert paths == [
+        os.path.join("out", "s1 - ru_program.docx"),
+        os.path.join("out", "s1 - en_program.docx"),
+        os.path.join("out", "s1 - site.docx"),
+    ]
+
+
+def test_processes_give_same_documents(make_docx, paragraph_texts):
+    records = normalizer_for("Программа")(read_json(EXPORT))
+    with open(PROGRAM, "rb") as file:
+        template = file.read()
+    blocks = make_docx(["[[#Заседания]]", "Заседание [[Номер]]. [[Дата]]", "[[/Заседания]]"])
+    templates = [template, blocks, template]
+
+    sequential = render_variants("Программа", templates, records, {}, workers=1)
+    parallel = render_variants("Программа", templates, records, {}, workers=2)
+
+    assert [paragraph_texts(data) for data in parallel] == [
+        paragraph_texts(data) for data in sequential
+    ]
+    assert paragraph_texts(parallel[1])[0].startswith("Заседание 1. ")
+
+
+def test_same_named_templates_are_saved_separately(tmp_path, paragraph_texts):
+    templates = []
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        templates.append(str(tmp_path / folder / "program.docx"))
+        shutil.copy(PROGRAM, templates[-1])
+
+    results = generate_variants(
+        EXPORT, "Программа", templates, str(tmp_path / "out"),
+        placeholders={}, workers=2,
+    )
+
+    assert all(result.ok for result in results)
+    assert len({result.path for result in results}) == 2
+    texts = [paragraph_texts(open(result.path, "rb").read()) for result in results]
+    assert texts[0] == texts[1]
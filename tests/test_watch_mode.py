@@ -0,0 +1,98 @@
+# tests/test_watch_mode.py
+
+"""Тесты режима наблюдения за файлами."""
+
+import os
+import shutil
+
+import pytest
+
+from modules.watch_mode import DocumentWatcher, WatchTarget
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+
+@pytest.fixture
+def target(tmp_path):
+    json_path = tmp_path / "export.json"
+    shutil.copy(os.path.join(TEMPLATES_DIR, "contributions.json"), json_path)
+    return WatchTarget(
+        "Программа",
+        str(json_path),
+        os.path.join(TEMPLATES_DIR, "1_Программа_к43.docx"),
+        str(tmp_path / "out" / "Программа.docx"),
+    )
+
+
+class Events:
+    def __init__(self):
+        self.generated = []
+        self.errors = []
+        self.loaded = []
+
+    def watcher(self, **options):
+        return DocumentWatcher(
+            on_generated=lambda name, path, seconds: self.generated.append(path),
+            on_error=lambda name, error: self.errors.append(error),
+            on_data_loaded=lambda name, dataframe: self.loaded.append(name),
+            debounce=0,
+            **options,
+        )
+
+
+def settle(watcher):
+    # Первый опрос замечает изменение, второй (после паузы) формирует документ
+    watcher.poll()
+    watcher.poll()
+
+
+def test_regenerates_only_after_changes(target):
+    events = Events()
+    watcher = events.watcher()
+    os.makedirs(os.path.dirname(target.output_path))
+    watcher.set_target(target)
+
+    settle(watcher)
+    assert events.generated == [target.output_path]
+    assert os.path.exists(target.output_path)
+
+    settle(watcher)
+    assert len(events.generated) == 1
+
+    target.placeholders["Секция"] = "Информатика"
+    watcher.set_target(target)
+    settle(watcher)
+    assert len(events.generated) == 2
+    # JSON не менялся: данные берутся из реестра без повторной загрузки
+    assert events.loaded == ["Программа"]
+    assert events.errors == []
+
+
+def test_error_is_reported_once(target):
+    events = Events()
+    watcher = events.watcher()
+    target.template_path = str(target.output_path) + ".нет"
+    watcher.set_target(target)
+
+    settle(watcher)
+    settle(watcher)
+
+    assert len(events.errors) == 1
+    assert events.generated == []
+
+
+def test_target_removed_during_regeneration_stays_removed(target):
+    events = Events()
+    watcher = events.watcher()
+    os.makedirs(os.path.dirname(target.output_path))
+    watcher.set_target(target)
+    # Интерфейс прекращает наблюдение, пока документ формируется
+    watcher.on_data_loaded = lambda name, dataframe: watcher.remove_target(name)
+
+    settle(watcher)
+
+    assert watcher._rendered == {}
+    assert watcher._pending == {}
+    assert watcher._datasets == {}
+    assert events.generated == []
+    assert not os.path.exists(target.output_path)
@@ -23,33 +23,26 @@ months_ru = {
 }
 
 
-def replace_placeholders_in_para(
-        para: Paragraph,
-        placeholders: Dict[str, str]
-) -> None:
-    """
-    Заменяет плейсхолдеры в тексте параграфа на соответствующие значения.
+# Шаблон плейсхолдера: {ключ} или {ключ::значение_по_умолчанию}
+placeholder_pattern = re.compile(r"\{([^{}]+?)\}")
 
-    Плейсхолдеры должны быть в формате {ключ} или {ключ::значение_по_умолчанию}.
-    Сохраняет исходное форматирование текста.
+
+def substitute_placeholders(text: str, placeholders: Dict[str, str]) -> str:
+    """
+    Подставляет значения плейсхолдеров в строку.
 
     Args:
-        para: Объект параграфа из docx
+        text: Исходный текст с плейсхолдерами.
         placeholders: Словарь замен {ключ: значение}
 
-    Example:
-        >>> para.text = "Привет, {имя::гость}!"
-        >>> replace_placeholders_in_para(para, {"имя": "Алексей"})
-        >>> para.text
-        'Привет, Алексей!'
+    Returns:
+        Текст с подставленными значениями; для отсутствующих ключей
+        используется значение по умолчанию из плейсхолдера.
     """
-    placeholder_pattern = re.compile(r"\{([^{}]+?)\}")
     new_text_parts = []
-    full_text = para.text
-    matches = list(placeholder_pattern.finditer(full_text))
     last_index = 0
 
-    for match in matches:
+    for match in placeholder_pattern.finditer(text):
         start, end = match.span()
         raw_key = match.group(1)
 
@@ -62,23 +55,40 @@ def replace_placeholders_in_para(
         key = key.strip()
         default = default.strip()
 
-        # Получаем значение для подстановки
-        value = placeholders.get(key, default)
-
-        # Добавляем текст до плейсхолдера
+        # Добавляем текст до плейсхолдера и заменённое значение
         if start > last_index:
-            new_text_parts.append(full_text[last_index:start])
-
-        # Добавляем заменённое значение
-        new_text_parts.append(value)
+            new_text_parts.append(text[last_index:start])
+        new_text_parts.append(placeholders.get(key, default))
         last_index = end
 
     # Добавляем оставшийся текст после последнего плейсхолдера
-    if last_index < len(full_text):
-        new_text_parts.append(full_text[last_index:])
+    if last_index < len(text):
+        new_text_parts.append(text[last_index:])
+
+    return "".join(new_text_parts)
 
-    # Собираем итоговый текст
-    new_text = "".join(new_text_parts)
+
+def replace_placeholders_in_para(
+        para: Paragraph,
+        placeholders: Dict[str, str]
+) -> None:
+    """
+    Заменяет плейсхолдеры в тексте параграфа на соответствующие значения.
+
+    Плейсхолдеры должны быть в формате {ключ} или {ключ::значение_по_умолчанию}.
+    Сохраняет исходное форматирование текста.
+
+    Args:
+        para: Объект параграфа из docx
+        placeholders: Словарь замен {ключ: значение}
+
+    Example:
+        >>> para.text = "Привет, {имя::гость}!"
+        >>> replace_placeholders_in_para(para, {"имя": "Алексей"})
+        >>> para.text
+        'Привет, Алексей!'
+    """
+    new_text = substitute_placeholders(para.text, placeholders)
 
     # Очищаем существующие runs и добавляем новый текст
     # с сохранением форматирования первого run'а
@@ -90,4 +100,25 @@ def replace_placeholders_in_para(
         first_run.text = new_text
     else:
         # Если runs нет вообще - создаем новый
-        para.add_run(new_text)
\ No newline at end of file
+        para.add_run(new_text)
+
+
+def replace_placeholders_in_doc(
+        doc: Any,
+        placeholders: Dict[str, str]
+) -> None:
+    """
+    Заменяет плейсхолдеры во всех параграфах документа, включая таблицы.
+
+    Args:
+        doc: Объект документа docx
+        placeholders: Словарь замен {ключ: значение}
+    """
+    for para in doc.paragraphs:
+        replace_placeholders_in_para(para, placeholders)
+
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for para in cell.paragraphs:
+                    replace_placeholders_in_para(para, placeholders)